@@ -19,6 +19,55 @@ ORDER BY (network, operator_id);
 ALTER TABLE default.operators
     ADD COLUMN IF NOT EXISTS vo_demoted_at Nullable(Date) AFTER address;
 
+-- Exactly one current row per operator, maintained from every insert into
+-- `operators`. Read it through the `operators_current` view, which finalizes
+-- the aggregate states; it never scans operator history.
+CREATE TABLE IF NOT EXISTS default.operators_latest (
+    network String,
+    operator_id UInt32,
+    operator_name AggregateFunction(argMax, String, DateTime),
+    is_vo AggregateFunction(argMax, UInt8, DateTime),
+    is_private AggregateFunction(argMax, UInt8, DateTime),
+    validator_count AggregateFunction(argMax, Nullable(UInt32), DateTime),
+    operator_fee AggregateFunction(argMax, Nullable(Float64), DateTime),
+    address AggregateFunction(argMax, String, DateTime),
+    vo_demoted_at AggregateFunction(argMax, Nullable(Date), DateTime),
+    updated_at SimpleAggregateFunction(max, DateTime)
+) ENGINE = AggregatingMergeTree
+PARTITION BY network
+ORDER BY (network, operator_id);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS default.operators_latest_mv
+TO default.operators_latest AS
+SELECT
+    network,
+    operator_id,
+    argMaxState(operator_name, updated_at)   AS operator_name,
+    argMaxState(is_vo, updated_at)           AS is_vo,
+    argMaxState(is_private, updated_at)      AS is_private,
+    argMaxState(validator_count, updated_at) AS validator_count,
+    argMaxState(operator_fee, updated_at)    AS operator_fee,
+    argMaxState(address, updated_at)         AS address,
+    argMaxState(vo_demoted_at, updated_at)   AS vo_demoted_at,
+    max(updated_at)                          AS updated_at
+FROM default.operators
+GROUP BY network, operator_id;
+
+CREATE VIEW IF NOT EXISTS default.operators_current AS
+SELECT
+    network,
+    operator_id,
+    argMaxMerge(operator_name)   AS operator_name,
+    argMaxMerge(is_vo)           AS is_vo,
+    argMaxMerge(is_private)      AS is_private,
+    argMaxMerge(validator_count) AS validator_count,
+    argMaxMerge(operator_fee)    AS operator_fee,
+    argMaxMerge(address)         AS address,
+    argMaxMerge(vo_demoted_at)   AS vo_demoted_at,
+    max(updated_at)              AS updated_at
+FROM default.operators_latest
+GROUP BY network, operator_id;
+
 CREATE TABLE IF NOT EXISTS default.performance (
     network String,
     operator_id UInt32,
@@ -42,6 +91,53 @@ CREATE TABLE IF NOT EXISTS default.operator_fees (
 PARTITION BY network
 ORDER BY (network, operator_id, metric_date, source);
 
+-- Latest fee per operator, maintained from every insert into `operator_fees`
+-- and read with argMaxMerge / max grouped by (network, operator_id).
+CREATE TABLE IF NOT EXISTS default.operator_fees_latest (
+    network String,
+    operator_id UInt32,
+    operator_fee AggregateFunction(argMax, Float64, Tuple(Date, DateTime)),
+    metric_date SimpleAggregateFunction(max, Date),
+    updated_at SimpleAggregateFunction(max, DateTime)
+) ENGINE = AggregatingMergeTree
+PARTITION BY network
+ORDER BY (network, operator_id);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS default.operator_fees_latest_mv
+TO default.operator_fees_latest AS
+SELECT
+    network,
+    operator_id,
+    argMaxState(operator_fee, (metric_date, updated_at)) AS operator_fee,
+    max(metric_date)                                     AS metric_date,
+    max(updated_at)                                      AS updated_at
+FROM default.operator_fees
+GROUP BY network, operator_id;
+
+-- First and last date each distinct fee was seen per operator. The current
+-- fee has been in effect since the day after any other fee was last seen
+-- (or since it was first seen, if it is the only one).
+CREATE TABLE IF NOT EXISTS default.operator_fee_spans (
+    network String,
+    operator_id UInt32,
+    operator_fee Float64,
+    first_seen SimpleAggregateFunction(min, Date),
+    last_seen SimpleAggregateFunction(max, Date)
+) ENGINE = AggregatingMergeTree
+PARTITION BY network
+ORDER BY (network, operator_id, operator_fee);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS default.operator_fee_spans_mv
+TO default.operator_fee_spans AS
+SELECT
+    network,
+    operator_id,
+    operator_fee,
+    min(metric_date) AS first_seen,
+    max(metric_date) AS last_seen
+FROM default.operator_fees
+GROUP BY network, operator_id, operator_fee;
+
 CREATE TABLE IF NOT EXISTS default.validator_counts (
     network String,
     operator_id UInt32,
@@ -53,6 +149,45 @@ CREATE TABLE IF NOT EXISTS default.validator_counts (
 PARTITION BY network
 ORDER BY (network, operator_id, metric_date, source);
 
+-- Idempotent upgrade: the listing's total validator count and how the active
+-- count was obtained ('crawl' of every validator, or 'fast' from the listing).
+ALTER TABLE default.validator_counts
+    ADD COLUMN IF NOT EXISTS listed_validator_count Nullable(UInt32) AFTER validator_count;
+ALTER TABLE default.validator_counts
+    ADD COLUMN IF NOT EXISTS count_method LowCardinality(String) DEFAULT 'crawl' AFTER listed_validator_count;
+
+-- Idempotent upgrade: total and effective balance (gwei) of each operator's
+-- validators from the beacon API; NULL when no beacon data was collected.
+ALTER TABLE default.validator_counts
+    ADD COLUMN IF NOT EXISTS balance_gwei Nullable(UInt64) AFTER count_method;
+ALTER TABLE default.validator_counts
+    ADD COLUMN IF NOT EXISTS effective_balance_gwei Nullable(UInt64) AFTER balance_gwei;
+
+-- Latest validator count per operator, maintained from every insert into
+-- `validator_counts`. "Latest" is by (metric_date, updated_at), so replays of
+-- past days never override a newer day. Read with argMaxMerge / max grouped
+-- by (network, operator_id); it never scans count history.
+CREATE TABLE IF NOT EXISTS default.validator_counts_latest (
+    network String,
+    operator_id UInt32,
+    validator_count AggregateFunction(argMax, UInt32, Tuple(Date, DateTime)),
+    metric_date SimpleAggregateFunction(max, Date),
+    updated_at AggregateFunction(argMax, DateTime, Tuple(Date, DateTime))
+) ENGINE = AggregatingMergeTree
+PARTITION BY network
+ORDER BY (network, operator_id);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS default.validator_counts_latest_mv
+TO default.validator_counts_latest AS
+SELECT
+    network,
+    operator_id,
+    argMaxState(validator_count, (metric_date, updated_at)) AS validator_count,
+    max(metric_date)                                        AS metric_date,
+    argMaxState(updated_at, (metric_date, updated_at))      AS updated_at
+FROM default.validator_counts
+GROUP BY network, operator_id;
+
 CREATE TABLE IF NOT EXISTS default.subscriptions (
     network String,
     user_id UInt64,
@@ -88,4 +223,241 @@ SELECT
   argMax(metric_value, updated_at) AS metric_value,
   max(updated_at)                  AS last_row_at
 FROM performance
-GROUP BY network, operator_id, metric_type, metric_date;
\ No newline at end of file
+GROUP BY network, operator_id, metric_type, metric_date;
+
+-- Network-wide fee and validator count distributions, one row per network,
+-- date, metric and facet. Written by the collector at ingest so the bot's
+-- /fees and /operators summaries read a handful of precomputed rows.
+CREATE TABLE IF NOT EXISTS default.network_daily_summary (
+    network String,
+    metric_date Date,
+    metric_type LowCardinality(String),
+    facet LowCardinality(String),
+    operator_count UInt32,
+    vo_count UInt32,
+    private_count UInt32,
+    public_vo_count UInt32,
+    zero_count UInt32,
+    mean_value Float64,
+    median_value Float64,
+    min_value Float64,
+    min_operator_id UInt32,
+    min_operator_name String,
+    min_operator_validators Nullable(UInt32),
+    min_operator_ties UInt32,
+    max_value Float64,
+    max_operator_id UInt32,
+    max_operator_name String,
+    max_operator_validators Nullable(UInt32),
+    max_operator_ties UInt32,
+    bucket_lower Array(Float64),
+    bucket_upper Array(Float64),
+    bucket_counts Array(UInt32),
+    outlier_count UInt32,
+    outlier_min Nullable(Float64),
+    outlier_max Nullable(Float64),
+    source String,
+    updated_at DateTime DEFAULT now()
+) ENGINE = ReplacingMergeTree(updated_at)
+PARTITION BY network
+ORDER BY (network, metric_type, facet, metric_date, source);
+
+-- Rolling aggregates of daily 24h performance per operator, derived by the
+-- collector from the trailing 90 days each time a new day is ingested.
+CREATE TABLE IF NOT EXISTS default.performance_rolling (
+    network String,
+    operator_id UInt32,
+    metric_date Date,
+    avg_7d Float64,
+    avg_30d Float64,
+    avg_90d Float64,
+    min_7d Float64,
+    min_30d Float64,
+    days_7d UInt16,
+    days_30d UInt16,
+    days_90d UInt16,
+    below_threshold Float64,
+    days_below_30d UInt16,
+    updated_at DateTime DEFAULT now()
+) ENGINE = ReplacingMergeTree(updated_at)
+PARTITION BY network
+ORDER BY (network, operator_id, metric_date);
+
+-- One row per cluster (the sorted set of operators running a validator) per
+-- day, keyed by a 64-bit hash of the operator IDs. Member performance is
+-- aggregated at ingest so the weakest operator of a cluster can be looked up
+-- without re-crawling validators.
+CREATE TABLE IF NOT EXISTS default.clusters (
+    network String,
+    cluster_hash UInt64,
+    metric_date Date,
+    operator_ids Array(UInt32),
+    validator_count UInt32,
+    active_count UInt32,
+    balance_gwei Nullable(UInt64),
+    effective_balance_gwei Nullable(UInt64),
+    min_perf_24h Nullable(Float64),
+    avg_perf_24h Nullable(Float64),
+    min_perf_30d Nullable(Float64),
+    avg_perf_30d Nullable(Float64),
+    weakest_operator_id Nullable(UInt32),
+    source String,
+    updated_at DateTime DEFAULT now()
+) ENGINE = ReplacingMergeTree(updated_at)
+PARTITION BY network
+ORDER BY (network, cluster_hash, metric_date, source);
+
+-- One authoritative performance value per operator, metric and date when
+-- several sources write into `performance`. Rebuilt by the collector for each
+-- ingested date using its configured source priority; `disagreement` is set
+-- when sources differ by more than the configured tolerance.
+CREATE TABLE IF NOT EXISTS default.performance_reconciled (
+    network String,
+    operator_id UInt32,
+    metric_type LowCardinality(String),
+    metric_date Date,
+    metric_value Float64,
+    source String,
+    source_count UInt8,
+    min_value Float64,
+    max_value Float64,
+    disagreement UInt8,
+    updated_at DateTime DEFAULT now()
+) ENGINE = ReplacingMergeTree(updated_at)
+PARTITION BY toYYYYMM(metric_date)
+ORDER BY (network, metric_type, operator_id, metric_date);
+
+-- Work queue for the collector's coordinator/worker modes. The coordinator
+-- enqueues units, workers record a leased claim before running one (the
+-- earliest live claim wins) and write its result; the coordinator assembles
+-- the day from the results. Rows expire after a week.
+CREATE TABLE IF NOT EXISTS default.collector_work_units (
+    run_id String,
+    network String,
+    unit_id UInt32,
+    kind LowCardinality(String),
+    payload String CODEC(ZSTD(3)),
+    created_at DateTime64(3) DEFAULT now64(3)
+) ENGINE = MergeTree
+ORDER BY (network, run_id, unit_id)
+TTL toDateTime(created_at) + INTERVAL 7 DAY;
+
+CREATE TABLE IF NOT EXISTS default.collector_work_claims (
+    run_id String,
+    unit_id UInt32,
+    claim_id String,
+    worker_id String,
+    claimed_at DateTime64(3),
+    lease_until DateTime64(3)
+) ENGINE = MergeTree
+ORDER BY (run_id, unit_id, claimed_at)
+TTL toDateTime(claimed_at) + INTERVAL 7 DAY;
+
+CREATE TABLE IF NOT EXISTS default.collector_work_results (
+    run_id String,
+    unit_id UInt32,
+    claim_id String,
+    worker_id String,
+    result String CODEC(ZSTD(3)),
+    finished_at DateTime64(3) DEFAULT now64(3)
+) ENGINE = MergeTree
+ORDER BY (run_id, unit_id)
+TTL toDateTime(finished_at) + INTERVAL 7 DAY;
+
+-- One row per completed collect run. count_method records whether the run
+-- crawled every validator or took counts from the operators listing; the
+-- fast path uses the latest crawl to decide when the next one is due.
+CREATE TABLE IF NOT EXISTS default.collector_runs (
+    network String,
+    run_date Date,
+    count_method LowCardinality(String),
+    reason String,
+    started_at DateTime,
+    finished_at DateTime,
+    operator_count UInt32,
+    validator_count UInt32
+) ENGINE = MergeTree
+PARTITION BY network
+ORDER BY (network, run_date, finished_at);
+
+-- Per-operator, per-day histogram of validator statuses (beacon statuses
+-- when the collector has a beacon API, otherwise the SSV API's), written in
+-- the same pass that produces validator_counts.
+CREATE TABLE IF NOT EXISTS default.validator_status_counts (
+    network String,
+    operator_id UInt32,
+    metric_date Date,
+    status LowCardinality(String),
+    validator_count UInt32,
+    source String,
+    updated_at DateTime DEFAULT now()
+) ENGINE = ReplacingMergeTree(updated_at)
+PARTITION BY network
+ORDER BY (network, operator_id, metric_date, status, source);
+
+-- Latest beacon status per SSV validator, replaced on every collector run and
+-- diffed against the next run's statuses to detect transitions.
+CREATE TABLE IF NOT EXISTS default.validator_status_latest (
+    network String,
+    pubkey String,
+    status LowCardinality(String),
+    snapshot_date Date,
+    updated_at DateTime DEFAULT now()
+) ENGINE = ReplacingMergeTree(updated_at)
+PARTITION BY network
+ORDER BY (network, pubkey);
+
+-- Validator status transitions between consecutive collector runs, one row
+-- per (operator, validator) change, e.g. active_ongoing -> active_slashed.
+CREATE TABLE IF NOT EXISTS default.validator_status_events (
+    network String,
+    event_date Date,
+    operator_id UInt32,
+    pubkey String,
+    old_status LowCardinality(String),
+    new_status LowCardinality(String),
+    event_type LowCardinality(String),
+    updated_at DateTime DEFAULT now()
+) ENGINE = ReplacingMergeTree(updated_at)
+PARTITION BY network
+ORDER BY (network, event_date, operator_id, pubkey);
+
+-- Proposed and missed block counts per operator over the collector's
+-- block-proposals window (one row per operator with proposer duties).
+CREATE TABLE IF NOT EXISTS default.block_proposals (
+    network String,
+    operator_id UInt32,
+    metric_date Date,
+    proposed UInt32,
+    missed UInt32,
+    source String,
+    updated_at DateTime DEFAULT now()
+) ENGINE = ReplacingMergeTree(updated_at)
+PARTITION BY network
+ORDER BY (network, operator_id, metric_date, source);
+
+-- One wide row per operator and day, rebuilt by the collector after each
+-- ingest (and after beacon performance reconciliation): current operator
+-- attributes plus that day's validator count, fee and reconciled performance.
+-- The bot reads days and date ranges from it without joins. updated_at is the
+-- time of the rebuild; counts_updated_at is when the validator count itself
+-- was written, which the bot uses to judge count freshness.
+CREATE TABLE IF NOT EXISTS default.operator_daily_snapshot (
+    network String,
+    metric_date Date,
+    operator_id UInt32,
+    operator_name String,
+    address String,
+    is_vo UInt8,
+    is_private UInt8,
+    vo_demoted_at Nullable(Date),
+    operator_updated_at DateTime,
+    validator_count Nullable(UInt32),
+    counts_updated_at Nullable(DateTime),
+    operator_fee Nullable(Float64),
+    perf_24h Nullable(Float64),
+    perf_30d Nullable(Float64),
+    updated_at DateTime DEFAULT now()
+) ENGINE = ReplacingMergeTree(updated_at)
+PARTITION BY network
+ORDER BY (network, metric_date, operator_id);
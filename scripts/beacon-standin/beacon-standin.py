@@ -0,0 +1,217 @@
+import argparse
+import hashlib
+import json
+import logging
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+SECONDS_PER_SLOT = 12
+SLOTS_PER_EPOCH = 32
+EFFECTIVE_BALANCE = 32_000_000_000
+
+# Ideal attestation rewards (gwei) for a 32 ETH effective balance
+IDEAL_REWARDS = {"head": 2856, "target": 5511, "source": 2966, "inclusion_delay": 0, "inactivity": 0}
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+##
+## Deterministic pseudo-random value in [0, 1) for a set of keys, so repeated
+## runs of the collector against the stand-in see the same chain.
+##
+def _unit(*keys) -> float:
+    digest = hashlib.sha256("|".join(str(k) for k in keys).encode()).digest()
+    return int.from_bytes(digest[:8], "big") / 2**64
+
+
+def _index_for_pubkey(pubkey: str) -> int:
+    return int(hashlib.sha256(pubkey.lower().encode()).hexdigest()[:7], 16)
+
+
+class BeaconStandIn:
+
+    def __init__(self, genesis_time: int, miss_rate: float, exited_rate: float, slashed_rate: float,
+                 proposal_share: float = 0.05, missed_block_rate: float = 0.01):
+        self.genesis_time = genesis_time
+        self.miss_rate = miss_rate
+        self.exited_rate = exited_rate
+        self.slashed_rate = slashed_rate
+        self.proposal_share = proposal_share
+        self.missed_block_rate = missed_block_rate
+        self.pubkeys_by_index: dict[int, str] = {}
+
+
+    def current_epoch(self) -> int:
+        return max(0, int(time.time()) - self.genesis_time) // (SECONDS_PER_SLOT * SLOTS_PER_EPOCH)
+
+
+    def validator(self, ident: str) -> dict:
+        if ident.startswith("0x"):
+            pubkey = ident.lower()
+            index = _index_for_pubkey(pubkey)
+            self.pubkeys_by_index[index] = pubkey
+        else:
+            index = int(ident)
+            pubkey = self.pubkeys_by_index.get(index, "0x" + hashlib.sha256(ident.encode()).hexdigest() * 2)[:98]
+
+        r = _unit("status", index)
+        if r < self.slashed_rate:
+            status, effective_balance = "active_slashed", 31_000_000_000
+        elif r < self.slashed_rate + self.exited_rate:
+            status, effective_balance = "exited_unslashed", 0
+        else:
+            status, effective_balance = "active_ongoing", EFFECTIVE_BALANCE
+
+        balance = effective_balance + int(_unit("balance", index) * 50_000_000) if effective_balance else 0
+
+        return {
+            "index": str(index),
+            "balance": str(balance),
+            "status": status,
+            "validator": {
+                "pubkey": pubkey,
+                "effective_balance": str(effective_balance),
+                "slashed": status == "active_slashed",
+            },
+        }
+
+
+    def proposer_index(self, slot: int) -> int:
+        # A share of slots goes to validators the collector has asked about, so
+        # SSV validators see proposals; the rest go to indices it never requested
+        known = sorted(self.pubkeys_by_index)
+        if known and _unit("proposer", slot) < self.proposal_share:
+            return known[int(_unit("pick", slot) * len(known))]
+        return 1_000_000_000 + int(_unit("other", slot) * 1_000_000)
+
+
+    def proposer_duties(self, epoch: int) -> dict:
+        duties = []
+        for slot in range(epoch * SLOTS_PER_EPOCH, (epoch + 1) * SLOTS_PER_EPOCH):
+            index = self.proposer_index(slot)
+            pubkey = self.pubkeys_by_index.get(index, "0x" + hashlib.sha256(str(index).encode()).hexdigest() * 2)[:98]
+            duties.append({"pubkey": pubkey, "validator_index": str(index), "slot": str(slot)})
+        return {"dependent_root": "0x" + "00" * 32, "execution_optimistic": False, "data": duties}
+
+
+    def block_header(self, slot: int) -> dict | None:
+        if _unit("missed_block", slot) < self.missed_block_rate:
+            return None
+        root = "0x" + hashlib.sha256(f"block|{slot}".encode()).hexdigest()
+        return {"execution_optimistic": False, "finalized": True,
+                "data": {"root": root, "canonical": True,
+                         "header": {"message": {"slot": str(slot), "proposer_index": str(self.proposer_index(slot)),
+                                                "parent_root": "0x" + "00" * 32, "state_root": "0x" + "00" * 32,
+                                                "body_root": "0x" + "00" * 32},
+                                    "signature": "0x" + "00" * 96}}}
+
+
+    def attestation_rewards(self, epoch: int, indices: list[str]) -> dict:
+        total_rewards = []
+        for ident in indices:
+            index = int(ident) if not ident.startswith("0x") else _index_for_pubkey(ident)
+            if self.validator(str(index))["validator"]["effective_balance"] == "0":
+                continue
+            if _unit("miss", index, epoch) < self.miss_rate:
+                rewards = {"head": "0", "target": str(-IDEAL_REWARDS["target"]), "source": str(-IDEAL_REWARDS["source"])}
+            else:
+                rewards = {k: str(IDEAL_REWARDS[k]) for k in ("head", "target", "source")}
+            total_rewards.append({"validator_index": str(index), **rewards, "inclusion_delay": "0", "inactivity": "0"})
+
+        ideal = [{"effective_balance": str(EFFECTIVE_BALANCE), **{k: str(v) for k, v in IDEAL_REWARDS.items()}},
+                 {"effective_balance": "31000000000", **{k: str(v * 31 // 32) for k, v in IDEAL_REWARDS.items()}}]
+
+        return {"execution_optimistic": False, "finalized": True,
+                "data": {"ideal_rewards": ideal, "total_rewards": total_rewards}}
+
+
+def make_handler(chain: BeaconStandIn):
+
+    class Handler(BaseHTTPRequestHandler):
+
+        def _send(self, status: int, body: dict | None):
+            payload = json.dumps(body or {}).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+
+        def do_GET(self):
+            url = urlparse(self.path)
+
+            if url.path == "/eth/v1/beacon/genesis":
+                return self._send(200, {"data": {"genesis_time": str(chain.genesis_time)}})
+
+            if url.path == "/eth/v1/beacon/states/head/finality_checkpoints":
+                finalized = max(0, chain.current_epoch() - 2)
+                return self._send(200, {"data": {"finalized": {"epoch": str(finalized)}}})
+
+            if url.path == "/eth/v1/beacon/states/head/validators":
+                ids = [i for v in parse_qs(url.query).get("id", []) for i in v.split(",") if i]
+                return self._send(200, {"data": [chain.validator(i) for i in ids]})
+
+            parts = url.path.strip("/").split("/")
+            if parts[:4] == ["eth", "v1", "validator", "duties"] and parts[4:5] == ["proposer"] and len(parts) == 6:
+                return self._send(200, chain.proposer_duties(int(parts[5])))
+
+            if parts[:4] == ["eth", "v1", "beacon", "headers"] and len(parts) == 5 and parts[4].isdigit():
+                header = chain.block_header(int(parts[4]))
+                if header is None:
+                    return self._send(404, {"code": 404, "message": "Could not find requested block"})
+                return self._send(200, header)
+
+            logging.info("Unhandled GET %s", self.path)
+            return self._send(404, {"code": 404, "message": "Not found"})
+
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            parts = url.path.strip("/").split("/")
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"[]")
+
+            if parts[:5] == ["eth", "v1", "beacon", "rewards", "attestations"] and len(parts) == 6:
+                return self._send(200, chain.attestation_rewards(int(parts[5]), [str(i) for i in body]))
+
+            logging.info("Unhandled POST %s", self.path)
+            return self._send(404, {"code": 404, "message": "Not found"})
+
+
+        def log_message(self, fmt, *args):
+            logging.debug(fmt, *args)
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local stand-in for the subset of the beacon node API used by the collector')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on (default 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=5052, help='Port to listen on (default 5052)')
+    parser.add_argument('--genesis-days-ago', type=int, default=30,
+                        help='Place genesis this many days in the past (default 30)')
+    parser.add_argument('--miss-rate', type=float, default=0.02,
+                        help='Fraction of attestations missed by each validator (default 0.02)')
+    parser.add_argument('--exited-rate', type=float, default=0.01,
+                        help='Fraction of validators reported as exited (default 0.01)')
+    parser.add_argument('--slashed-rate', type=float, default=0.001,
+                        help='Fraction of validators reported as slashed (default 0.001)')
+    parser.add_argument('--proposal-share', type=float, default=0.05,
+                        help='Fraction of slots proposed by validators the collector has requested (default 0.05)')
+    parser.add_argument('--missed-block-rate', type=float, default=0.01,
+                        help='Fraction of slots with no block (default 0.01)')
+    args = parser.parse_args()
+
+    genesis_time = int(time.time()) - args.genesis_days_ago * 86400
+    chain = BeaconStandIn(genesis_time, args.miss_rate, args.exited_rate, args.slashed_rate,
+                          args.proposal_share, args.missed_block_rate)
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(chain))
+    logging.info("Beacon stand-in listening on http://%s:%d (genesis %d)", args.host, args.port, genesis_time)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,20 @@
 from clickhouse_connect import create_client
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from collections import deque
 from datetime import datetime, timezone
+import numpy as np
 import requests
 import argparse
+import gzip
+import hashlib
+import threading
+import json
+import random
+import re
+import socket
+import uuid
+import statistics
+import math
 import time
 import os
 import logging
@@ -15,11 +28,32 @@ BLOCKS_PER_YEAR = BLOCKS_PER_DAY * DAYS_PER_YEAR
 
 IMPORT_SOURCE = os.environ.get("IMPORT_SOURCE", 'api.ssv.network')
 SSV_API_BASE = "https://api.ssv.network/api/v4"
+# Comma-separated SSV API base URLs; the first is preferred until health scores say otherwise
+SSV_API_URLS = os.environ.get("SSV_API_URLS", SSV_API_BASE)
+
+# A request slower than this percentile of recent latencies is hedged to a second endpoint
+HEDGE_PERCENTILE   = float(os.environ.get("HEDGE_PERCENTILE", 0.95))
+HEDGE_MIN_SAMPLES  = int(os.environ.get("HEDGE_MIN_SAMPLES", 20))
 
 STATUS_RPM         = int(os.environ.get("VALIDATOR_STATUS_RPM", 60))
 STATUS_BATCH_SIZE  = int(os.environ.get("VALIDATOR_STATUS_BATCH", 1000))
 STATUS_DELAY       = 60 / max(1, STATUS_RPM)
 
+BEACON_PERF_SOURCE = os.environ.get("BEACON_PERF_SOURCE", "beacon")
+
+# Sources in the order they are trusted when reconciling `performance`; sources
+# not listed rank after all listed ones.
+PERFORMANCE_SOURCE_PRIORITY = [
+    src.strip()
+    for src in os.environ.get("PERFORMANCE_SOURCE_PRIORITY", f"{IMPORT_SOURCE},{BEACON_PERF_SOURCE}").split(",")
+    if src.strip()
+]
+
+# Days a demoted verified operator stays in operator_daily_snapshot after its
+# demotion, so the bot can list it as recently removed. Must be at least the
+# bot's VO_RECENTLY_REMOVED_DAYS (3).
+SNAPSHOT_DEMOTED_DAYS = 7
+
 ACTIVE_STATUSES = {
     "active",             # This is the main active status returned by the API
     "active_ongoing",     # This and the following are official statuses not presently returned by the API
@@ -29,6 +63,15 @@ ACTIVE_STATUSES = {
     "pending_initialized",
 }
 
+# Facets of the network-wide summary, mirroring the breakdowns offered by the
+# bot's /fees and /operators commands. Private facets are bucketed more coarsely
+# and with a wider outlier fence, as the bot does.
+SUMMARY_FACETS = (
+    "all", "vo", "non_vo",
+    "public", "public_vo", "public_non_vo",
+    "private", "private_vo", "private_non_vo",
+)
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 
@@ -42,74 +85,543 @@ def get_clickhouse_client(clickhouse_password):
     )
 
 
-def http_get_json(url: str, timeout: int = 30) -> dict | None:
+class ResponseCache:
+    """
+    On-disk cache of GET responses keyed by request. Bodies are stored gzipped
+    next to a small metadata file holding the ETag, Last-Modified and SHA-256
+    of the body, so unchanged pages can be served from a 304. The parsed form
+    of a page is kept alongside, tagged with the body hash, so a page whose
+    body hasn't changed since the last run is not decoded or parsed again.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self.reused = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, key: str) -> tuple[str, str]:
+        key = hashlib.sha256(key.encode()).hexdigest()
+        base = os.path.join(self.directory, key[:2], key)
+        return base + ".meta.json", base + ".body.gz"
+
+    def _parsed_path(self, key: str) -> str:
+        meta_path, _ = self._paths(key)
+        return meta_path[:-len(".meta.json")] + ".parsed.json.gz"
+
+    def load_meta(self, key: str) -> dict | None:
+        meta_path, _ = self._paths(key)
+        try:
+            with open(meta_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def load_body(self, key: str) -> bytes | None:
+        _, body_path = self._paths(key)
+        try:
+            with gzip.open(body_path, "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def store(self, key: str, body: bytes, content_hash: str, etag: str | None, last_modified: str | None):
+        meta_path, body_path = self._paths(key)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+
+        # Write to temp files and rename, so a crash never leaves a torn entry
+        with gzip.open(body_path + ".tmp", "wb", compresslevel=6) as f:
+            f.write(body)
+        os.replace(body_path + ".tmp", body_path)
+        with open(meta_path + ".tmp", "w") as f:
+            json.dump({
+                "key": key,
+                "etag": etag,
+                "last_modified": last_modified,
+                "content_hash": content_hash,
+                "stored_at": datetime.now(timezone.utc).isoformat(),
+            }, f)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    def load_parsed(self, key: str, content_hash: str, parser: str):
+        """
+        Parsed form of the cached page, or None unless it was produced by the
+        same parser (and PARSED_PAGE_VERSION) from a body with content_hash.
+        """
+        try:
+            with gzip.open(self._parsed_path(key), "rt") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (entry.get("content_hash") != content_hash or entry.get("parser") != parser
+                or entry.get("version") != PARSED_PAGE_VERSION):
+            return None
+        return entry.get("parsed")
+
+    def store_parsed(self, key: str, content_hash: str, parser: str, parsed):
+        parsed_path = self._parsed_path(key)
+        os.makedirs(os.path.dirname(parsed_path), exist_ok=True)
+        with gzip.open(parsed_path + ".tmp", "wt", compresslevel=6) as f:
+            json.dump({
+                "content_hash": content_hash,
+                "parser": parser,
+                "version": PARSED_PAGE_VERSION,
+                "parsed": parsed,
+            }, f)
+        os.replace(parsed_path + ".tmp", parsed_path)
+
+    def log_stats(self):
+        logging.info("HTTP_CACHE: %d revalidated (304), %d fetched, %d unchanged pages reused without parsing",
+                     self.hits, self.misses, self.reused)
+
+
+# Set from --http-cache-dir / HTTP_CACHE_DIR in main(); None disables caching
+RESPONSE_CACHE: ResponseCache | None = None
+
+# Bump when a page parser's output changes, so cached parsed pages are rebuilt
+PARSED_PAGE_VERSION = 1
+
+
+class RunArchive:
+    """
+    Content-addressed archive of raw API responses. Each body is stored once
+    as objects/<sha256>.json.gz; each run writes a manifest listing the
+    (upstream, path, hash) of every response it used, so the run's tables can
+    be re-derived later without calling the APIs.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.entries: list[dict] = []
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _object_path(self, content_hash: str) -> str:
+        return os.path.join(self.directory, "objects", content_hash[:2], content_hash + ".json.gz")
+
+    def record(self, upstream: str, path: str, body: bytes, content_hash: str | None = None):
+        content_hash = content_hash or hashlib.sha256(body).hexdigest()
+        object_path = self._object_path(content_hash)
+        if not os.path.exists(object_path):
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            tmp_path = f"{object_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp_path, "wb", compresslevel=6) as f:
+                f.write(body)
+            os.replace(tmp_path, object_path)
+        with self._lock:
+            self.entries.append({"upstream": upstream, "path": path, "hash": content_hash})
+
+    def take_entries(self) -> list[dict]:
+        with self._lock:
+            entries, self.entries = self.entries, []
+        return entries
+
+    def add_entries(self, entries: list[dict]):
+        with self._lock:
+            self.entries.extend(entries)
+
+    def load_object(self, content_hash: str) -> bytes:
+        with gzip.open(self._object_path(content_hash), "rb") as f:
+            return f.read()
+
+    def write_manifest(self, network: str, target_date, meta: dict) -> str:
+        run_dir = os.path.join(self.directory, "runs", network, target_date.isoformat())
+        os.makedirs(run_dir, exist_ok=True)
+        manifest_path = os.path.join(
+            run_dir, f"{datetime.now(timezone.utc).strftime('%H%M%S')}-{uuid.uuid4().hex[:8]}.json")
+        manifest = dict(meta, network=network, date=target_date.isoformat(), entries=self.take_entries())
+        with open(manifest_path + ".tmp", "w") as f:
+            json.dump(manifest, f)
+        os.replace(manifest_path + ".tmp", manifest_path)
+        logging.info("ARCHIVE: wrote %s (%d responses)", manifest_path, len(manifest["entries"]))
+        return manifest_path
+
+    def latest_manifests(self, network: str, date_from, date_to) -> dict:
+        """
+        {date: path of the newest manifest for that date} within [date_from, date_to].
+        """
+        manifests = {}
+        root = os.path.join(self.directory, "runs", network)
+        for day in sorted(os.listdir(root)) if os.path.isdir(root) else []:
+            try:
+                d = datetime.strptime(day, "%Y-%m-%d").date()
+            except ValueError:
+                continue
+            names = sorted(n for n in os.listdir(os.path.join(root, day)) if n.endswith(".json"))
+            if date_from <= d <= date_to and names:
+                manifests[d] = os.path.join(root, day, names[-1])
+        return manifests
+
+
+# Set from --archive-dir / ARCHIVE_DIR in main(); None disables archiving
+RUN_ARCHIVE: RunArchive | None = None
+
+
+class Endpoint:
+    """
+    One base URL of an upstream, with an exponentially weighted success rate
+    and latency used to rank it against its mirrors.
+    """
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+        self.success_rate = 1.0
+        self.latency = None
+        self.requests = 0
+        self.failures = 0
+
+    def record(self, ok: bool, elapsed: float, alpha: float = 0.2):
+        self.requests += 1
+        if not ok:
+            self.failures += 1
+        self.success_rate = (1 - alpha) * self.success_rate + alpha * (1.0 if ok else 0.0)
+        if ok:
+            self.latency = elapsed if self.latency is None else (1 - alpha) * self.latency + alpha * elapsed
+
+    @property
+    def health(self) -> float:
+        """
+        Success rate discounted by latency: 1.0 for an always-successful,
+        instant endpoint.
+        """
+        return self.success_rate / (1.0 + (self.latency or 0.0))
+
+
+class EndpointPool:
+    """
+    Equivalent base URLs for one upstream (SSV API mirrors, several beacon
+    nodes). Requests go to the healthiest endpoint; one still running past
+    the HEDGE_PERCENTILE latency of the pool is hedged to the next endpoint,
+    and connection errors, timeouts and 5xx responses fall back through the
+    remaining endpoints in health order. Any other HTTP error (e.g. a 404)
+    is the upstream's answer and is raised to the caller straight away.
+    """
+
+    def __init__(self, name: str, base_urls: list[str]):
+        self.name = name
+        self.endpoints = [Endpoint(url) for url in base_urls]
+        self.latencies = deque(maxlen=500)
+        self.hedged = 0
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+
+    def executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix=f"{self.name}-hedge")
+            return self._executor
+
+    def close(self):
+        """
+        Shut down the request threads, abandoning hedged requests still in flight.
+        """
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    @staticmethod
+    def should_fall_back(e: requests.RequestException) -> bool:
+        if isinstance(e, requests.HTTPError):
+            return e.response is None or e.response.status_code >= 500
+        return isinstance(e, (requests.ConnectionError, requests.Timeout))
+
+    def ranked(self) -> list[Endpoint]:
+        # Stable sort keeps configuration order among equally healthy endpoints
+        return sorted(self.endpoints, key=lambda ep: -ep.health)
+
+    def hedge_delay(self) -> float | None:
+        if len(self.endpoints) < 2 or len(self.latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(HEDGE_PERCENTILE * len(ordered)))]
+
+    def _send(self, endpoint: Endpoint, method: str, path: str, kwargs: dict) -> requests.Response:
+        started = time.monotonic()
+        try:
+            resp = requests.request(method, endpoint.base_url + path, **kwargs)
+            resp.raise_for_status()
+        except requests.RequestException as e:
+            # A 4xx is an answer (e.g. a slot without a block), not an unhealthy endpoint
+            answered = isinstance(e, requests.HTTPError) and not self.should_fall_back(e)
+            endpoint.record(answered, time.monotonic() - started)
+            raise
+        elapsed = time.monotonic() - started
+        endpoint.record(True, elapsed)
+        self.latencies.append(elapsed)
+        return resp
+
+    def request(self, method: str, path: str, **kwargs) -> requests.Response:
+        """
+        Send `method path` and return the first successful response. Raises a
+        final HTTP error (see should_fall_back) as soon as one arrives, and the
+        last error when every endpoint failed.
+        """
+        order = self.ranked()
+        pending = {}
+        next_index = 0
+        hedge_after = self.hedge_delay()
+        last_error: Exception | None = None
+
+        def launch():
+            nonlocal next_index
+            endpoint = order[next_index]
+            next_index += 1
+            pending[self.executor().submit(self._send, endpoint, method, path, kwargs)] = endpoint
+
+        launch()
+        while pending:
+            can_hedge = hedge_after is not None and next_index == 1 and next_index < len(order)
+            done, _ = wait(pending, timeout=hedge_after if can_hedge else None, return_when=FIRST_COMPLETED)
+
+            if not done:
+                logging.debug("%s: hedging %s after %.2fs", self.name, path, hedge_after)
+                self.hedged += 1
+                launch()
+                continue
+
+            for future in done:
+                endpoint = pending.pop(future)
+                try:
+                    return future.result()
+                except requests.RequestException as e:
+                    if not self.should_fall_back(e):
+                        logging.debug("%s: %s answered %s on %s", self.name, path, e, endpoint.base_url)
+                        raise
+                    last_error = e
+                    logging.warning("%s: %s failed on %s: %s", self.name, path, endpoint.base_url, e)
+
+            # Fall back to the next endpoint once nothing is in flight
+            if not pending and next_index < len(order):
+                launch()
+
+        raise last_error
+
+    def log_health(self):
+        for ep in self.ranked():
+            logging.info("%s: %s health=%.3f success=%.3f latency=%s requests=%d failures=%d",
+                         self.name, ep.base_url, ep.health, ep.success_rate,
+                         f"{ep.latency:.2f}s" if ep.latency is not None else "n/a",
+                         ep.requests, ep.failures)
+        if self.hedged:
+            logging.info("%s: %d requests hedged", self.name, self.hedged)
+
+
+_ENDPOINT_POOLS: dict[tuple[str, str], EndpointPool] = {}
+
+
+def get_endpoint_pool(name: str, base_urls: str) -> EndpointPool:
+    """
+    Shared pool for a comma-separated list of base URLs, so health scores
+    accumulate across every request to the same upstream.
+    """
+    key = (name, base_urls)
+    if key not in _ENDPOINT_POOLS:
+        urls = [u.strip().rstrip("/") for u in base_urls.split(",") if u.strip()]
+        _ENDPOINT_POOLS[key] = EndpointPool(name, urls)
+    return _ENDPOINT_POOLS[key]
+
+
+def close_endpoint_pools():
+    for pool in _ENDPOINT_POOLS.values():
+        pool.close()
+
+
+def ssv_api() -> EndpointPool:
+    return get_endpoint_pool("SSV_API", SSV_API_URLS)
+
+
+def beacon_api(beacon_api_url: str) -> EndpointPool:
+    return get_endpoint_pool("BEACON_API", beacon_api_url)
+
+
+def log_fetch_stats():
+    if RESPONSE_CACHE:
+        RESPONSE_CACHE.log_stats()
+    for pool in _ENDPOINT_POOLS.values():
+        pool.log_health()
+
+
+def http_get_json(pool: EndpointPool, path: str, timeout: int = 30) -> dict | None:
+    response = http_get_body(pool, path, timeout)
+    if response is None:
+        return None
     try:
-        resp = requests.get(url, headers={"Accept": "application/json"}, timeout=timeout)
-        resp.raise_for_status()
-        return resp.json()
+        return json.loads(response[0])
+    except ValueError as e:
+        logging.error(f"{pool.name}: invalid JSON for {path}: {e}")
+        return None
+
+
+def http_get_body(pool: EndpointPool, path: str, timeout: int = 30) -> tuple[bytes, str] | None:
+    """
+    GET a document from the pool through RESPONSE_CACHE when enabled,
+    sending If-None-Match / If-Modified-Since and reusing the cached body on
+    304. The cache is keyed by upstream and path, so mirrors share entries.
+    Returns (body, content_hash); None on error.
+    """
+    cache = RESPONSE_CACHE
+    cache_key = f"{pool.name}:{path}"
+    meta = cache.load_meta(cache_key) if cache else None
+
+    headers = {"Accept": "application/json"}
+    if meta:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        resp = pool.request("GET", path, headers=headers, timeout=timeout)
+        body = cache.load_body(cache_key) if meta and resp.status_code == 304 else None
+        if body is None:
+            if resp.status_code == 304:
+                # Cached body vanished; ask again unconditionally
+                resp = pool.request("GET", path, headers={"Accept": "application/json"}, timeout=timeout)
+            body = resp.content
     except requests.RequestException as e:
-        logging.error(f"API request failed for {url}: {e}")
+        logging.error(f"{pool.name}: request failed for {path}: {e}")
+        return None
+
+    content_hash = hashlib.sha256(body).hexdigest()
+
+    if RUN_ARCHIVE:
+        RUN_ARCHIVE.record(pool.name, path, body, content_hash)
+
+    if cache:
+        if resp.status_code == 304:
+            cache.hits += 1
+        else:
+            cache.misses += 1
+            cache.store(cache_key, body, content_hash, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+
+    return body, content_hash
+
+
+def http_get_parsed(pool: EndpointPool, path: str, parse, timeout: int = 30):
+    """
+    GET a JSON page and return parse(data). With RESPONSE_CACHE enabled, a
+    page whose body hash matches the one its cached parsed form came from is
+    returned from that instead of being decoded and parsed again; parse must
+    therefore return JSON-serializable data. None on error.
+    """
+    response = http_get_body(pool, path, timeout)
+    if response is None:
+        return None
+    body, content_hash = response
+
+    cache = RESPONSE_CACHE
+    cache_key = f"{pool.name}:{path}"
+    if cache:
+        parsed = cache.load_parsed(cache_key, content_hash, parse.__name__)
+        if parsed is not None:
+            cache.reused += 1
+            return parsed
+
+    try:
+        parsed = parse(json.loads(body))
+    except ValueError as e:
+        logging.error(f"{pool.name}: invalid JSON for {path}: {e}")
         return None
 
+    if cache:
+        cache.store_parsed(cache_key, content_hash, parse.__name__, parsed)
+    return parsed
+
 
 def fetch_operators_from_ssv(network: str, per_page: int = 100) -> dict[int, dict]:
+    operators, _ = fetch_operator_pages(network, per_page)
+    logging.info("SSV_API: Collected %d operators from /operators.", len(operators))
+    return operators
+
+
+def fetch_operator_pages(network: str, per_page: int = 100, first_page: int = 1,
+                         last_page: int | None = None) -> tuple[dict[int, dict], bool]:
+    """
+    Fetch /operators pages first_page..last_page (until an empty page when
+    last_page is None). Returns (operators, complete); complete is False when
+    a request error cut the range short.
+    """
     operators: dict[int, dict] = {}
 
-    page = 1
-    while True:
-        url = f"{SSV_API_BASE}/{network}/operators?perPage={per_page}&page={page}"
-        data = http_get_json(url, timeout=30)
-        if data is None:
+    page = first_page
+    while last_page is None or page <= last_page:
+        path = f"/{network}/operators?perPage={per_page}&page={page}"
+        parsed_page = http_get_parsed(ssv_api(), path, parse_operators_page, timeout=30)
+        if parsed_page is None:
             logging.error(f"SSV_API: Stopping operators fetch due to request error at page={page}.")
-            break
+            return operators, False
 
-        ops = data.get("operators", []) or []
-        if not ops:
+        if not parsed_page["count"]:
             break
 
-        for op in ops:
-            try:
-                op_id = int(op["id"])
-            except Exception:
-                continue
+        for op in parsed_page["operators"]:
+            operators[op["id"]] = op
 
-            # Normalize performance
-            perf = {}
-            p = op.get("performance") or {}
-            try:
-                v = p.get("24h")
-                if v is not None:
-                    v = float(v)
-                    perf["24h"] = v if v == 0 else v / 100.0
-            except Exception:
-                pass
-            try:
-                v = p.get("30d")
-                if v is not None:
-                    v = float(v)
-                    perf["30d"] = v if v == 0 else v / 100.0
-            except Exception:
-                pass
-            if "24h" not in perf: perf["24h"] = 0.0
-            if "30d" not in perf: perf["30d"] = 0.0
-
-            operators[op_id] = {
-                "id": op_id,
-                "name": op.get("name", ""),
-                "type": op.get("type", ""),
-                "is_private": bool(op.get("is_private", False)),
-                "fee": op.get("fee"),
-                "owner_address": op.get("owner_address", ""),
-                "performance": perf,
-                # We'll fill validators_count later
-            }
-
-        logging.info("SSV_API: Operators page %d → +%d (total: %d)", page, len(ops), len(operators))
+        logging.info("SSV_API: Operators page %d → +%d (total: %d)", page, parsed_page["count"], len(operators))
         page += 1
         time.sleep(REQUEST_DELAY)
 
-    logging.info("SSV_API: Collected %d operators from /operators.", len(operators))
-    return operators
+    return operators, True
+
+
+def parse_operators_page(data: dict) -> dict:
+    """
+    Parse one /operators page into {"count": operators on the page,
+    "operators": [parsed operator, ...]}.
+    """
+    ops = data.get("operators", []) or []
+    parsed = (parse_ssv_operator(op) for op in ops)
+    return {"count": len(ops), "operators": [op for op in parsed if op is not None]}
+
+
+def parse_ssv_operator(op: dict) -> dict | None:
+    """
+    Normalize one SSV API operator; None when it has no usable ID.
+    """
+    try:
+        op_id = int(op["id"])
+    except Exception:
+        return None
+
+    # Normalize performance
+    perf = {}
+    p = op.get("performance") or {}
+    try:
+        v = p.get("24h")
+        if v is not None:
+            v = float(v)
+            perf["24h"] = v if v == 0 else v / 100.0
+    except Exception:
+        pass
+    try:
+        v = p.get("30d")
+        if v is not None:
+            v = float(v)
+            perf["30d"] = v if v == 0 else v / 100.0
+    except Exception:
+        pass
+    if "24h" not in perf: perf["24h"] = 0.0
+    if "30d" not in perf: perf["30d"] = 0.0
+
+    # Total validators per the listing (all statuses), used by the fast count path
+    try:
+        listed_count = int(op.get("validators_count"))
+    except (TypeError, ValueError):
+        listed_count = None
+
+    return {
+        "id": op_id,
+        "name": op.get("name", ""),
+        "type": op.get("type", ""),
+        "is_private": bool(op.get("is_private", False)),
+        "fee": op.get("fee"),
+        "owner_address": op.get("owner_address", ""),
+        "performance": perf,
+        "listed_validators_count": listed_count,
+        # We'll fill validators_count later
+    }
 
 
 def fetch_validators_maps(network: str, per_page: int = 1000):
@@ -119,28 +631,101 @@ def fetch_validators_maps(network: str, per_page: int = 1000):
       - operator_validators: {op_id -> set(pubkeys)}
       - all_pubkeys: set(pubkeys)
       - all_pubkeys_status: {pubkey -> bool}
+      - validator_clusters: {pubkey -> sorted tuple of operator IDs}
+    """
+    records, _ = fetch_validator_records(network, per_page)
+    return build_validator_maps(records)
+
+
+def build_validator_maps(records: dict[str, tuple[str, tuple[int, ...]]]):
+    """
+    Expand {pubkey: (status, cluster)} into the maps returned by
+    fetch_validators_maps.
     """
     operator_validators: dict[int, set[str]] = {}
     all_pubkeys: set[str] = set()
     all_pubkeys_status: dict[str, bool] = {}
+    validator_clusters: dict[str, tuple[int, ...]] = {}
+
+    for pubkey, (status, cluster) in records.items():
+        all_pubkeys.add(pubkey)
+        all_pubkeys_status[pubkey] = status
+        if cluster:
+            validator_clusters[pubkey] = cluster
+        for op_id in cluster:
+            operator_validators.setdefault(op_id, set()).add(pubkey)
+
+    logging.info("SSV_API: Validators done. Unique validators=%d, operators_with_validators=%d",
+                 len(all_pubkeys), len(operator_validators))
+
+    return operator_validators, all_pubkeys, all_pubkeys_status, validator_clusters
+
+
+def parse_ssv_validator(v: dict) -> tuple[str, str, tuple[int, ...]] | None:
+    """
+    Normalize one SSV API validator into (pubkey, status, sorted operator ID
+    tuple); None when it has no pubkey.
+    """
+    # Get a pubkey or move along
+    pubkey = v.get("public_key")
+    if not pubkey:
+        logging.warning(f"SSV_API: Validator with missing/empty pubkey (id={v.get('id')}); skipping.")
+        return None
+
+    # Make sure all pubkeys are 0x-prefixed and normalized lower case
+    if isinstance(pubkey, str):
+        pubkey = pubkey.strip()
+        if not pubkey.startswith("0x"):
+            pubkey = "0x" + pubkey
+        pubkey = pubkey.lower()
+
+    # Prefer specific validator status or general is_active flag
+    st = ((v.get("validator_info") or {}).get("status") or "").lower()
+    if st is None or st == "":
+        st = "active"
+
+    # Keep the validator's cluster (its full operator set)
+    cluster_op_ids = set()
+    for op in (v.get("operators") or []):
+        raw_id = op.get("id", op.get("id_str"))
+        try:
+            op_id = int(raw_id)
+        except Exception:
+            logging.warning(f"SSV_API: Validator {pubkey} has invalid operator ID: {raw_id}; skipping this operator.")
+            continue
+        cluster_op_ids.add(op_id)
+
+    return pubkey, st, tuple(sorted(cluster_op_ids))
+
 
-    last_id: int | None = None
+def fetch_validator_records(network: str, per_page: int = 1000, after_id: int | None = None,
+                            until_id: int | None = None) -> tuple[dict[str, tuple[str, tuple[int, ...]]], bool]:
+    """
+    Cursor-based pagination using lastId for /validators, covering validator
+    IDs in (after_id, until_id] (open-ended when until_id is None).
+    Returns ({pubkey: (status, sorted operator ID tuple)}, complete); complete
+    is False when a request error cut the range short.
+    """
+    records: dict[str, tuple[str, tuple[int, ...]]] = {}
+
+    last_id: int | None = after_id
     batch = 0
 
-    logging.info("SSV_API: Fetching validators via lastId, perPage=%d", per_page)
+    logging.info("SSV_API: Fetching validators via lastId, perPage=%d, range=(%s, %s]",
+                 per_page, after_id, until_id)
 
     while True:
         qs = f"perPage={per_page}"
         if last_id is not None:
             qs += f"&lastId={last_id}"
-        url = f"{SSV_API_BASE}/{network}/validators?{qs}"
+        path = f"/{network}/validators?{qs}"
 
-        data = http_get_json(url, timeout=30)
-        if data is None:
+        parsed_page = http_get_parsed(ssv_api(), path, parse_validators_page, timeout=30)
+        if parsed_page is None:
             logging.error(f"Stopping validators fetch due to request error (lastId={last_id}).")
-            break
+            return records, False
 
-        validators = data.get("validators", []) or []
+        validators = parsed_page["validators"]
         if not validators:
             logging.info("SSV_API: No validators for lastId=%s; stopping.", last_id)
             break
@@ -148,59 +733,22 @@ def fetch_validators_maps(network: str, per_page: int = 1000):
         batch += 1
         max_id_in_batch: int | None = None
 
-        for v in validators:
+        for vid, record in validators:
 
             # Tracking last ID retrieved from API for next query cursor
-            vid_raw = v.get("id")
-            try:
-                vid = int(vid_raw) if vid_raw is not None else None
-            except Exception:
-                vid = None
             if vid is not None:
                 if max_id_in_batch is None or vid > max_id_in_batch:
                     max_id_in_batch = vid
-
-            # Get a pubkey or move along
-            pubkey = v.get("public_key")
-            if not pubkey:
-                logging.warning(f"SSV_API: Validator with missing/empty pubkey (id={vid_raw}); skipping.")
-                continue
-            
-            # Make sure all pubkeys are 0x-prefixed and normalized lower case
-            if isinstance(pubkey, str):
-                pubkey = pubkey.strip()
-                if not pubkey.startswith("0x"):
-                    pubkey = "0x" + pubkey
-                pubkey = pubkey.lower()    
-
-            # Add to lists of all validators and active validators
-            all_pubkeys.add(pubkey)
-
-            # Prefer specific validator status or general is_active flag
-            st = ((v.get("validator_info") or {}).get("status") or "").lower()
-            if st is not None and st != "":
-                all_pubkeys_status[pubkey] = st
-            else:
-                all_pubkeys_status[pubkey] = "active"
-
-            # Build map of operators to their validators
-            #   Dict with operator ID key and valus is a set of pubkeys
-            for op in (v.get("operators") or []):
-                raw_id = op.get("id", op.get("id_str"))
-                try:
-                    op_id = int(raw_id)
-                except Exception:
-                    logging.warning(f"SSV_API: Validator {pubkey} has invalid operator ID: {raw_id}; skipping this operator.")
+                # Past the end of this range; another range owns it
+                if until_id is not None and vid > until_id:
                     continue
-                operator_validators.setdefault(op_id, set()).add(pubkey)
+
+            if record is not None:
+                pubkey, status, cluster = record
+                records[pubkey] = (status, tuple(cluster))
 
         # Advance cursor
-        pag = data.get("pagination") or {}
-        next_last = pag.get("current_last")
-        try:
-            next_last = int(next_last) if next_last is not None else None
-        except Exception:
-            next_last = None
+        next_last = parsed_page["current_last"]
         if next_last is None:
             next_last = max_id_in_batch
 
@@ -212,45 +760,96 @@ def fetch_validators_maps(network: str, per_page: int = 1000):
             logging.warning("SSV_API: Non-advancing lastId (prev=%s, next=%s); stopping.", last_id, next_last)
             break
 
+        if until_id is not None and next_last >= until_id:
+            break
+
         last_id = next_last
-        logging.info("SSV_API: Batch %d → +%d validators; next lastId=%s (operators with validators so far: %d)",
-                     batch, len(validators), last_id, len(operator_validators))
+        logging.info("SSV_API: Batch %d → +%d validators; next lastId=%s (validators so far: %d)",
+                     batch, len(validators), last_id, len(records))
 
         time.sleep(REQUEST_DELAY)
 
-    logging.info("SSV_API: Validators done. Unique validators=%d, operators_with_validators=%d",
-                 len(all_pubkeys), len(operator_validators))
-    
-    return operator_validators, all_pubkeys, all_pubkeys_status
+    return records, True
 
 
-def fetch_beacon_statuses(beacon_api_url, pubkeys: set[str]) -> dict[str, str]:
+def parse_validators_page(data: dict) -> dict:
     """
-    Fetch statuses from Beacon once per pubkey (batches).
-    Returns {pubkey: status_lower}.
+    Parse one /validators page into {"validators": [(validator ID, parsed
+    validator), ...], "current_last": pagination cursor}. Either part of a
+    pair is None when it can't be read.
+    """
+    validators = []
+    for v in data.get("validators", []) or []:
+        vid_raw = v.get("id")
+        try:
+            vid = int(vid_raw) if vid_raw is not None else None
+        except Exception:
+            vid = None
+        validators.append((vid, parse_ssv_validator(v)))
+
+    current_last = (data.get("pagination") or {}).get("current_last")
+    try:
+        current_last = int(current_last) if current_last is not None else None
+    except Exception:
+        current_last = None
+
+    return {"validators": validators, "current_last": current_last}
+
+
+BEACON_VALIDATORS_PATH = "/eth/v1/beacon/states/head/validators"
+
+
+def parse_beacon_validators(validators: list[dict]) -> dict[str, dict]:
+    """
+    Map beacon validator records to {pubkey: {"status", "index", "balance", "effective_balance"}}.
+    """
+    result: dict[str, dict] = {}
+    for item in validators:
+        pk = (item.get("validator") or {}).get("pubkey", "")
+        st = (item.get("status") or "").lower()
+        if pk:
+            try:
+                index = int(item.get("index"))
+            except (TypeError, ValueError):
+                index = None
+            try:
+                balance = int(item.get("balance"))
+            except (TypeError, ValueError):
+                balance = None
+            try:
+                effective_balance = int((item.get("validator") or {}).get("effective_balance"))
+            except (TypeError, ValueError):
+                effective_balance = None
+            result[pk.lower()] = {"status": st, "index": index, "balance": balance,
+                                  "effective_balance": effective_balance}
+    return result
+
+
+def fetch_beacon_validators(beacon_api_url, pubkeys: set[str]) -> dict[str, dict]:
+    """
+    Fetch validator records from Beacon once per pubkey (batches).
+    Returns {pubkey: {"status": status_lower, "index": validator_index,
+                      "balance": gwei, "effective_balance": gwei}}.
     """
     if not beacon_api_url:
         return {}
 
     headers = {"Accept": "application/json"}
     pubkey_list = list(pubkeys)
-    result: dict[str, str] = {}
+    result: dict[str, dict] = {}
 
     logging.info("BEACON_API: Requesting statuses for %d validators", len(pubkey_list))
     for i in range(0, len(pubkey_list), STATUS_BATCH_SIZE):
         batch = pubkey_list[i:i + STATUS_BATCH_SIZE]
         ids = ",".join(batch)
-        url = f"{beacon_api_url}/eth/v1/beacon/states/head/validators?id={ids}"
+        path = f"{BEACON_VALIDATORS_PATH}?id={ids}"
         try:
-            resp = requests.get(url, headers=headers, timeout=20)
-            resp.raise_for_status()
+            resp = beacon_api(beacon_api_url).request("GET", path, headers=headers, timeout=20)
+            if RUN_ARCHIVE:
+                # The pubkeys are in the body; keep the huge query string out of the manifest
+                RUN_ARCHIVE.record("BEACON_API", BEACON_VALIDATORS_PATH, resp.content)
             validators = resp.json().get("data", []) or []
-            # Map pubkey -> status
-            for item in validators:
-                pk = (item.get("validator") or {}).get("pubkey", "")
-                st = (item.get("status") or "").lower()
-                if pk:
-                    result[pk.lower()] = st
+            result.update(parse_beacon_validators(validators))
 
             # If fewer returned than requested, the missing ones likely aren't on-chain/deposited.
             if len(validators) < len(batch):
@@ -268,203 +867,1913 @@ def fetch_beacon_statuses(beacon_api_url, pubkeys: set[str]) -> dict[str, str]:
     return result
 
 
-def count_active_from_status_map(operator_validators: dict[int, set[str]], status_map: dict[str, str]) -> dict[int, int]:
-    return {
-        op_id: sum(1 for pk in pubkeys if status_map.get(pk.lower(), "") in ACTIVE_STATUSES)
-        for op_id, pubkeys in operator_validators.items()
+def fetch_beacon_statuses(beacon_api_url, pubkeys: set[str]) -> dict[str, str]:
+    """
+    Fetch statuses from Beacon once per pubkey (batches).
+    Returns {pubkey: status_lower}.
+    """
+    return {pk: rec["status"] for pk, rec in fetch_beacon_validators(beacon_api_url, pubkeys).items()}
+
+
+def split_beacon_validators(beacon_validators: dict[str, dict]):
+    """
+    Split beacon validator records into ({pubkey: status}, {pubkey: (balance, effective_balance)}).
+    Validators missing either balance are left out of the balances map.
+    """
+    statuses = {pk: rec["status"] for pk, rec in beacon_validators.items()}
+    balances = {
+        pk: (rec["balance"], rec["effective_balance"])
+        for pk, rec in beacon_validators.items()
+        if rec.get("balance") is not None and rec.get("effective_balance") is not None
     }
+    return statuses, balances
 
 
-def _chunks(seq, size):
-    for i in range(0, len(seq), size):
-        yield seq[i:i+size]
-        
+def count_statuses_from_status_map(operator_validators: dict[int, set[str]],
+                                   status_map: dict[str, str]) -> dict[int, dict[str, int]]:
+    """
+    Per-operator histogram of validator statuses; validators missing from the
+    status map are counted as "unknown".
+    """
+    histograms: dict[int, dict[str, int]] = {}
+    for op_id, pubkeys in operator_validators.items():
+        counts: dict[str, int] = {}
+        for pk in pubkeys:
+            status = status_map.get(pk.lower(), "") or "unknown"
+            counts[status] = counts.get(status, 0) + 1
+        histograms[op_id] = counts
+    return histograms
 
-def upsert_daily_partition(client, table: str, network: str, source: str, target_date):
-    # Inline SETTINGS so the mutation is synchronous; clickhouse_connect opens
-    # a fresh session per command, so a separate `SET mutations_sync = 2` is lost.
-    client.command(
-        f"ALTER TABLE {table} DELETE WHERE network=%(net)s AND source=%(src)s AND metric_date=%(dt)s "
-        f"SETTINGS mutations_sync = 2",
-        parameters={'net': network, 'src': source, 'dt': target_date}
-    )
 
+def active_counts_from_histograms(histograms: dict[int, dict[str, int]]) -> dict[int, int]:
+    return {
+        op_id: sum(n for status, n in counts.items() if status in ACTIVE_STATUSES)
+        for op_id, counts in histograms.items()
+    }
 
-def insert_clickhouse_performance_data(client, network, operators, target_date, source):
-    performance_rows = []
-    operator_rows = []
-    operator_ids = []
-    operator_fees_rows = []
 
-    now = datetime.now(timezone.utc)
+def count_active_from_status_map(operator_validators: dict[int, set[str]], status_map: dict[str, str]) -> dict[int, int]:
+    return active_counts_from_histograms(count_statuses_from_status_map(operator_validators, status_map))
 
-    for operator_id, operator in operators.items():
-        operator_ids.append(operator_id)
 
-        perf_24h = (operator.get("performance") or {}).get("24h", None)
-        perf_30d = (operator.get("performance") or {}).get("30d", None)
-        validator_count = operator.get("validators_count", None)
+def sum_balances_per_operator(operator_validators: dict[int, set[str]],
+                              balances: dict[str, tuple[int, int]]) -> dict[int, tuple[int, int]]:
+    """
+    Total and effective balance (gwei) of each operator's validators. Sums are
+    done in int64 with np.add.at so large stakes stay exact.
+    """
+    if not balances:
+        return {}
 
-        is_vo = 1 if operator.get("type", "") == "verified_operator" else 0
-        is_private = 1 if operator.get("is_private", False) else 0
+    pubkeys = list(balances.keys())
+    pubkey_positions = {pk: pos for pos, pk in enumerate(pubkeys)}
+    values = np.array([balances[pk] for pk in pubkeys], dtype=np.int64)
 
-        operator_fee = operator.get("fee", None)
-        if operator_fee is not None:
-            try:
-                operator_fee = float(operator_fee)
-                operator_fee = (operator_fee * BLOCKS_PER_YEAR) / 1e18
-            except Exception:
-                operator_fee = None
+    op_ids, pair_op, pair_val = build_operator_membership(operator_validators, pubkey_positions)
+    totals = np.zeros((len(op_ids), 2), dtype=np.int64)
+    np.add.at(totals, pair_op, values[pair_val])
 
-        operator_rows.append((
-            network,
-            operator_id,
-            operator.get("name", ""),
-            is_vo,
-            is_private,
-            validator_count,
-            operator_fee,
-            operator.get("owner_address", ""),
-            None,  # vo_demoted_at: cleared whenever the API is returning the operator
-            now
-        ))
+    return {op_id: (int(total), int(effective))
+            for op_id, (total, effective) in zip(op_ids.tolist(), totals.tolist())}
 
-        performance_rows.append((network, operator_id, '24h', target_date, perf_24h, source, now))
-        performance_rows.append((network, operator_id, '30d', target_date, perf_30d, source, now))
 
-        if operator_fee is not None:
-            operator_fees_rows.append((network, operator_id, target_date, operator_fee, source, now))
+def http_post_json(pool: EndpointPool, path: str, payload, timeout: int = 60) -> dict | None:
+    try:
+        resp = pool.request("POST", path, json=payload, headers={"Accept": "application/json"}, timeout=timeout)
+        return resp.json()
+    except (requests.RequestException, ValueError) as e:
+        logging.error(f"{pool.name}: request failed for {path}: {e}")
+        return None
 
-    logging.info("CLICKHOUSE: upserting %d operators, %d perf rows, %d fee rows",
-                 len(operator_rows), len(performance_rows), len(operator_fees_rows))
 
-    # 1) Operators: per-ID delete-then-insert (keeps older operators not seen today)
-    BATCH = 1000
-    for ids_chunk in _chunks(operator_ids, BATCH):
-        client.command(
-            "ALTER TABLE operators DELETE WHERE network=%(net)s AND operator_id IN %(ids)s "
-            "SETTINGS mutations_sync = 2",
-            parameters={"net": network, "ids": ids_chunk}
-        )
-    if operator_rows:
-        client.insert('operators', operator_rows, column_names=[
-            'network','operator_id','operator_name','is_vo','is_private',
+def fetch_finalized_epoch(beacon_api_url) -> int | None:
+    data = http_get_json(beacon_api(beacon_api_url), "/eth/v1/beacon/states/head/finality_checkpoints", timeout=20)
+    try:
+        return int(data["data"]["finalized"]["epoch"])
+    except (TypeError, KeyError, ValueError):
+        logging.error("BEACON_API: Could not determine finalized epoch.")
+        return None
+
+
+def fetch_proposer_duties(beacon_api_url, first_epoch: int, last_epoch: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Proposer duties for every slot in [first_epoch, last_epoch] as parallel
+    (slots, validator_indices) int64 arrays.
+    """
+    slots: list[int] = []
+    indices: list[int] = []
+    for epoch in range(first_epoch, last_epoch + 1):
+        data = http_get_json(beacon_api(beacon_api_url), f"/eth/v1/validator/duties/proposer/{epoch}", timeout=20)
+        if data is None:
+            logging.warning("BEACON_PROPOSALS: No proposer duties for epoch %d.", epoch)
+            continue
+        for duty in data.get("data") or []:
+            try:
+                slots.append(int(duty["slot"]))
+                indices.append(int(duty["validator_index"]))
+            except (KeyError, TypeError, ValueError):
+                continue
+        time.sleep(STATUS_DELAY)
+
+    return np.array(slots, dtype=np.int64), np.array(indices, dtype=np.int64)
+
+
+def fetch_block_proposer(beacon_api_url, slot: int) -> int | None:
+    """
+    Proposer index of the canonical block at slot, -1 when the slot has no
+    block (404), or None when the beacon node could not answer.
+    """
+    try:
+        resp = beacon_api(beacon_api_url).request("GET", f"/eth/v1/beacon/headers/{slot}",
+                                                  headers={"Accept": "application/json"}, timeout=20)
+        return int(resp.json()["data"]["header"]["message"]["proposer_index"])
+    except requests.HTTPError as e:
+        if e.response is not None and e.response.status_code == 404:
+            return -1
+        logging.warning("BEACON_PROPOSALS: header request failed for slot %d: %s", slot, e)
+    except (requests.RequestException, KeyError, TypeError, ValueError) as e:
+        logging.warning("BEACON_PROPOSALS: header request failed for slot %d: %s", slot, e)
+    return None
+
+
+def fetch_block_proposers(beacon_api_url, slots: list[int], workers: int, timeout: float) -> np.ndarray:
+    """
+    Proposer index of the block at each slot (see fetch_block_proposer), with
+    up to `workers` header requests in flight. Slots still unanswered after
+    `timeout` seconds, or that the beacon node could not answer for, are -2.
+    """
+    proposers = np.full(len(slots), -2, dtype=np.int64)
+    if not slots:
+        return proposers
+
+    executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="BEACON_PROPOSALS")
+    futures = {executor.submit(fetch_block_proposer, beacon_api_url, slot): i for i, slot in enumerate(slots)}
+    done, not_done = wait(futures, timeout=timeout)
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    for future in done:
+        proposer = future.result()
+        if proposer is not None:
+            proposers[futures[future]] = proposer
+    if not_done:
+        logging.warning("BEACON_PROPOSALS: %d of %d header requests unfinished after %ds; left out",
+                        len(not_done), len(slots), timeout)
+    return proposers
+
+
+def match_proposer_duties(duty_slots: np.ndarray, duty_indices: np.ndarray, validator_indices: np.ndarray):
+    """
+    Keep the duties assigned to our validators with one searchsorted lookup
+    against the sorted validator_indices. Returns (slots, validator positions).
+    """
+    if not len(validator_indices) or not len(duty_indices):
+        return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+
+    at = np.clip(np.searchsorted(validator_indices, duty_indices), 0, len(validator_indices) - 1)
+    ours = validator_indices[at] == duty_indices
+    return duty_slots[ours], at[ours]
+
+
+def compute_block_proposals(beacon_api_url, operator_validators: dict[int, set[str]],
+                            beacon_validators: dict[str, dict], epochs: int,
+                            workers: int = 8, timeout: float = 600) -> dict[int, tuple[int, int]]:
+    """
+    Proposed and missed block counts per operator over the last `epochs`
+    finalized epochs. Duties are matched to SSV validators by beacon index;
+    only their slots are checked for a block, `workers` at a time within
+    `timeout` seconds. Slots the beacon node did not answer for in time are
+    left out of both counts.
+    """
+    finalized = fetch_finalized_epoch(beacon_api_url)
+    if finalized is None:
+        return {}
+
+    known = sorted((rec["index"], pk) for pk, rec in beacon_validators.items() if rec.get("index") is not None)
+    if not known:
+        logging.warning("BEACON_PROPOSALS: No SSV validators with beacon indices; nothing to compute.")
+        return {}
+
+    validator_indices = np.array([k[0] for k in known], dtype=np.int64)
+    pubkey_positions = {k[1]: pos for pos, k in enumerate(known)}
+
+    first_epoch = max(0, finalized - epochs + 1)
+    duty_slots, duty_indices = fetch_proposer_duties(beacon_api_url, first_epoch, finalized)
+    slots, positions = match_proposer_duties(duty_slots, duty_indices, validator_indices)
+    logging.info("BEACON_PROPOSALS: %d of %d slots in epochs %d-%d were assigned to SSV validators",
+                 len(slots), len(duty_slots), first_epoch, finalized)
+
+    # -2 marks slots the beacon node did not answer for; -1 (no block) never matches an index
+    proposers = fetch_block_proposers(beacon_api_url, slots.tolist(), workers, timeout)
+    answered = proposers != -2
+    proposed = proposers == validator_indices[positions]
+    missed = answered & ~proposed
+
+    op_ids, pair_op, pair_val = build_operator_membership(operator_validators, pubkey_positions)
+    per_validator_proposed = np.bincount(positions[proposed], minlength=len(known)).astype(np.float64)
+    per_validator_missed = np.bincount(positions[missed], minlength=len(known)).astype(np.float64)
+    op_proposed = sum_per_operator(op_ids, pair_op, pair_val, per_validator_proposed)
+    op_missed = sum_per_operator(op_ids, pair_op, pair_val, per_validator_missed)
+
+    has_duties = (op_proposed + op_missed) > 0
+    logging.info("BEACON_PROPOSALS: %d proposed, %d missed, %d unanswered; %d operators with duties",
+                 int(proposed.sum()), int(missed.sum()), int((~answered).sum()), int(has_duties.sum()))
+    return {op_id: (int(p), int(m)) for op_id, p, m in
+            zip(op_ids[has_duties].tolist(), op_proposed[has_duties].tolist(), op_missed[has_duties].tolist())}
+
+
+def build_operator_membership(operator_validators: dict[int, set[str]], pubkey_positions: dict[str, int]):
+    """
+    Flatten {op_id -> set(pubkeys)} into parallel arrays so per-validator values can
+    be summed per operator with np.bincount instead of Python loops.
+    Returns (op_ids, pair_op, pair_val): op_ids[pair_op[k]] runs the validator at
+    position pair_val[k]. Pubkeys without a position are dropped.
+    """
+    op_ids = np.array(sorted(operator_validators.keys()), dtype=np.int64)
+    pair_op: list[int] = []
+    pair_val: list[int] = []
+    for op_pos, op_id in enumerate(op_ids.tolist()):
+        for pk in operator_validators[op_id]:
+            pos = pubkey_positions.get(pk)
+            if pos is not None:
+                pair_op.append(op_pos)
+                pair_val.append(pos)
+
+    return op_ids, np.array(pair_op, dtype=np.int64), np.array(pair_val, dtype=np.int64)
+
+
+def sum_per_operator(op_ids, pair_op, pair_val, values: np.ndarray) -> np.ndarray:
+    """Sum a per-validator array over each operator's validators."""
+    return np.bincount(pair_op, weights=values[pair_val], minlength=len(op_ids))
+
+
+def accumulate_attestation_rewards(data: dict, index_positions: np.ndarray, validator_indices: np.ndarray,
+                                   effective_balances: np.ndarray, earned: np.ndarray, ideal: np.ndarray):
+    """
+    Add one epoch's attestation rewards response into the per-validator earned and
+    ideal arrays. Head, target and source rewards count; penalties count as zero
+    earned. Ideal rewards are looked up by each validator's effective balance.
+    """
+    total_rewards = data.get("total_rewards") or []
+    ideal_rewards = data.get("ideal_rewards") or []
+    if not total_rewards or not ideal_rewards:
+        return 0
+
+    ideal_balances = np.array([int(r["effective_balance"]) for r in ideal_rewards], dtype=np.int64)
+    ideal_sums = np.array([int(r["head"]) + int(r["target"]) + int(r["source"]) for r in ideal_rewards],
+                          dtype=np.float64)
+    order = np.argsort(ideal_balances)
+    ideal_balances, ideal_sums = ideal_balances[order], ideal_sums[order]
+
+    idx = np.array([int(r["validator_index"]) for r in total_rewards], dtype=np.int64)
+    got = np.array([max(int(r["head"]), 0) + max(int(r["target"]), 0) + max(int(r["source"]), 0)
+                    for r in total_rewards], dtype=np.float64)
+
+    # Map validator indices back to positions in the SSV validator arrays
+    at = np.searchsorted(validator_indices, idx)
+    at = np.clip(at, 0, len(validator_indices) - 1)
+    known = validator_indices[at] == idx
+    pos = index_positions[at[known]]
+    got = got[known]
+
+    # Ideal reward for each validator's effective balance
+    eb = effective_balances[pos]
+    eb_at = np.clip(np.searchsorted(ideal_balances, eb), 0, len(ideal_balances) - 1)
+    matched = ideal_balances[eb_at] == eb
+
+    earned[pos[matched]] += np.minimum(got[matched], ideal_sums[eb_at[matched]])
+    ideal[pos[matched]] += ideal_sums[eb_at[matched]]
+    return int(matched.sum())
+
+
+def compute_beacon_operator_performance(beacon_api_url, operator_validators: dict[int, set[str]],
+                                        beacon_validators: dict[str, dict], epochs: int,
+                                        batch_size: int) -> dict[int, float]:
+    """
+    Compute per-operator attestation effectiveness over the last `epochs` finalized
+    epochs from the beacon rewards API: the sum of head/target/source rewards earned
+    by an operator's validators divided by the ideal rewards for their effective
+    balances. Returns {op_id: effectiveness in [0, 1]}.
+    """
+    finalized = fetch_finalized_epoch(beacon_api_url)
+    if finalized is None:
+        return {}
+
+    # Position arrays for SSV validators known to the beacon node, sorted by index
+    known = sorted((rec["index"], pk, rec.get("effective_balance") or 0)
+                   for pk, rec in beacon_validators.items() if rec.get("index") is not None)
+    if not known:
+        logging.warning("BEACON_PERF: No SSV validators with beacon indices; nothing to compute.")
+        return {}
+
+    validator_indices = np.array([k[0] for k in known], dtype=np.int64)
+    index_positions = np.arange(len(known), dtype=np.int64)
+    effective_balances = np.array([k[2] for k in known], dtype=np.int64)
+    pubkey_positions = {k[1]: pos for pos, k in enumerate(known)}
+
+    earned = np.zeros(len(known), dtype=np.float64)
+    ideal = np.zeros(len(known), dtype=np.float64)
+
+    first_epoch = max(0, finalized - epochs + 1)
+    index_strs = [str(i) for i in validator_indices.tolist()]
+    logging.info("BEACON_PERF: Computing rewards for %d validators over epochs %d-%d",
+                 len(known), first_epoch, finalized)
+
+    for epoch in range(first_epoch, finalized + 1):
+        counted = 0
+        for batch in _chunks(index_strs, batch_size):
+            data = http_post_json(beacon_api(beacon_api_url), f"/eth/v1/beacon/rewards/attestations/{epoch}", batch)
+            if data is None:
+                logging.warning("BEACON_PERF: No rewards for epoch %d batch of %d.", epoch, len(batch))
+                continue
+            counted += accumulate_attestation_rewards(data.get("data") or {}, index_positions,
+                                                      validator_indices, effective_balances, earned, ideal)
+            time.sleep(STATUS_DELAY)
+        logging.debug("BEACON_PERF: epoch %d → %d validator rewards", epoch, counted)
+
+    op_ids, pair_op, pair_val = build_operator_membership(operator_validators, pubkey_positions)
+    op_earned = sum_per_operator(op_ids, pair_op, pair_val, earned)
+    op_ideal = sum_per_operator(op_ids, pair_op, pair_val, ideal)
+
+    has_duties = op_ideal > 0
+    effectiveness = np.divide(op_earned, op_ideal, out=np.zeros_like(op_earned), where=has_duties)
+
+    logging.info("BEACON_PERF: Computed effectiveness for %d operators", int(has_duties.sum()))
+    return dict(zip(op_ids[has_duties].tolist(), effectiveness[has_duties].tolist()))
+
+
+def insert_clickhouse_beacon_performance(client, network, performance: dict[int, float], target_date,
+                                         source, metric_type):
+    now = datetime.now(timezone.utc)
+    rows = [(network, op_id, metric_type, target_date, value, source, now)
+            for op_id, value in performance.items()]
+
+    logging.info("CLICKHOUSE: inserting %d %s performance rows from %s", len(rows), metric_type, source)
+
+    upsert_daily_partition(client, 'performance', network, source, target_date)
+    if rows:
+        client.insert('performance', rows, column_names=[
+            'network', 'operator_id', 'metric_type', 'metric_date', 'metric_value', 'source', 'updated_at'
+        ])
+
+
+def operator_fee_per_year(raw_fee):
+    """
+    Convert the API's per-block fee (wei) to SSV per year. Returns None if the
+    fee is missing or not numeric.
+    """
+    if raw_fee is None:
+        return None
+    try:
+        return (float(raw_fee) * BLOCKS_PER_YEAR) / 1e18
+    except Exception:
+        return None
+
+
+def _chunks(seq, size):
+    for i in range(0, len(seq), size):
+        yield seq[i:i+size]
+        
+
+def upsert_daily_partition(client, table: str, network: str, source: str, target_date):
+    # Inline SETTINGS so the mutation is synchronous; clickhouse_connect opens
+    # a fresh session per command, so a separate `SET mutations_sync = 2` is lost.
+    client.command(
+        f"ALTER TABLE {table} DELETE WHERE network=%(net)s AND source=%(src)s AND metric_date=%(dt)s "
+        f"SETTINGS mutations_sync = 2",
+        parameters={'net': network, 'src': source, 'dt': target_date}
+    )
+
+
+def insert_clickhouse_performance_data(client, network, operators, target_date, source, update_operators=True,
+                                       replace=True):
+    performance_rows = []
+    operator_rows = []
+    operator_ids = []
+    operator_fees_rows = []
+
+    now = datetime.now(timezone.utc)
+
+    for operator_id, operator in operators.items():
+        operator_ids.append(operator_id)
+
+        perf_24h = (operator.get("performance") or {}).get("24h", None)
+        perf_30d = (operator.get("performance") or {}).get("30d", None)
+        validator_count = operator.get("validators_count", None)
+
+        is_vo = 1 if operator.get("type", "") == "verified_operator" else 0
+        is_private = 1 if operator.get("is_private", False) else 0
+
+        operator_fee = operator_fee_per_year(operator.get("fee", None))
+
+        operator_rows.append((
+            network,
+            operator_id,
+            operator.get("name", ""),
+            is_vo,
+            is_private,
+            validator_count,
+            operator_fee,
+            operator.get("owner_address", ""),
+            None,  # vo_demoted_at: cleared whenever the API is returning the operator
+            now
+        ))
+
+        performance_rows.append((network, operator_id, '24h', target_date, perf_24h, source, now))
+        performance_rows.append((network, operator_id, '30d', target_date, perf_30d, source, now))
+
+        if operator_fee is not None:
+            operator_fees_rows.append((network, operator_id, target_date, operator_fee, source, now))
+
+    logging.info("CLICKHOUSE: upserting %d operators, %d perf rows, %d fee rows",
+                 len(operator_rows), len(performance_rows), len(operator_fees_rows))
+
+    # 1) Operators: per-ID delete-then-insert (keeps older operators not seen today)
+    BATCH = 1000
+    for ids_chunk in _chunks(operator_ids, BATCH) if update_operators else []:
+        client.command(
+            "ALTER TABLE operators DELETE WHERE network=%(net)s AND operator_id IN %(ids)s "
+            "SETTINGS mutations_sync = 2",
+            parameters={"net": network, "ids": ids_chunk}
+        )
+    if operator_rows and update_operators:
+        client.insert('operators', operator_rows, column_names=[
+            'network','operator_id','operator_name','is_vo','is_private',
             'validator_count','operator_fee','address','vo_demoted_at','updated_at'
         ])
 
-    # 2) Performance (DAILY UPSERT): wipe this date, then insert today's rows
-    upsert_daily_partition(client, 'performance', network, source, target_date)
-    if performance_rows:
-        client.insert('performance', performance_rows, column_names=[
-            'network','operator_id','metric_type','metric_date','metric_value','source','updated_at'
-        ])
+    # 2) Performance (DAILY UPSERT): wipe this date, then insert today's rows
+    if replace:
+        upsert_daily_partition(client, 'performance', network, source, target_date)
+    if performance_rows:
+        client.insert('performance', performance_rows, column_names=[
+            'network','operator_id','metric_type','metric_date','metric_value','source','updated_at'
+        ])
+
+    # 3) Operator fees (DAILY UPSERT): wipe this date, then insert today's rows
+    if replace:
+        upsert_daily_partition(client, 'operator_fees', network, source, target_date)
+    if operator_fees_rows:
+        client.insert('operator_fees', operator_fees_rows, column_names=[
+            'network','operator_id','metric_date','operator_fee','source','updated_at'
+        ])
+
+
+def insert_clickhouse_validator_count_data(client, network, validator_counts, target_date, source,
+                                           listed_counts=None, count_method='crawl', operator_balances=None,
+                                           replace=True):
+    validator_counts_rows = []
+
+    now = datetime.now(timezone.utc)
+    listed_counts = listed_counts or {}
+
+    for operator_id, validator_count in validator_counts.items():
+        if validator_count is not None:
+            # Balances are NULL without beacon data (fast days, SSV-only statuses)
+            balance, effective_balance = (operator_balances.get(operator_id, (0, 0))
+                                          if operator_balances else (None, None))
+            validator_counts_rows.append((network, operator_id, target_date, validator_count,
+                                          listed_counts.get(operator_id), count_method,
+                                          balance, effective_balance, source, now))
+
+    logging.info("CLICKHOUSE: inserting %d validator counts (%s)", len(validator_counts_rows), count_method)
+
+    if replace:
+        upsert_daily_partition(client, 'validator_counts', network, source, target_date)
+    client.insert('validator_counts', validator_counts_rows, column_names=[
+        'network', 'operator_id', 'metric_date', 'validator_count',
+        'listed_validator_count', 'count_method', 'balance_gwei', 'effective_balance_gwei',
+        'source', 'updated_at'
+    ])
+
+
+def insert_clickhouse_status_counts(client, network, status_histograms: dict[int, dict[str, int]],
+                                    target_date, source, replace=True):
+    now = datetime.now(timezone.utc)
+    rows = [
+        (network, operator_id, target_date, status, count, source, now)
+        for operator_id, counts in status_histograms.items()
+        for status, count in counts.items()
+    ]
+
+    logging.info("CLICKHOUSE: inserting %d validator status counts", len(rows))
+
+    if replace:
+        upsert_daily_partition(client, 'validator_status_counts', network, source, target_date)
+    if rows:
+        client.insert('validator_status_counts', rows, column_names=[
+            'network', 'operator_id', 'metric_date', 'status', 'validator_count', 'source', 'updated_at'
+        ])
+
+
+def load_status_snapshot(client, network):
+    """
+    Load the previous run's beacon statuses as (pubkeys, statuses, snapshot_date),
+    with pubkeys as a sorted bytes array for searchsorted lookups.
+    """
+    res = client.query(
+        """
+        SELECT pubkey, status, snapshot_date
+        FROM validator_status_latest FINAL
+        WHERE network = %(network)s
+        """,
+        parameters={"network": network},
+    )
+    rows = res.result_rows
+    if not rows:
+        return np.array([], dtype="S1"), np.array([], dtype="U1"), None
+
+    pubkeys = np.array([r[0] for r in rows], dtype="S")
+    statuses = np.array([r[1] for r in rows], dtype="U")
+    order = np.argsort(pubkeys)
+    return pubkeys[order], statuses[order], max(r[2] for r in rows)
+
+
+def classify_status_transition(old_status: str, new_status: str) -> str:
+    # "exited_unslashed" also ends in "slashed", so match the suffix with its underscore
+    if new_status.endswith("_slashed") and not old_status.endswith("_slashed"):
+        return "slashed"
+    if new_status == "active_exiting":
+        return "exit_initiated"
+    if new_status.startswith("exited") and not old_status.startswith("exited"):
+        return "exited"
+    if new_status.startswith("withdrawal"):
+        return "withdrawal"
+    if new_status.startswith("active") and old_status.startswith("pending"):
+        return "activated"
+    return "other"
+
+
+def diff_status_snapshots(prev_pubkeys: np.ndarray, prev_statuses: np.ndarray,
+                          cur_pubkeys: np.ndarray, cur_statuses: np.ndarray):
+    """
+    Compare today's statuses with the previous snapshot in one vectorized pass.
+    prev_pubkeys must be sorted. Returns (positions into cur_*, old statuses)
+    for validators present in both snapshots whose status changed.
+    """
+    if not len(prev_pubkeys) or not len(cur_pubkeys):
+        return np.array([], dtype=np.int64), np.array([], dtype="U1")
+
+    at = np.clip(np.searchsorted(prev_pubkeys, cur_pubkeys), 0, len(prev_pubkeys) - 1)
+    found = prev_pubkeys[at] == cur_pubkeys
+    changed = found & (prev_statuses[at] != cur_statuses)
+    positions = np.nonzero(changed)[0]
+    return positions, prev_statuses[at[positions]]
+
+
+def record_validator_status_events(client, network, beacon_statuses: dict[str, str],
+                                   validator_clusters: dict[str, tuple[int, ...]], target_date):
+    """
+    Diff today's beacon statuses against the stored snapshot, write one
+    validator_status_events row per (operator, validator) transition, then
+    replace the snapshot. Skipped when the snapshot is already at or past
+    target_date so reruns neither duplicate nor wipe events.
+    """
+    prev_pubkeys, prev_statuses, snapshot_date = load_status_snapshot(client, network)
+    if snapshot_date is not None and snapshot_date >= target_date:
+        logging.info("STATUS_EVENTS: snapshot already at %s; skipping diff for %s", snapshot_date, target_date)
+        return
+
+    keys = list(beacon_statuses.keys())
+    cur_pubkeys = np.array(keys, dtype="S")
+    cur_statuses = np.array([beacon_statuses[pk] for pk in keys], dtype="U")
+
+    positions, old_statuses = diff_status_snapshots(prev_pubkeys, prev_statuses, cur_pubkeys, cur_statuses)
+
+    operators_by_pubkey = {pk.lower(): cluster for pk, cluster in validator_clusters.items()}
+    now = datetime.now(timezone.utc)
+    event_rows = []
+    for pos, old_status in zip(positions.tolist(), old_statuses.tolist()):
+        pubkey = keys[pos]
+        new_status = beacon_statuses[pubkey]
+        event_type = classify_status_transition(old_status, new_status)
+        for operator_id in operators_by_pubkey.get(pubkey, ()):
+            event_rows.append((network, target_date, operator_id, pubkey, old_status, new_status, event_type, now))
+
+    if snapshot_date is None:
+        logging.info("STATUS_EVENTS: no previous snapshot; storing baseline of %d statuses", len(keys))
+    else:
+        logging.info("STATUS_EVENTS: %d status changes since %s (%d operator events)",
+                     len(positions), snapshot_date, len(event_rows))
+
+    if event_rows:
+        client.insert('validator_status_events', event_rows, column_names=[
+            'network', 'event_date', 'operator_id', 'pubkey', 'old_status', 'new_status', 'event_type', 'updated_at'
+        ])
+
+    snapshot_rows = [(network, pk, status, target_date, now) for pk, status in beacon_statuses.items()]
+    if snapshot_rows:
+        client.insert('validator_status_latest', snapshot_rows, column_names=[
+            'network', 'pubkey', 'status', 'snapshot_date', 'updated_at'
+        ])
+
+
+def cluster_hash(op_ids: tuple[int, ...]) -> int:
+    """
+    Stable 64-bit key for a cluster, taken from its sorted operator IDs.
+    """
+    key = ",".join(str(op_id) for op_id in op_ids).encode()
+    return int.from_bytes(hashlib.sha256(key).digest()[:8], "big")
+
+
+def build_cluster_rows(network, operators, validator_clusters: dict[str, tuple[int, ...]],
+                       status_map: dict[str, str], target_date, source,
+                       balances: dict[str, tuple[int, int]] | None = None):
+    """
+    One row per cluster seen today: validator counts, total and effective
+    balance (when beacon balances are given) plus member operator performance
+    (min/avg over members that report a value) and the weakest member by 24h
+    performance.
+    """
+    clusters: dict[tuple[int, ...], list[int]] = {}
+    for pubkey, op_ids in validator_clusters.items():
+        counts = clusters.setdefault(op_ids, [0, 0, 0, 0])
+        counts[0] += 1
+        if status_map.get(pubkey, "") in ACTIVE_STATUSES:
+            counts[1] += 1
+        if balances and pubkey in balances:
+            counts[2] += balances[pubkey][0]
+            counts[3] += balances[pubkey][1]
+
+    now = datetime.now(timezone.utc)
+    rows = []
+
+    for op_ids, (validator_count, active_count, balance, effective_balance) in clusters.items():
+        perf = {'24h': [], '30d': []}
+        for op_id in op_ids:
+            op_perf = (operators.get(op_id) or {}).get("performance") or {}
+            for metric_type, values in perf.items():
+                value = op_perf.get(metric_type)
+                if value is not None:
+                    values.append((float(value), op_id))
+
+        def _min_avg(values):
+            if not values:
+                return None, None
+            return min(v for v, _ in values), sum(v for v, _ in values) / len(values)
+
+        min_24h, avg_24h = _min_avg(perf['24h'])
+        min_30d, avg_30d = _min_avg(perf['30d'])
+        weakest = min(perf['24h'])[1] if perf['24h'] else None
+
+        rows.append((
+            network, cluster_hash(op_ids), target_date, list(op_ids),
+            validator_count, active_count,
+            balance if balances else None, effective_balance if balances else None,
+            min_24h, avg_24h, min_30d, avg_30d, weakest,
+            source, now
+        ))
+
+    return rows
+
+
+def insert_clickhouse_cluster_data(client, network, operators, validator_clusters, status_map,
+                                   target_date, source, balances=None, replace=True):
+    cluster_rows = build_cluster_rows(network, operators, validator_clusters, status_map, target_date, source,
+                                      balances)
+
+    logging.info("CLICKHOUSE: inserting %d cluster rows", len(cluster_rows))
+
+    if replace:
+        upsert_daily_partition(client, 'clusters', network, source, target_date)
+    if cluster_rows:
+        client.insert('clusters', cluster_rows, column_names=[
+            'network', 'cluster_hash', 'metric_date', 'operator_ids',
+            'validator_count', 'active_count', 'balance_gwei', 'effective_balance_gwei',
+            'min_perf_24h', 'avg_perf_24h', 'min_perf_30d', 'avg_perf_30d', 'weakest_operator_id',
+            'source', 'updated_at'
+        ])
+
+
+def reconcile_performance(client, network, target_date, source_priority: list[str], tolerance: float,
+                          replace=True):
+    """
+    Rebuild performance_reconciled for target_date from every source in
+    `performance`: the value of the highest-priority source wins, and rows whose
+    sources differ by more than `tolerance` are flagged as disagreeing.
+    """
+    if replace:
+        client.command(
+            "ALTER TABLE performance_reconciled DELETE WHERE network=%(net)s AND metric_date=%(dt)s "
+            "SETTINGS mutations_sync = 2",
+            parameters={'net': network, 'dt': target_date}
+        )
+    client.command(
+        """
+        INSERT INTO performance_reconciled (
+            network, operator_id, metric_type, metric_date, metric_value, source,
+            source_count, min_value, max_value, disagreement, updated_at
+        )
+        SELECT
+            network,
+            operator_id,
+            metric_type,
+            metric_date,
+            argMin(v, (source_rank, source)) AS metric_value,
+            argMin(source, (source_rank, source)) AS chosen_source,
+            count()                     AS source_count,
+            min(v)                      AS min_value,
+            max(v)                      AS max_value,
+            (max(v) - min(v)) > %(tolerance)s AS disagreement,
+            now()                       AS updated_at
+        FROM (
+            SELECT
+                network,
+                operator_id,
+                metric_type,
+                metric_date,
+                source,
+                argMax(metric_value, updated_at) AS v,
+                if(indexOf(%(priority)s, source) = 0, 65535, indexOf(%(priority)s, source)) AS source_rank
+            FROM performance
+            WHERE
+                network = %(net)s
+                AND metric_date = toDate(%(dt)s)
+            GROUP BY network, operator_id, metric_type, metric_date, source
+        )
+        GROUP BY network, operator_id, metric_type, metric_date
+        """,
+        parameters={
+            'net': network,
+            'dt': target_date,
+            'priority': list(source_priority),
+            'tolerance': float(tolerance),
+        }
+    )
+
+    logging.info("CLICKHOUSE: reconciled performance for %s (priority: %s)",
+                 target_date, ", ".join(source_priority))
+
+
+def rebuild_operator_daily_snapshot(client, network, target_date, replace=True):
+    """
+    Rebuild operator_daily_snapshot for target_date: one wide row per operator
+    with its current attributes and that day's validator count, fee and
+    reconciled 24h/30d performance, so the bot reads a day without joins.
+    counts_updated_at carries over when the count itself was written, since
+    updated_at only records the rebuild.
+    Operators seen in the last two days, demoted from VO status in the last
+    SNAPSHOT_DEMOTED_DAYS, or with a count or performance value on
+    target_date, are included.
+
+    `operators` keeps no history, so a day older than the latest snapshot
+    (a replay or backfill) keeps the operators and attributes its rows were
+    recorded with; only their counts, fees and performance are refreshed.
+    """
+    latest = client.query(
+        "SELECT max(metric_date) FROM operator_daily_snapshot WHERE network=%(net)s",
+        parameters={'net': network}
+    ).result_rows[0][0]
+    past_day = latest is not None and target_date < latest
+
+    if past_day:
+        # Rows are replaced by (network, metric_date, operator_id), newest updated_at wins
+        attributes = """(
+            SELECT network, operator_id, operator_name, address, is_vo, is_private, vo_demoted_at,
+                   operator_updated_at AS updated_at
+            FROM operator_daily_snapshot FINAL
+            WHERE network = %(net)s AND metric_date = toDate(%(dt)s)
+        )"""
+        included = "1"
+    else:
+        attributes = "operators_current"
+        included = """(
+                o.updated_at >= toDateTime(toDate(%(dt)s)) - toIntervalDay(2)
+                OR o.vo_demoted_at >= toDate(%(dt)s) - toIntervalDay(%(demoted_days)s)
+                OR vc.validator_count IS NOT NULL
+                OR p.perf_24h IS NOT NULL
+                OR p.perf_30d IS NOT NULL
+            )"""
+
+    if replace and not past_day:
+        client.command(
+            "ALTER TABLE operator_daily_snapshot DELETE WHERE network=%(net)s AND metric_date=%(dt)s "
+            "SETTINGS mutations_sync = 2",
+            parameters={'net': network, 'dt': target_date}
+        )
+    client.command(
+        f"""
+        INSERT INTO operator_daily_snapshot (
+            network, metric_date, operator_id, operator_name, address, is_vo, is_private,
+            vo_demoted_at, operator_updated_at, validator_count, counts_updated_at,
+            operator_fee, perf_24h, perf_30d, updated_at
+        )
+        SELECT
+            o.network,
+            toDate(%(dt)s),
+            o.operator_id,
+            o.operator_name,
+            o.address,
+            o.is_vo,
+            o.is_private,
+            o.vo_demoted_at,
+            o.updated_at,
+            vc.validator_count,
+            vc.counts_updated_at,
+            f.operator_fee,
+            p.perf_24h,
+            p.perf_30d,
+            now()
+        FROM {attributes} AS o
+        LEFT JOIN (
+            SELECT
+                operator_id,
+                argMax(validator_count, updated_at) AS validator_count,
+                max(updated_at) AS counts_updated_at
+            FROM validator_counts
+            WHERE network = %(net)s AND metric_date = toDate(%(dt)s)
+            GROUP BY operator_id
+        ) AS vc ON vc.operator_id = o.operator_id
+        LEFT JOIN (
+            SELECT operator_id, argMax(operator_fee, updated_at) AS operator_fee
+            FROM operator_fees
+            WHERE network = %(net)s AND metric_date = toDate(%(dt)s)
+            GROUP BY operator_id
+        ) AS f ON f.operator_id = o.operator_id
+        LEFT JOIN (
+            SELECT
+                operator_id,
+                if(countIf(metric_type = '24h') > 0, argMaxIf(metric_value, updated_at, metric_type = '24h'), NULL) AS perf_24h,
+                if(countIf(metric_type = '30d') > 0, argMaxIf(metric_value, updated_at, metric_type = '30d'), NULL) AS perf_30d
+            FROM performance_reconciled
+            WHERE network = %(net)s AND metric_date = toDate(%(dt)s)
+            GROUP BY operator_id
+        ) AS p ON p.operator_id = o.operator_id
+        WHERE
+            o.network = %(net)s
+            AND {included}
+        SETTINGS join_use_nulls = 1
+        """,
+        parameters={'net': network, 'dt': target_date, 'demoted_days': SNAPSHOT_DEMOTED_DAYS}
+    )
+
+    logging.info("CLICKHOUSE: %s operator daily snapshot for %s",
+                 "refreshed metrics of past" if past_day else "rebuilt", target_date)
+
+
+def insert_clickhouse_rolling_performance(client, network, target_date, below_threshold):
+    """
+    Derive rolling 24h performance aggregates for target_date in ClickHouse
+    from the trailing 90 days of performance_reconciled.
+    """
+    client.command(
+        """
+        INSERT INTO performance_rolling (
+            network, operator_id, metric_date,
+            avg_7d, avg_30d, avg_90d, min_7d, min_30d,
+            days_7d, days_30d, days_90d,
+            below_threshold, days_below_30d, updated_at
+        )
+        WITH toDate(%(dt)s) AS dt
+        SELECT
+            %(net)s AS network,
+            operator_id,
+            dt AS metric_date,
+            avgIf(v, d > subtractDays(dt, 7))   AS avg_7d,
+            avgIf(v, d > subtractDays(dt, 30))  AS avg_30d,
+            avg(v)                              AS avg_90d,
+            minIf(v, d > subtractDays(dt, 7))   AS min_7d,
+            minIf(v, d > subtractDays(dt, 30))  AS min_30d,
+            countIf(d > subtractDays(dt, 7))    AS days_7d,
+            countIf(d > subtractDays(dt, 30))   AS days_30d,
+            count()                             AS days_90d,
+            %(threshold)s                       AS below_threshold,
+            countIf(d > subtractDays(dt, 30) AND v < %(threshold)s) AS days_below_30d,
+            now()                               AS updated_at
+        FROM (
+            SELECT
+                operator_id,
+                metric_date AS d,
+                argMax(metric_value, updated_at) AS v
+            FROM performance_reconciled
+            WHERE
+                network = %(net)s
+                AND metric_type = '24h'
+                AND metric_date > subtractDays(toDate(%(dt)s), 90)
+                AND metric_date <= toDate(%(dt)s)
+            GROUP BY operator_id, d
+        )
+        GROUP BY operator_id
+        HAVING countIf(d = dt) > 0
+        """,
+        parameters={'net': network, 'dt': target_date, 'threshold': float(below_threshold)}
+    )
+
+    logging.info("CLICKHOUSE: updated rolling performance for %s", target_date)
+
+
+def _percentile_linear(xs, p: float) -> float:
+    # Same interpolation as the bot's bot_data_processing._percentile_linear
+    s = sorted(xs)
+    n = len(s)
+    if n == 1:
+        return s[0]
+    r = p * (n - 1)
+    lo = math.floor(r)
+    hi = math.ceil(r)
+    if lo == hi:
+        return s[lo]
+    frac = r - lo
+    return s[lo] * (1 - frac) + s[hi] * frac
+
+
+def iqr_bucket_counts(values: list[float], num_buckets: int, iqr_multiplier: float):
+    """
+    Counts-only port of the bot's iqr_bucket_indices() (zeros always treated
+    separately). The two run in separate images, so keep them in step.
+    Returns (bucket_ranges, bucket_counts, zero_count, outlier_values).
+    """
+    zero_count = sum(1 for v in values if v == 0)
+    non_zero = [v for v in values if v != 0]
+
+    if not non_zero:
+        return [], [], zero_count, []
+
+    if len(non_zero) < 2:
+        return [(non_zero[0], non_zero[0])], [1], zero_count, []
+
+    q1 = _percentile_linear(non_zero, 0.25)
+    q3 = _percentile_linear(non_zero, 0.75)
+    upper_bound = q3 + iqr_multiplier * max(q3 - q1, 0.0)
+
+    inliers = [v for v in non_zero if 0 < v <= upper_bound]
+    outliers = [v for v in non_zero if v > upper_bound]
+    if not inliers:
+        inliers, outliers = non_zero, []
+
+    if zero_count > 0:
+        min_val = min(inliers)
+    else:
+        min_val = min(inliers + outliers)
+    max_val = max(inliers)
+
+    if max_val == min_val or num_buckets <= 1:
+        return [(min_val, max_val if max_val > min_val else min_val + 1.0)], [len(inliers)], zero_count, outliers
+
+    bucket_size = (max_val - min_val) / float(num_buckets)
+    bucket_ranges = []
+    for i in range(num_buckets):
+        lower = min_val + i * bucket_size
+        bucket_ranges.append((lower, lower + bucket_size))
+    bucket_counts = [0] * num_buckets
+    for v in inliers:
+        idx = min(int((v - min_val) / bucket_size), num_buckets - 1)
+        bucket_counts[idx] += 1
+
+    return bucket_ranges, bucket_counts, zero_count, outliers
+
+
+def _operator_facets(is_vo: bool, is_private: bool) -> tuple[str, ...]:
+    vo = "vo" if is_vo else "non_vo"
+    availability = "private" if is_private else "public"
+    return ("all", vo, availability, f"{availability}_{vo}")
+
+
+def summarize_metric(items: list[tuple], num_buckets: int, iqr_multiplier: float) -> dict:
+    """
+    Summarize a list of (value, operator_id, name, validator_count, is_vo, is_private)
+    into the columns of network_daily_summary.
+    """
+    values = [it[0] for it in items]
+
+    lowest = min(values)
+    highest = max(values)
+    lowest_ops = sorted((it for it in items if it[0] == lowest), key=lambda it: it[1])
+    highest_ops = sorted((it for it in items if it[0] == highest), key=lambda it: it[1])
+
+    bucket_ranges, bucket_counts, zero_count, outliers = iqr_bucket_counts(values, num_buckets, iqr_multiplier)
+
+    return {
+        "operator_count": len(items),
+        "vo_count": sum(1 for it in items if it[4]),
+        "private_count": sum(1 for it in items if it[5]),
+        "public_vo_count": sum(1 for it in items if it[4] and not it[5]),
+        "zero_count": zero_count,
+        "mean_value": float(statistics.mean(values)),
+        "median_value": float(statistics.median(values)),
+        "min_value": float(lowest),
+        "min_operator_id": lowest_ops[0][1],
+        "min_operator_name": lowest_ops[0][2] or "",
+        "min_operator_validators": lowest_ops[0][3],
+        "min_operator_ties": len(lowest_ops),
+        "max_value": float(highest),
+        "max_operator_id": highest_ops[0][1],
+        "max_operator_name": highest_ops[0][2] or "",
+        "max_operator_validators": highest_ops[0][3],
+        "max_operator_ties": len(highest_ops),
+        "bucket_lower": [float(lo) for lo, _ in bucket_ranges],
+        "bucket_upper": [float(hi) for _, hi in bucket_ranges],
+        "bucket_counts": bucket_counts,
+        "outlier_count": len(outliers),
+        "outlier_min": float(min(outliers)) if outliers else None,
+        "outlier_max": float(max(outliers)) if outliers else None,
+    }
+
+
+NETWORK_SUMMARY_COLUMNS = [
+    'network', 'metric_date', 'metric_type', 'facet',
+    'operator_count', 'vo_count', 'private_count', 'public_vo_count', 'zero_count',
+    'mean_value', 'median_value',
+    'min_value', 'min_operator_id', 'min_operator_name', 'min_operator_validators', 'min_operator_ties',
+    'max_value', 'max_operator_id', 'max_operator_name', 'max_operator_validators', 'max_operator_ties',
+    'bucket_lower', 'bucket_upper', 'bucket_counts',
+    'outlier_count', 'outlier_min', 'outlier_max',
+    'source', 'updated_at',
+]
+
+
+def build_network_summary_rows(network, operators, target_date, source):
+    """
+    Compute the network-wide fee and validator count distributions for every
+    facet in SUMMARY_FACETS, in the shape the bot's /fees and /operators render.
+    """
+    facet_items: dict[str, dict[str, list]] = {
+        "fee": {f: [] for f in SUMMARY_FACETS},
+        "validator_count": {f: [] for f in SUMMARY_FACETS},
+    }
+
+    for operator_id, operator in operators.items():
+        is_vo = operator.get("type", "") == "verified_operator"
+        is_private = bool(operator.get("is_private", False))
+        validator_count = operator.get("validators_count", None)
+        name = operator.get("name", "")
+        facets = _operator_facets(is_vo, is_private)
+
+        fee = operator_fee_per_year(operator.get("fee", None))
+        if fee is not None:
+            for f in facets:
+                facet_items["fee"][f].append((fee, operator_id, name, validator_count, is_vo, is_private))
+
+        if validator_count is not None:
+            for f in facets:
+                facet_items["validator_count"][f].append(
+                    (int(validator_count), operator_id, name, validator_count, is_vo, is_private))
+
+    now = datetime.now(timezone.utc)
+    rows = []
+    for metric_type, by_facet in facet_items.items():
+        for facet, items in by_facet.items():
+            if not items:
+                continue
+            num_buckets, iqr_multiplier = (5, 2.5) if facet.startswith("private") else (10, 1.5)
+            summary = summarize_metric(items, num_buckets, iqr_multiplier)
+            row = {"network": network, "metric_date": target_date, "metric_type": metric_type,
+                   "facet": facet, "source": source, "updated_at": now, **summary}
+            rows.append(tuple(row[c] for c in NETWORK_SUMMARY_COLUMNS))
+
+    return rows
+
+
+def insert_clickhouse_network_summary(client, network, operators, target_date, source, replace=True):
+    rows = build_network_summary_rows(network, operators, target_date, source)
+
+    logging.info("CLICKHOUSE: inserting %d network summary rows", len(rows))
+
+    if replace:
+        upsert_daily_partition(client, 'network_daily_summary', network, source, target_date)
+    if rows:
+        client.insert('network_daily_summary', rows, column_names=NETWORK_SUMMARY_COLUMNS)
+
+
+def sweep_stale_verified_operators(client, network, todays_operator_ids, staleness_days,
+                                   min_coverage, min_operators):
+    """
+    Demote is_vo=1 operators whose DB record hasn't been refreshed from the API
+    within `staleness_days`. Skips the sweep if today's fetch doesn't look healthy,
+    so an API outage can't silently strip verified status from everyone.
+    """
+    today_count = len(todays_operator_ids)
+
+    if today_count < min_operators:
+        logging.warning(
+            "VO_SWEEP: skipping — today's fetch (%d ops) below absolute floor (%d).",
+            today_count, min_operators
+        )
+        return
+
+    res = client.query(
+        "SELECT count() FROM operators_current "
+        "WHERE network = %(net)s AND updated_at >= now() - INTERVAL %(days)s DAY",
+        parameters={'net': network, 'days': staleness_days}
+    )
+    recent_count = res.result_rows[0][0] if res.result_rows else 0
+    if recent_count > 0 and today_count < min_coverage * recent_count:
+        logging.warning(
+            "VO_SWEEP: skipping — today's fetch (%d) is below %.0f%% of operators "
+            "seen in the last %d days (%d); possible API degradation.",
+            today_count, min_coverage * 100, staleness_days, recent_count
+        )
+        return
+
+    # operators_current holds one already-deduplicated row per operator, so a
+    # single operator can't be demoted (or re-inserted) multiple times.
+    res = client.query(
+        "SELECT operator_id, operator_name, is_private, validator_count, operator_fee, address "
+        "FROM operators_current "
+        "WHERE network = %(net)s "
+        "AND is_vo = 1 "
+        "AND updated_at < now() - INTERVAL %(days)s DAY",
+        parameters={'net': network, 'days': staleness_days}
+    )
+    stale = [row for row in res.result_rows if row[0] not in todays_operator_ids]
+
+    if not stale:
+        logging.info("VO_SWEEP: no stale verified operators found.")
+        return
+
+    stale_ids = [row[0] for row in stale]
+    logging.info(
+        "VO_SWEEP: demoting %d verified operators stale >= %d days (sample: %s).",
+        len(stale_ids), staleness_days, stale_ids[:20]
+    )
+
+    # No DELETE needed: the newer updated_at supersedes the old row both in
+    # operators (ReplacingMergeTree) and in operators_latest (argMax state).
+    now = datetime.now(timezone.utc)
+    demoted_date = now.date()
+    rows = [
+        (network, op_id, name, 0, is_priv, vc, fee, addr, demoted_date, now)
+        for (op_id, name, is_priv, vc, fee, addr) in stale
+    ]
+    client.insert('operators', rows, column_names=[
+        'network', 'operator_id', 'operator_name', 'is_vo', 'is_private',
+        'validator_count', 'operator_fee', 'address', 'vo_demoted_at', 'updated_at'
+    ])
+
+
+def fetch_operator_active_count(network: str, operator_id: int, beacon_api_url: str | None = None,
+                                per_page: int = 1000) -> int | None:
+    """
+    Count an operator's active validators from the per-operator validators
+    endpoint. Statuses come from the beacon API when a URL is given, as in the
+    full crawl, and from the SSV API otherwise. None on request error.
+    """
+    statuses: dict[str, str] = {}
+    page = 1
+    while True:
+        path = f"/{network}/validators/in_operator/{operator_id}?perPage={per_page}&page={page}"
+        data = http_get_json(ssv_api(), path, timeout=30)
+        if data is None:
+            return None
+
+        validators = data.get("validators", []) or []
+        for v in validators:
+            record = parse_ssv_validator(v)
+            if record is not None:
+                statuses[record[0]] = record[1]
+
+        if len(validators) < per_page:
+            break
+        page += 1
+        time.sleep(REQUEST_DELAY)
+
+    if beacon_api_url and statuses:
+        beacon_statuses = fetch_beacon_statuses(beacon_api_url, set(statuses))
+        if not beacon_statuses:
+            return None
+        statuses = beacon_statuses
+
+    return sum(1 for status in statuses.values() if status in ACTIVE_STATUSES)
+
+
+def get_last_full_crawl_date(client, network):
+    res = client.query(
+        "SELECT max(run_date) FROM collector_runs "
+        "WHERE network = %(net)s AND count_method = 'crawl'",
+        parameters={'net': network}
+    )
+    return res.result_rows[0][0] if res.result_rows and res.result_rows[0][0] else None
+
+
+def get_inactive_offsets(client, network, source) -> dict[int, int]:
+    """
+    Per operator, listed-minus-active validators from the latest full crawl:
+    the validators the /operators listing counts that are not active.
+    """
+    res = client.query(
+        """
+        SELECT operator_id, argMax(toInt64(listed_validator_count) - validator_count, metric_date)
+        FROM validator_counts
+        WHERE
+            network = %(net)s
+            AND source = %(src)s
+            AND count_method = 'crawl'
+            AND listed_validator_count IS NOT NULL
+        GROUP BY operator_id
+        """,
+        parameters={'net': network, 'src': source}
+    )
+    return {op_id: max(0, int(offset)) for op_id, offset in res.result_rows}
+
+
+def get_unlisted_crawled_counts(client, network, source, listed_ids) -> dict[int, int]:
+    """
+    Active counts from the latest full crawl for operators missing from today's
+    listing (removed operators whose validators are still running), so fast
+    days keep writing their validator_counts rows like crawl days do.
+    """
+    res = client.query(
+        """
+        SELECT operator_id, validator_count
+        FROM validator_counts FINAL
+        WHERE
+            network = %(net)s
+            AND source = %(src)s
+            AND count_method = 'crawl'
+            AND validator_count > 0
+            AND metric_date = (
+                SELECT max(metric_date) FROM validator_counts
+                WHERE network = %(net)s AND source = %(src)s AND count_method = 'crawl'
+            )
+        """,
+        parameters={'net': network, 'src': source}
+    )
+    return {op_id: int(count) for op_id, count in res.result_rows if op_id not in listed_ids}
+
+
+def estimate_active_counts(operators, inactive_offsets: dict[int, int]) -> dict[int, int] | None:
+    """
+    Fast-path active counts: the listing's validators_count less the inactive
+    offset seen at the last full crawl. None if the listing lacks counts.
+    """
+    counts = {}
+    for op_id, op in operators.items():
+        listed = op.get("listed_validators_count")
+        if listed is None:
+            return None
+        counts[op_id] = max(0, listed - inactive_offsets.get(op_id, 0))
+    return counts
+
+
+def full_crawl_reason(client, args, operators, estimated_counts) -> str | None:
+    """
+    Decide whether today needs the full validator crawl. Returns the reason,
+    or None when the fast-path counts can be stored.
+    """
+    if estimated_counts is None:
+        return "operators listing has no validators_count"
+
+    last_full = get_last_full_crawl_date(client, args.network)
+    if last_full is None:
+        return "no previous full crawl"
+    target_date = datetime.now(timezone.utc if not args.local_time else None).date()
+    if (target_date - last_full).days >= args.full_crawl_every_days:
+        return f"last full crawl on {last_full}"
+
+    candidates = [op_id for op_id, count in estimated_counts.items() if count > 0]
+    sample = random.sample(candidates, min(args.fast_count_sample_size, len(candidates)))
+    for op_id in sample:
+        actual = fetch_operator_active_count(args.network, op_id, args.beacon_api_url)
+        if actual is None:
+            return f"cross-check request failed for operator {op_id}"
+        expected = estimated_counts[op_id]
+        if abs(actual - expected) > max(2, args.fast_count_tolerance * expected):
+            return f"cross-check disagreed for operator {op_id} (estimated {expected}, counted {actual})"
+        time.sleep(REQUEST_DELAY)
+
+    logging.info("FAST_COUNTS: %d sampled operators agree with the estimate", len(sample))
+    return None
+
+
+def record_collector_run(client, network, run_date, count_method, reason, started_at,
+                         operator_count, validator_count):
+    client.insert('collector_runs', [(
+        network, run_date, count_method, reason, started_at, datetime.now(timezone.utc),
+        operator_count, validator_count
+    )], column_names=[
+        'network', 'run_date', 'count_method', 'reason', 'started_at', 'finished_at',
+        'operator_count', 'validator_count'
+    ])
+
+
+def store_collected_day(client, args, operators, all_pubkeys_status, validator_clusters,
+                        beacon_statuses, target_date, fast_counts=None,
+                        started_at=None, reason="", replay=False, beacon_balances=None):
+    """
+    Write one collected day: active counts (beacon statuses when available,
+    or fast_counts when the validator crawl was skipped), operators,
+    performance, validator counts and balances, summaries, clusters and
+    rolling aggregates, then run the VO sweep, rebuild the day's operator
+    snapshot and record the run.
+
+    With replay=True (rebuilding a past day from the archive) the current
+    operators state, rolling aggregates, VO sweep and run record are left
+    alone (the snapshot is still rebuilt), and nothing is deleted first: the
+    caller clears the replayed days with delete_replayed_days() and rebuilds
+    rolling aggregates in date order afterwards.
+    """
+    count_method = 'fast' if fast_counts is not None else 'crawl'
+    status_histograms: dict[int, dict[str, int]] = {}
+    operator_balances: dict[int, tuple[int, int]] = {}
 
-    # 3) Operator fees (DAILY UPSERT): wipe this date, then insert today's rows
-    upsert_daily_partition(client, 'operator_fees', network, source, target_date)
-    if operator_fees_rows:
-        client.insert('operator_fees', operator_fees_rows, column_names=[
-            'network','operator_id','metric_date','operator_fee','source','updated_at'
-        ])
+    if fast_counts is not None:
+        logging.info("FAST_COUNTS: using listing-based active counts (%s)", reason)
+        final_active_counts = fast_counts
+    else:
+        operator_validators: dict[int, set[str]] = {}
+        for pubkey, cluster in validator_clusters.items():
+            for op_id in cluster:
+                operator_validators.setdefault(op_id, set()).add(pubkey)
 
+        logging.info("SSV_API: Operators with > 0 validators: %d/%d total).",
+                     len([k for k,v in operator_validators.items() if v]), len(operators))
 
-def insert_clickhouse_validator_count_data(client, network, validator_counts, target_date, source):
-    validator_counts_rows = []
+        if beacon_statuses:
+            logging.info("Using BEACON_API validator statuses")
+            status_histograms = count_statuses_from_status_map(operator_validators, beacon_statuses)
+            operator_balances = sum_balances_per_operator(operator_validators, beacon_balances or {})
+        else:
+            if args.beacon_api_url:
+                logging.warning("Beacon API URL set, but no beacon statuses received; falling back to SSV-based counts")
+            else:
+                logging.info("No beacon API URL set; using SSV-based active counts")
+            status_histograms = count_statuses_from_status_map(operator_validators, all_pubkeys_status)
+        final_active_counts = active_counts_from_histograms(status_histograms)
 
-    now = datetime.now(timezone.utc)
+    # Set the final active count into operators[op]['validators_count'] (used by DB writer)
+    for op_id, op in operators.items():
+        op["validators_count"] = final_active_counts.get(op_id, 0)
 
-    for operator_id, validator_count in validator_counts.items():
-        if validator_count is not None:
-            validator_counts_rows.append((network, operator_id, target_date, validator_count, source, now))
+    replace = not replay
+    insert_clickhouse_performance_data(client, args.network, operators, target_date, IMPORT_SOURCE,
+                                       update_operators=not replay, replace=replace)
+    reconcile_performance(client, args.network, target_date,
+                          PERFORMANCE_SOURCE_PRIORITY, args.performance_disagreement_tolerance, replace=replace)
+    listed_counts = {op_id: op.get("listed_validators_count") for op_id, op in operators.items()}
+    insert_clickhouse_validator_count_data(client, args.network, final_active_counts, target_date, IMPORT_SOURCE,
+                                           listed_counts, count_method, operator_balances, replace=replace)
+    insert_clickhouse_network_summary(client, args.network, operators, target_date, IMPORT_SOURCE, replace=replace)
+    # Clusters and status histograms need the crawl; on fast days the last crawled ones stand
+    if count_method == 'crawl':
+        insert_clickhouse_status_counts(client, args.network, status_histograms, target_date, IMPORT_SOURCE,
+                                        replace=replace)
+        insert_clickhouse_cluster_data(client, args.network, operators, validator_clusters,
+                                       beacon_statuses or all_pubkeys_status, target_date, IMPORT_SOURCE,
+                                       beacon_balances if beacon_statuses else None, replace=replace)
+
+    if replay:
+        rebuild_operator_daily_snapshot(client, args.network, target_date, replace=False)
+        return
 
-    logging.info("CLICKHOUSE: inserting %d validator counts", len(validator_counts_rows))
+    # Transitions are only meaningful between beacon snapshots of consecutive runs
+    if beacon_statuses:
+        record_validator_status_events(client, args.network, beacon_statuses, validator_clusters, target_date)
 
-    upsert_daily_partition(client, 'validator_counts', network, source, target_date)
-    client.insert('validator_counts', validator_counts_rows, column_names=[
-        'network', 'operator_id', 'metric_date', 'validator_count', 'source', 'updated_at'
+    insert_clickhouse_rolling_performance(client, args.network, target_date, args.rolling_below_threshold)
+
+    sweep_stale_verified_operators(
+        client,
+        args.network,
+        set(operators.keys()),
+        args.vo_staleness_days,
+        args.vo_sweep_min_coverage,
+        args.vo_sweep_min_operators,
+    )
+
+    # After the sweep, so the day's demotions are in the snapshot, and before
+    # the run record, which the bot's result cache keys on
+    rebuild_operator_daily_snapshot(client, args.network, target_date)
+
+    record_collector_run(client, args.network, target_date, count_method, reason,
+                         started_at or datetime.now(timezone.utc),
+                         len(operators), sum(final_active_counts.values()))
+
+    if RUN_ARCHIVE:
+        meta = {"count_method": count_method, "reason": reason}
+        if fast_counts is not None:
+            meta["fast_counts"] = fast_counts
+        RUN_ARCHIVE.write_manifest(args.network, target_date, meta)
+
+
+def enqueue_work_units(client, run_id, network, units: list[tuple[int, str, dict]]):
+    """
+    Add (unit_id, kind, payload) work units for run_id to the queue.
+    """
+    now = datetime.now(timezone.utc)
+    rows = [(run_id, network, unit_id, kind, json.dumps(payload), now) for unit_id, kind, payload in units]
+    client.insert('collector_work_units', rows, column_names=[
+        'run_id', 'network', 'unit_id', 'kind', 'payload', 'created_at'
     ])
+    logging.info("QUEUE: run %s: enqueued %d units", run_id, len(rows))
 
 
-def sweep_stale_verified_operators(client, network, todays_operator_ids, staleness_days,
-                                   min_coverage, min_operators):
+def claim_work_unit(client, network, worker_id, lease_seconds):
     """
-    Demote is_vo=1 operators whose DB record hasn't been refreshed from the API
-    within `staleness_days`. Skips the sweep if today's fetch doesn't look healthy,
-    so an API outage can't silently strip verified status from everyone.
+    Claim one open unit for the network: no result yet and no live lease.
+    Every claimant records a claim; the earliest live claim wins, so two
+    workers racing for the same unit agree on who runs it.
+    Returns (run_id, unit_id, kind, payload, claim_id) or None.
     """
-    today_count = len(todays_operator_ids)
+    res = client.query(
+        """
+        SELECT u.run_id, u.unit_id, u.kind, u.payload
+        FROM collector_work_units AS u
+        WHERE
+            u.network = %(net)s
+            AND u.created_at >= now() - INTERVAL 2 DAY
+            AND (u.run_id, u.unit_id) NOT IN (
+                SELECT run_id, unit_id FROM collector_work_results
+                WHERE finished_at >= now() - INTERVAL 2 DAY
+            )
+            AND (u.run_id, u.unit_id) NOT IN (
+                SELECT run_id, unit_id FROM collector_work_claims
+                WHERE claimed_at >= now() - INTERVAL 2 DAY
+                GROUP BY run_id, unit_id
+                HAVING max(lease_until) > now64(3)
+            )
+        ORDER BY rand()
+        LIMIT 1
+        """,
+        parameters={'net': network}
+    )
+    if not res.result_rows:
+        return None
 
-    if today_count < min_operators:
-        logging.warning(
-            "VO_SWEEP: skipping — today's fetch (%d ops) below absolute floor (%d).",
-            today_count, min_operators
-        )
-        return
+    run_id, unit_id, kind, payload = res.result_rows[0]
+    claim_id = uuid.uuid4().hex
+
+    # Lease timestamps come from the ClickHouse clock, so worker clock skew
+    # can't make a lease look live or expired.
+    client.command(
+        "INSERT INTO collector_work_claims (run_id, unit_id, claim_id, worker_id, claimed_at, lease_until) "
+        "SELECT %(run)s, %(unit)s, %(claim)s, %(worker)s, now64(3), now64(3) + toIntervalSecond(%(lease)s)",
+        parameters={'run': run_id, 'unit': unit_id, 'claim': claim_id, 'worker': worker_id, 'lease': lease_seconds}
+    )
 
     res = client.query(
-        "SELECT uniqExact(operator_id) FROM operators "
-        "WHERE network = %(net)s AND updated_at >= now() - INTERVAL %(days)s DAY",
-        parameters={'net': network, 'days': staleness_days}
+        "SELECT argMin(claim_id, (claimed_at, claim_id)) FROM collector_work_claims "
+        "WHERE run_id = %(run)s AND unit_id = %(unit)s AND lease_until > now64(3)",
+        parameters={'run': run_id, 'unit': unit_id}
     )
-    recent_count = res.result_rows[0][0] if res.result_rows else 0
-    if recent_count > 0 and today_count < min_coverage * recent_count:
-        logging.warning(
-            "VO_SWEEP: skipping — today's fetch (%d) is below %.0f%% of operators "
-            "seen in the last %d days (%d); possible API degradation.",
-            today_count, min_coverage * 100, staleness_days, recent_count
+    winner = res.result_rows[0][0] if res.result_rows else None
+    if winner != claim_id:
+        logging.debug("QUEUE: lost claim race for %s/%d", run_id, unit_id)
+        return None
+
+    return run_id, unit_id, kind, json.loads(payload), claim_id
+
+
+def complete_work_unit(client, run_id, unit_id, claim_id, worker_id, result: dict):
+    client.insert('collector_work_results', [
+        (run_id, unit_id, claim_id, worker_id, json.dumps(result), datetime.now(timezone.utc))
+    ], column_names=['run_id', 'unit_id', 'claim_id', 'worker_id', 'result', 'finished_at'])
+
+
+def run_work_unit(network, kind, payload):
+    """
+    Run one work unit. Returns its JSON-serializable result, or None if the
+    unit could not be completed and should be retried after its lease expires.
+    When archiving, the result carries the unit's archive entries so the
+    coordinator's manifest covers responses fetched by every worker.
+    """
+    if RUN_ARCHIVE:
+        RUN_ARCHIVE.take_entries()
+    result = _run_work_unit(network, kind, payload)
+    if result is not None and RUN_ARCHIVE:
+        result['archive'] = RUN_ARCHIVE.take_entries()
+    return result
+
+
+def _run_work_unit(network, kind, payload):
+    if kind == 'operators':
+        operators, complete = fetch_operator_pages(
+            network, payload['per_page'], payload['first_page'], payload.get('last_page'))
+        return {'operators': list(operators.values())} if complete else None
+
+    if kind == 'validators':
+        records, complete = fetch_validator_records(
+            network, payload['per_page'], payload.get('after_id'), payload.get('until_id'))
+        if not complete:
+            return None
+        return {'validators': [[pk, st, list(cluster)] for pk, (st, cluster) in records.items()]}
+
+    if kind == 'beacon':
+        return {'validators': fetch_beacon_validators(payload['beacon_api_url'], set(payload['pubkeys']))}
+
+    logging.error("QUEUE: unknown work unit kind %r", kind)
+    return None
+
+
+def wait_for_work_units(client, run_id, unit_ids: list[int], timeout_seconds, poll_seconds) -> dict[int, dict] | None:
+    """
+    Wait until every unit in unit_ids has a result and return {unit_id: result};
+    None on timeout. If a unit finished twice (its lease expired while it was
+    still running), the first result is used.
+    """
+    deadline = time.monotonic() + timeout_seconds
+    while True:
+        res = client.query(
+            "SELECT uniqExact(unit_id) FROM collector_work_results "
+            "WHERE run_id = %(run)s AND unit_id IN %(ids)s",
+            parameters={'run': run_id, 'ids': unit_ids}
         )
-        return
+        done = res.result_rows[0][0] if res.result_rows else 0
+        logging.info("QUEUE: run %s: %d/%d units done", run_id, done, len(unit_ids))
+        if done >= len(unit_ids):
+            break
+        if time.monotonic() >= deadline:
+            logging.error("QUEUE: run %s: timed out with %d/%d units done", run_id, done, len(unit_ids))
+            return None
+        time.sleep(poll_seconds)
 
-    # Pick the latest row per operator so duplicate MergeTree rows don't
-    # cause a single operator to be demoted (or re-inserted) multiple times.
     res = client.query(
-        "SELECT operator_id, operator_name, is_private, validator_count, operator_fee, address "
-        "FROM ("
-        "    SELECT "
-        "        operator_id, "
-        "        argMax(operator_name, updated_at)    AS operator_name, "
-        "        argMax(is_private, updated_at)       AS is_private, "
-        "        argMax(validator_count, updated_at)  AS validator_count, "
-        "        argMax(operator_fee, updated_at)     AS operator_fee, "
-        "        argMax(address, updated_at)          AS address, "
-        "        argMax(is_vo, updated_at)            AS latest_is_vo, "
-        "        max(updated_at)                      AS latest_at "
-        "    FROM operators "
-        "    WHERE network = %(net)s "
-        "    GROUP BY operator_id"
-        ") "
-        "WHERE latest_is_vo = 1 "
-        "AND latest_at < now() - INTERVAL %(days)s DAY",
-        parameters={'net': network, 'days': staleness_days}
+        "SELECT unit_id, argMin(result, finished_at) FROM collector_work_results "
+        "WHERE run_id = %(run)s AND unit_id IN %(ids)s GROUP BY unit_id",
+        parameters={'run': run_id, 'ids': unit_ids}
     )
-    stale = [row for row in res.result_rows if row[0] not in todays_operator_ids]
+    return {unit_id: json.loads(result) for unit_id, result in res.result_rows}
 
-    if not stale:
-        logging.info("VO_SWEEP: no stale verified operators found.")
+
+def validator_ids_above(network, last_id: int) -> bool | None:
+    """
+    Whether any validator has an ID above last_id; None on request error.
+    """
+    data = http_get_json(ssv_api(), f"/{network}/validators?perPage=1&lastId={last_id}", timeout=30)
+    if data is None:
+        return None
+    return bool(data.get("validators"))
+
+
+def estimate_max_validator_id(network, precision: int) -> int:
+    """
+    Upper bound on the highest validator ID, within `precision` of it. IDs
+    are not dense (deleted validators leave gaps), so the listing's total
+    can be far below the highest ID. The lastId cursor is probed with a
+    doubling bound, then bisected. 0 when there are no validators or the
+    API can't be reached (the open-ended last unit still covers every ID).
+    """
+    lo, hi = 0, max(1, precision)
+    while True:
+        above = validator_ids_above(network, hi)
+        if above is None:
+            return 0
+        if not above:
+            break
+        lo, hi = hi, hi * 2
+
+    while hi - lo > precision:
+        mid = (lo + hi) // 2
+        above = validator_ids_above(network, mid)
+        if above is None:
+            break
+        if above:
+            lo = mid
+        else:
+            hi = mid
+    return hi
+
+
+def plan_collection_units(network, ops_per_page, val_per_page, ops_pages_per_unit, validators_per_unit):
+    """
+    Split the SSV API crawl into work units: ranges of /operators pages and
+    equal ranges of validator IDs up to the highest ID. The last range of
+    each is open-ended, so totals that grew since planning are still covered.
+    """
+    units: list[tuple[int, str, dict]] = []
+
+    data = http_get_json(ssv_api(), f"/{network}/operators?perPage={ops_per_page}&page=1", timeout=30) or {}
+    pages = int((data.get("pagination") or {}).get("pages") or 1)
+    first = 1
+    while True:
+        last = first + ops_pages_per_unit - 1
+        open_ended = last >= pages
+        units.append((len(units), 'operators', {
+            'per_page': ops_per_page,
+            'first_page': first,
+            'last_page': None if open_ended else last,
+        }))
+        if open_ended:
+            break
+        first = last + 1
+
+    max_id = estimate_max_validator_id(network, max(1, validators_per_unit // 10))
+    after_id = None
+    while True:
+        until_id = (after_id or 0) + validators_per_unit
+        open_ended = until_id >= max_id
+        units.append((len(units), 'validators', {
+            'per_page': val_per_page,
+            'after_id': after_id,
+            'until_id': None if open_ended else until_id,
+        }))
+        if open_ended:
+            break
+        after_id = until_id
+
+    return units
+
+
+def assemble_collection_results(units, results: dict[int, dict]):
+    """
+    Merge the results of the operators and validators units into
+    (operators, validator records) in unit order, so a record repeated at a
+    range boundary takes the later unit's value. Archive entries carried by
+    the results are added to RUN_ARCHIVE.
+    """
+    operators: dict[int, dict] = {}
+    records: dict[str, tuple[str, tuple[int, ...]]] = {}
+    for result in results.values():
+        if RUN_ARCHIVE:
+            RUN_ARCHIVE.add_entries(result.get('archive') or [])
+    for unit_id, kind, _ in units:
+        if kind == 'operators':
+            for op in results[unit_id]['operators']:
+                operators[int(op['id'])] = op
+        else:
+            for pubkey, status, cluster in results[unit_id]['validators']:
+                records[pubkey] = (status, tuple(cluster))
+    return operators, records
+
+
+def run_coordinator(args, clickhouse_password):
+    """
+    Coordinator mode: enqueue the day's crawl as work units, wait for workers
+    to finish them, then assemble and store the day exactly as collect mode does.
+    """
+    started_at = datetime.now(timezone.utc)
+    target_date = datetime.now(timezone.utc if not args.local_time else None).date()
+    run_id = f"{args.network}-{target_date.isoformat()}-{uuid.uuid4().hex[:8]}"
+    client = get_clickhouse_client(clickhouse_password)
+
+    logging.info("QUEUE: starting run %s", run_id)
+
+    # Phase 1: SSV API operators and validators
+    units = plan_collection_units(args.network, args.ops_page_size, args.val_page_size,
+                                  args.queue_operator_pages_per_unit, args.queue_validators_per_unit)
+    enqueue_work_units(client, run_id, args.network, units)
+    results = wait_for_work_units(client, run_id, [u[0] for u in units],
+                                  args.queue_timeout, args.queue_poll_seconds)
+    if results is None:
+        logging.error("QUEUE: run %s incomplete; nothing stored.", run_id)
         return
 
-    stale_ids = [row[0] for row in stale]
-    logging.info(
-        "VO_SWEEP: demoting %d verified operators stale >= %d days (sample: %s).",
-        len(stale_ids), staleness_days, stale_ids[:20]
+    operators, records = assemble_collection_results(units, results)
+    logging.info("QUEUE: run %s: assembled %d operators and %d validators", run_id, len(operators), len(records))
+    _, all_pubkeys, all_pubkeys_status, validator_clusters = build_validator_maps(records)
+
+    # Phase 2: beacon statuses, once the full pubkey set is known
+    beacon_validators: dict[str, dict] = {}
+    if args.beacon_api_url:
+        pubkeys = sorted(all_pubkeys)
+        batch = args.queue_beacon_pubkeys_per_unit
+        beacon_units = [
+            (len(units) + i, 'beacon', {'beacon_api_url': args.beacon_api_url, 'pubkeys': pubkeys[j:j + batch]})
+            for i, j in enumerate(range(0, len(pubkeys), batch))
+        ]
+        if beacon_units:
+            enqueue_work_units(client, run_id, args.network, beacon_units)
+            results = wait_for_work_units(client, run_id, [u[0] for u in beacon_units],
+                                          args.queue_timeout, args.queue_poll_seconds)
+            if results is None:
+                logging.error("QUEUE: run %s beacon phase incomplete; nothing stored.", run_id)
+                return
+            for result in results.values():
+                if RUN_ARCHIVE:
+                    RUN_ARCHIVE.add_entries(result.get('archive') or [])
+                beacon_validators.update(result['validators'])
+
+    beacon_statuses, beacon_balances = split_beacon_validators(beacon_validators)
+    store_collected_day(client, args, operators, all_pubkeys_status, validator_clusters,
+                        beacon_statuses, target_date, started_at=started_at, reason=f"queue run {run_id}",
+                        beacon_balances=beacon_balances)
+    logging.info("QUEUE: run %s stored", run_id)
+    log_fetch_stats()
+
+
+def run_worker(args, clickhouse_password):
+    """
+    Worker mode: claim and run work units for the network until idle for
+    --worker-idle-exit seconds (forever when 0).
+    """
+    worker_id = args.worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    client = get_clickhouse_client(clickhouse_password)
+    idle_since = time.monotonic()
+
+    logging.info("QUEUE: worker %s started for %s", worker_id, args.network)
+
+    while True:
+        claim = claim_work_unit(client, args.network, worker_id, args.queue_lease_seconds)
+        if claim is None:
+            if args.worker_idle_exit and time.monotonic() - idle_since >= args.worker_idle_exit:
+                logging.info("QUEUE: worker %s idle for %ds; exiting", worker_id, args.worker_idle_exit)
+                return
+            time.sleep(args.queue_poll_seconds)
+            continue
+
+        run_id, unit_id, kind, payload, claim_id = claim
+        logging.info("QUEUE: worker %s running %s/%d (%s)", worker_id, run_id, unit_id, kind)
+
+        result = run_work_unit(args.network, kind, payload)
+        if result is None:
+            logging.warning("QUEUE: %s/%d failed; it will be retried after its lease expires", run_id, unit_id)
+        else:
+            complete_work_unit(client, run_id, unit_id, claim_id, worker_id, result)
+        idle_since = time.monotonic()
+
+
+def derive_day_from_manifest(archive: RunArchive, manifest: dict):
+    """
+    Re-parse the archived responses of one run into
+    (operators, validator records, beacon validator records).
+    """
+    operators: dict[int, dict] = {}
+    records: dict[str, tuple[str, tuple[int, ...]]] = {}
+    beacon_validators: dict[str, dict] = {}
+
+    for entry in manifest["entries"]:
+        path = entry["path"]
+        if entry["upstream"] == "SSV_API" and re.match(r"^/[^/]+/operators\?", path):
+            data = json.loads(archive.load_object(entry["hash"]))
+            for op in data.get("operators", []) or []:
+                parsed = parse_ssv_operator(op)
+                if parsed is not None:
+                    operators[parsed["id"]] = parsed
+        elif entry["upstream"] == "SSV_API" and re.match(r"^/[^/]+/validators\?", path):
+            data = json.loads(archive.load_object(entry["hash"]))
+            for v in data.get("validators", []) or []:
+                record = parse_ssv_validator(v)
+                if record is not None:
+                    records[record[0]] = record[1:]
+        elif entry["upstream"] == "BEACON_API" and path == BEACON_VALIDATORS_PATH:
+            data = json.loads(archive.load_object(entry["hash"]))
+            beacon_validators.update(parse_beacon_validators(data.get("data", []) or []))
+
+    return operators, records, beacon_validators
+
+
+def delete_replayed_days(client, network, days, crawl_days):
+    """
+    Clear the collector's rows for every replayed day with one synchronous
+    mutation per table, before the days are rebuilt in parallel. Status counts
+    and clusters are only cleared on crawl_days, since fast days keep the last
+    crawled ones. Snapshot rows are kept: rebuilding a past day reuses their
+    attributes (see rebuild_operator_daily_snapshot).
+    """
+    days = sorted(days)
+    crawl_days = sorted(crawl_days)
+    source_tables = [
+        ('performance', days),
+        ('operator_fees', days),
+        ('validator_counts', days),
+        ('network_daily_summary', days),
+        ('validator_status_counts', crawl_days),
+        ('clusters', crawl_days),
+    ]
+
+    for table, table_days in source_tables:
+        if table_days:
+            client.command(
+                f"ALTER TABLE {table} DELETE WHERE network=%(net)s AND source=%(src)s AND metric_date IN %(days)s "
+                f"SETTINGS mutations_sync = 2",
+                parameters={'net': network, 'src': IMPORT_SOURCE, 'days': table_days}
+            )
+    client.command(
+        "ALTER TABLE performance_reconciled DELETE WHERE network=%(net)s AND metric_date IN %(days)s "
+        "SETTINGS mutations_sync = 2",
+        parameters={'net': network, 'days': days}
     )
 
-    for ids_chunk in _chunks(stale_ids, 1000):
-        client.command(
-            "ALTER TABLE operators DELETE WHERE network=%(net)s AND operator_id IN %(ids)s "
-            "SETTINGS mutations_sync = 2",
-            parameters={"net": network, "ids": ids_chunk}
-        )
+    logging.info("REPLAY: cleared %d days (%d crawled) before rebuilding", len(days), len(crawl_days))
+
+
+def replay_day(args, clickhouse_password, target_date, manifest_path):
+    """
+    Rebuild one day's tables from its archived run. Runs in a worker process.
+    """
+    archive = RunArchive(args.archive_dir)
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+
+    operators, records, beacon_validators = derive_day_from_manifest(archive, manifest)
+    beacon_statuses, beacon_balances = split_beacon_validators(beacon_validators)
+    _, _, all_pubkeys_status, validator_clusters = build_validator_maps(records)
+
+    fast_counts = None
+    if manifest.get("count_method") == 'fast':
+        fast_counts = {int(op_id): count for op_id, count in (manifest.get("fast_counts") or {}).items()}
+
+    client = get_clickhouse_client(clickhouse_password)
+    store_collected_day(client, args, operators, all_pubkeys_status, validator_clusters,
+                        beacon_statuses, target_date, fast_counts=fast_counts,
+                        reason=f"replay of {os.path.basename(manifest_path)}", replay=True,
+                        beacon_balances=beacon_balances)
+    logging.info("REPLAY: %s rebuilt from %s (%d operators, %d validators)",
+                 target_date, manifest_path, len(operators), len(records))
+    return target_date
+
+
+def run_replay(args, clickhouse_password):
+    """
+    Replay mode: re-derive every archived day in [--replay-from, --replay-to]
+    from raw responses, several days in parallel, without any API calls.
+    The days are cleared up front so the workers only insert. Rolling
+    aggregates are rebuilt afterwards in date order, since each day depends
+    on the ones before it.
+    """
+    if not args.archive_dir or not args.replay_from:
+        logging.error("REPLAY: --archive-dir and --replay-from are required in replay mode.")
+        return
+
+    date_from = datetime.strptime(args.replay_from, "%Y-%m-%d").date()
+    date_to = datetime.strptime(args.replay_to, "%Y-%m-%d").date() if args.replay_to else date_from
+
+    manifests = RunArchive(args.archive_dir).latest_manifests(args.network, date_from, date_to)
+    if not manifests:
+        logging.error("REPLAY: no archived runs for %s between %s and %s", args.network, date_from, date_to)
+        return
+    crawl_days = []
+    for d, path in manifests.items():
+        with open(path) as f:
+            if json.load(f).get("count_method") != 'fast':
+                crawl_days.append(d)
+
+    client = get_clickhouse_client(clickhouse_password)
+    delete_replayed_days(client, args.network, manifests.keys(), crawl_days)
+
+    logging.info("REPLAY: rebuilding %d days with %d processes", len(manifests), args.replay_workers)
+
+    with ProcessPoolExecutor(max_workers=args.replay_workers) as pool:
+        futures = [
+            pool.submit(replay_day, args, clickhouse_password, d, path)
+            for d, path in sorted(manifests.items())
+        ]
+        for future in futures:
+            future.result()
+
+    for d in sorted(manifests):
+        insert_clickhouse_rolling_performance(client, args.network, d, args.rolling_below_threshold)
+
+
+def run_beacon_performance(args, clickhouse_password):
+    """
+    Beacon performance mode: compute per-operator attestation effectiveness from
+    the beacon node and store it in `performance` under BEACON_PERF_SOURCE.
+    """
+    if not args.beacon_api_url:
+        logging.error("BEACON_PERF: --beacon-api-url is required in beacon-performance mode.")
+        return
+
+    operator_validators, all_pubkeys, _, _ = fetch_validators_maps(args.network, args.val_page_size)
+    beacon_validators = fetch_beacon_validators(args.beacon_api_url, all_pubkeys)
+
+    performance = compute_beacon_operator_performance(
+        args.beacon_api_url,
+        operator_validators,
+        beacon_validators,
+        args.beacon_perf_epochs,
+        args.beacon_perf_batch_size,
+    )
+    if not performance:
+        logging.error("BEACON_PERF: No operator performance computed; nothing stored.")
+        return
+
+    target_date = datetime.now(timezone.utc if not args.local_time else None).date()
+
+    client = get_clickhouse_client(clickhouse_password)
+    insert_clickhouse_beacon_performance(client, args.network, performance, target_date,
+                                         BEACON_PERF_SOURCE, args.beacon_perf_metric_type)
+    reconcile_performance(client, args.network, target_date,
+                          PERFORMANCE_SOURCE_PRIORITY, args.performance_disagreement_tolerance)
+    # The reconciled 24h value may have changed, and the rolling window reads it
+    insert_clickhouse_rolling_performance(client, args.network, target_date, args.rolling_below_threshold)
+    rebuild_operator_daily_snapshot(client, args.network, target_date)
+    log_fetch_stats()
+
 
+def insert_clickhouse_block_proposals(client, network, proposals: dict[int, tuple[int, int]], target_date, source):
     now = datetime.now(timezone.utc)
-    demoted_date = now.date()
-    rows = [
-        (network, op_id, name, 0, is_priv, vc, fee, addr, demoted_date, now)
-        for (op_id, name, is_priv, vc, fee, addr) in stale
-    ]
-    client.insert('operators', rows, column_names=[
-        'network', 'operator_id', 'operator_name', 'is_vo', 'is_private',
-        'validator_count', 'operator_fee', 'address', 'vo_demoted_at', 'updated_at'
-    ])
+    rows = [(network, op_id, target_date, proposed, missed, source, now)
+            for op_id, (proposed, missed) in proposals.items()]
+
+    logging.info("CLICKHOUSE: inserting %d block proposal rows", len(rows))
+
+    upsert_daily_partition(client, 'block_proposals', network, source, target_date)
+    if rows:
+        client.insert('block_proposals', rows, column_names=[
+            'network', 'operator_id', 'metric_date', 'proposed', 'missed', 'source', 'updated_at'
+        ])
+
+
+def run_block_proposals(args, clickhouse_password):
+    """
+    Block proposals mode: count proposed and missed blocks per operator over
+    the last --proposal-epochs finalized epochs and store them in
+    `block_proposals` under BEACON_PERF_SOURCE.
+    """
+    if not args.beacon_api_url:
+        logging.error("BEACON_PROPOSALS: --beacon-api-url is required in block-proposals mode.")
+        return
+
+    operator_validators, all_pubkeys, _, _ = fetch_validators_maps(args.network, args.val_page_size)
+    beacon_validators = fetch_beacon_validators(args.beacon_api_url, all_pubkeys)
+
+    proposals = compute_block_proposals(args.beacon_api_url, operator_validators, beacon_validators,
+                                        args.proposal_epochs, args.proposal_workers, args.proposal_timeout)
+
+    target_date = datetime.now(timezone.utc if not args.local_time else None).date()
+
+    client = get_clickhouse_client(clickhouse_password)
+    insert_clickhouse_block_proposals(client, args.network, proposals, target_date, BEACON_PERF_SOURCE)
+    log_fetch_stats()
 
 
 def read_clickhouse_password_from_file(password_file_path):
@@ -474,6 +2783,15 @@ def read_clickhouse_password_from_file(password_file_path):
 
 def main():
     parser = argparse.ArgumentParser(description='Fetch/update operator data and validator data')
+    parser.add_argument('--mode', choices=['collect', 'beacon-performance', 'block-proposals',
+                                           'coordinator', 'worker', 'replay'],
+                        default=os.environ.get('COLLECTOR_MODE', 'collect'),
+                        help='collect: SSV API operators, performance and validator counts (default); '
+                             'beacon-performance: attestation effectiveness per operator from the beacon node; '
+                             'block-proposals: proposed and missed blocks per operator from the beacon node; '
+                             'coordinator: enqueue collect as work units and store the day once workers finish; '
+                             'worker: run queued work units; '
+                             'replay: rebuild archived days from --archive-dir without API calls')
     parser.add_argument('-n', '--network', type=str, choices=['mainnet', 'holesky', 'hoodi'],
                         default='mainnet',
                         help='Network to fetch (default: mainnet)')
@@ -492,7 +2810,8 @@ def main():
                         default=os.environ.get("COLLECTOR_LOG_LEVEL", "INFO"),
                         help='Set the logging level')
     parser.add_argument('--beacon-api-url', type=str, default=os.environ.get("BEACON_API_URL"),
-                        help='Base URL for Beacon API')
+                        help='Base URL for Beacon API; several comma-separated nodes are used as '
+                             'hedge and fallback endpoints')
     parser.add_argument('--vo-staleness-days', type=int,
                         default=int(os.environ.get('VO_STALENESS_DAYS', 14)),
                         help='Demote is_vo=1 operators whose DB row has not been refreshed '
@@ -506,64 +2825,169 @@ def main():
                         help='Skip the VO sweep unless today\'s fetch covers at least this '
                              'fraction of operators seen in the last --vo-staleness-days days '
                              '(default 0.9)')
+    parser.add_argument('--rolling-below-threshold', type=float,
+                        default=float(os.environ.get('ROLLING_BELOW_THRESHOLD', 0.95)),
+                        help='24h performance below which a day counts toward days_below_30d '
+                             'in performance_rolling (default 0.95)')
+    parser.add_argument('--performance-disagreement-tolerance', type=float,
+                        default=float(os.environ.get('PERFORMANCE_DISAGREEMENT_TOLERANCE', 0.02)),
+                        help='Flag a reconciled performance value as disagreeing when its sources '
+                             'differ by more than this (default 0.02)')
+    parser.add_argument('--beacon-perf-epochs', type=int,
+                        default=int(os.environ.get('BEACON_PERF_EPOCHS', 225)),
+                        help='Number of finalized epochs to evaluate in beacon-performance mode '
+                             '(default 225, about 24 hours)')
+    parser.add_argument('--beacon-perf-batch-size', type=int,
+                        default=int(os.environ.get('BEACON_PERF_BATCH_SIZE', 10000)),
+                        help='Validator indices per rewards request in beacon-performance mode')
+    parser.add_argument('--beacon-perf-metric-type', type=str,
+                        default=os.environ.get('BEACON_PERF_METRIC_TYPE', '24h'),
+                        help='metric_type to store beacon-derived performance under (default 24h)')
+    parser.add_argument('--proposal-epochs', type=int,
+                        default=int(os.environ.get('PROPOSAL_EPOCHS', 225)),
+                        help='Number of finalized epochs to check in block-proposals mode '
+                             '(default 225, about 24 hours)')
+    parser.add_argument('--proposal-workers', type=int,
+                        default=int(os.environ.get('PROPOSAL_WORKERS', 8)),
+                        help='Block header requests in flight at once in block-proposals mode (default 8)')
+    parser.add_argument('--proposal-timeout', type=int,
+                        default=int(os.environ.get('PROPOSAL_TIMEOUT_SECONDS', 600)),
+                        help='Seconds to spend on block header requests in block-proposals mode; '
+                             'slots not answered by then are left out (default 600)')
+    parser.add_argument('--http-cache-dir', type=str, default=os.environ.get('HTTP_CACHE_DIR'),
+                        help='Directory for the on-disk conditional-GET response cache (default: disabled)')
+    parser.add_argument('--archive-dir', type=str, default=os.environ.get('ARCHIVE_DIR'),
+                        help='Directory for the raw API response archive (default: disabled)')
+    parser.add_argument('--replay-from', type=str,
+                        help='In replay mode, first date to rebuild (YYYY-MM-DD)')
+    parser.add_argument('--replay-to', type=str,
+                        help='In replay mode, last date to rebuild (YYYY-MM-DD, default: --replay-from)')
+    parser.add_argument('--replay-workers', type=int,
+                        default=int(os.environ.get('REPLAY_WORKERS', os.cpu_count() or 4)),
+                        help='In replay mode, days rebuilt in parallel (default: CPU count)')
+    parser.add_argument('--validator-count-mode', choices=['crawl', 'fast'],
+                        default=os.environ.get('VALIDATOR_COUNT_MODE', 'crawl'),
+                        help='crawl: count active validators by walking /validators every run (default); '
+                             'fast: derive counts from the /operators listing and crawl only when due')
+    parser.add_argument('--full-crawl-every-days', type=int,
+                        default=int(os.environ.get('FULL_CRAWL_EVERY_DAYS', 7)),
+                        help='In fast mode, run the full crawl when the last one is this many days old (default 7)')
+    parser.add_argument('--fast-count-sample-size', type=int,
+                        default=int(os.environ.get('FAST_COUNT_SAMPLE_SIZE', 10)),
+                        help='In fast mode, operators whose counts are cross-checked per run (default 10)')
+    parser.add_argument('--fast-count-tolerance', type=float,
+                        default=float(os.environ.get('FAST_COUNT_TOLERANCE', 0.05)),
+                        help='In fast mode, relative difference in a sampled count that forces a full crawl '
+                             '(default 0.05, never less than 2 validators)')
+    parser.add_argument('--worker-id', type=str, default=os.environ.get('WORKER_ID'),
+                        help='Worker name recorded with claims (default: hostname-pid)')
+    parser.add_argument('--worker-idle-exit', type=int,
+                        default=int(os.environ.get('WORKER_IDLE_EXIT', 0)),
+                        help='Exit a worker after this many seconds without work (default 0: never)')
+    parser.add_argument('--queue-lease-seconds', type=int,
+                        default=int(os.environ.get('QUEUE_LEASE_SECONDS', 900)),
+                        help='Seconds a claimed work unit is leased before another worker may retry it')
+    parser.add_argument('--queue-poll-seconds', type=float,
+                        default=float(os.environ.get('QUEUE_POLL_SECONDS', 5)),
+                        help='Seconds between queue polls by workers and the coordinator')
+    parser.add_argument('--queue-timeout', type=int,
+                        default=int(os.environ.get('QUEUE_TIMEOUT', 7200)),
+                        help='Seconds the coordinator waits for a phase before giving up')
+    parser.add_argument('--queue-operator-pages-per-unit', type=int,
+                        default=int(os.environ.get('QUEUE_OPERATOR_PAGES_PER_UNIT', 5)),
+                        help='/operators pages per work unit')
+    parser.add_argument('--queue-validators-per-unit', type=int,
+                        default=int(os.environ.get('QUEUE_VALIDATORS_PER_UNIT', 25000)),
+                        help='Validator IDs per work unit')
+    parser.add_argument('--queue-beacon-pubkeys-per-unit', type=int,
+                        default=int(os.environ.get('QUEUE_BEACON_PUBKEYS_PER_UNIT', 10000)),
+                        help='Pubkeys per beacon status work unit')
     args = parser.parse_args()
 
     if args.beacon_api_url:
-        args.beacon_api_url = args.beacon_api_url.rstrip("/")
+        args.beacon_api_url = ",".join(u.strip().rstrip("/") for u in args.beacon_api_url.split(",") if u.strip())
 
     # Set logging level dynamically
     logging.getLogger().setLevel(args.log_level.upper())
     logging.info(f"Logging level set to {args.log_level.upper()}")
 
+    global RESPONSE_CACHE, RUN_ARCHIVE
+    if args.http_cache_dir:
+        RESPONSE_CACHE = ResponseCache(args.http_cache_dir)
+        logging.info("HTTP_CACHE: caching responses in %s", args.http_cache_dir)
+    # Replay only re-derives the daily collection, so the beacon-performance and
+    # block-proposals modes don't archive: they write no manifest, and their
+    # responses could neither be replayed nor cleaned up
+    if args.archive_dir and args.mode in ('beacon-performance', 'block-proposals'):
+        logging.info("ARCHIVE: not archiving in %s mode", args.mode)
+    elif args.archive_dir and args.mode != 'replay':
+        RUN_ARCHIVE = RunArchive(args.archive_dir)
+        logging.info("ARCHIVE: archiving raw responses in %s", args.archive_dir)
+
     try:
         clickhouse_password = read_clickhouse_password_from_file(args.clickhouse_password_file)
     except Exception:
         logging.info("Unable to read ClickHouse password file; trying CLICKHOUSE_PASSWORD env.")
         clickhouse_password = os.environ.get("CLICKHOUSE_PASSWORD")
 
+    if args.mode == 'beacon-performance':
+        run_beacon_performance(args, clickhouse_password)
+        return
+    if args.mode == 'block-proposals':
+        run_block_proposals(args, clickhouse_password)
+        return
+    if args.mode == 'coordinator':
+        run_coordinator(args, clickhouse_password)
+        return
+    if args.mode == 'worker':
+        run_worker(args, clickhouse_password)
+        return
+    if args.mode == 'replay':
+        run_replay(args, clickhouse_password)
+        return
+
+    started_at = datetime.now(timezone.utc)
+    target_date = datetime.now(timezone.utc if not args.local_time else None).date()
+
+    client = get_clickhouse_client(clickhouse_password)
+
     # Step 1: full operators list (metadata)
     operators = fetch_operators_from_ssv(args.network, args.ops_page_size)
 
+    # Fast path: counts from the operators listing, unless a full crawl is due
+    reason = "validator count mode is crawl"
+    if args.validator_count_mode == 'fast':
+        estimated = estimate_active_counts(operators, get_inactive_offsets(client, args.network, IMPORT_SOURCE))
+        reason = full_crawl_reason(client, args, operators, estimated)
+        if reason is None:
+            unlisted = get_unlisted_crawled_counts(client, args.network, IMPORT_SOURCE, set(operators))
+            if unlisted:
+                logging.info("FAST_COUNTS: carrying forward crawled counts for %d unlisted operators", len(unlisted))
+            estimated.update(unlisted)
+            store_collected_day(client, args, operators, {}, {}, {}, target_date, fast_counts=estimated,
+                                started_at=started_at, reason="sampled cross-check agreed")
+            log_fetch_stats()
+            return
+        logging.info("FAST_COUNTS: running the full validator crawl: %s", reason)
+
     # Step 2: Query validators endpoint and optionally beacon API for statuses
-    operator_validators, all_pubkeys, all_pubkeys_status = fetch_validators_maps(args.network, args.val_page_size)
-    logging.info("SSV_API: Operators with > 0 validators: %d/%d total).",
-                 len([k for k,v in operator_validators.items() if v]), len(operators))
+    _, all_pubkeys, all_pubkeys_status, validator_clusters = fetch_validators_maps(args.network, args.val_page_size)
 
     # Step 3: If BEACON_API_URL set, fetch statuses and use those counts instead of SSV-based
-    final_active_counts: dict[int, int] = {}
     beacon_statuses: dict[str, str] = {}
+    beacon_balances: dict[str, tuple[int, int]] = {}
     if args.beacon_api_url:
-        beacon_statuses = fetch_beacon_statuses(args.beacon_api_url, all_pubkeys)
-        if beacon_statuses:
-            logging.info("Using BEACON_API validator statuses")
-            final_active_counts = count_active_from_status_map(operator_validators, beacon_statuses)
-        else:
-            logging.warning("Beacon API URL set, but no beacon statuses received; falling back to SSV-based counts")
-    else:
-        logging.info("No beacon API URL set; using SSV-based active counts")
-        final_active_counts = count_active_from_status_map(operator_validators, all_pubkeys_status)
-
-
-    # Set the final active count into operators[op]['validators_count'] (used by DB writer)
-    for op_id, op in operators.items():
-        op["validators_count"] = final_active_counts.get(op_id, 0)
-
-    target_date = datetime.now(timezone.utc if not args.local_time else None).date()
+        beacon_statuses, beacon_balances = split_beacon_validators(
+            fetch_beacon_validators(args.beacon_api_url, all_pubkeys))
 
-    client = get_clickhouse_client(clickhouse_password)
-
-    insert_clickhouse_performance_data(client, args.network, operators, target_date, IMPORT_SOURCE)
-    insert_clickhouse_validator_count_data(client, args.network, final_active_counts, target_date, IMPORT_SOURCE)
-
-    sweep_stale_verified_operators(
-        client,
-        args.network,
-        set(operators.keys()),
-        args.vo_staleness_days,
-        args.vo_sweep_min_coverage,
-        args.vo_sweep_min_operators,
-    )
+    store_collected_day(client, args, operators, all_pubkeys_status, validator_clusters,
+                        beacon_statuses, target_date, started_at=started_at, reason=reason,
+                        beacon_balances=beacon_balances)
+    log_fetch_stats()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    try:
+        main()
+    finally:
+        close_endpoint_pools()
\ No newline at end of file
@@ -0,0 +1,48 @@
+import importlib.util
+import os
+import sys
+
+COLLECTOR_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                              "ssv-performance-collector.py")
+
+
+##
+## The collector is a single script with a hyphenated name, so tests load it
+## by path; it is loaded once and shared by every test module.
+##
+def load_collector():
+    module = sys.modules.get("ssv_performance_collector")
+    if module is None:
+        spec = importlib.util.spec_from_file_location("ssv_performance_collector", COLLECTOR_PATH)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+class StubResult:
+    def __init__(self, rows):
+        self.result_rows = rows
+
+
+##
+## Stands in for the ClickHouse client: each query() returns the next list of
+## rows from `responses`; queries, commands and inserts are recorded.
+##
+class StubClickHouse:
+
+    def __init__(self, responses=()):
+        self.responses = list(responses)
+        self.queries = []
+        self.commands = []
+        self.inserts = []
+
+    def query(self, query, parameters=None):
+        self.queries.append((query, parameters))
+        return StubResult(self.responses.pop(0))
+
+    def command(self, command, parameters=None):
+        self.commands.append((command, parameters))
+
+    def insert(self, table, rows, column_names=None):
+        self.inserts.append((table, rows, column_names))
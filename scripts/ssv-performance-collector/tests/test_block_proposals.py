@@ -0,0 +1,104 @@
+import threading
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from support import load_collector
+
+collector = load_collector()
+
+
+class MatchProposerDutiesTest(unittest.TestCase):
+
+    CASES = [
+        ("some duties are ours", [100, 101, 102, 103], [10, 5, 30, 99], [10, 20, 30], [100, 102], [0, 2]),
+        ("none are ours", [100, 101], [1, 2], [10, 20], [], []),
+        ("duty index above every validator", [100, 101], [50, 10], [10, 20], [101], [0]),
+        ("same validator twice", [100, 101], [20, 20], [10, 20], [100, 101], [1, 1]),
+        ("no validators", [100], [10], [], [], []),
+        ("no duties", [], [], [10], [], []),
+    ]
+
+    def test_matches(self):
+        for name, slots, indices, validators, expected_slots, expected_positions in self.CASES:
+            with self.subTest(name):
+                matched_slots, positions = collector.match_proposer_duties(
+                    np.array(slots, dtype=np.int64),
+                    np.array(indices, dtype=np.int64),
+                    np.array(validators, dtype=np.int64),
+                )
+                self.assertEqual(matched_slots.tolist(), expected_slots)
+                self.assertEqual(positions.tolist(), expected_positions)
+
+
+class ComputeBlockProposalsTest(unittest.TestCase):
+
+    BEACON_VALIDATORS = {
+        "0xa": {"index": 10},
+        "0xb": {"index": 20},
+        "0xc": {"index": 30},
+        "0xd": {"index": None},
+    }
+
+    OPERATOR_VALIDATORS = {
+        1: {"0xa", "0xb"},
+        2: {"0xb", "0xc"},
+        3: {"0xd"},
+        4: {"0xa"},
+        5: {"0xc"},
+    }
+
+    # slot: (duty validator index, proposer index of the canonical block)
+    # -1 is a slot without a block; None is a slot the beacon node couldn't answer for
+    SLOTS = {
+        100: (10, 10),    # 0xa proposed
+        101: (5, 5),      # not an SSV validator
+        102: (20, -1),    # 0xb missed
+        103: (30, None),  # 0xc unanswered
+        104: (20, 20),    # 0xb proposed
+        105: (10, 7),     # 0xa missed (another proposer's block)
+    }
+
+    def test_counts_per_operator(self):
+        slots = sorted(self.SLOTS)
+        duties = (np.array(slots, dtype=np.int64), np.array([self.SLOTS[s][0] for s in slots], dtype=np.int64))
+
+        with mock.patch.object(collector, "fetch_finalized_epoch", return_value=10), \
+                mock.patch.object(collector, "fetch_proposer_duties", return_value=duties) as fetch_duties, \
+                mock.patch.object(collector, "fetch_block_proposer", side_effect=lambda url, slot: self.SLOTS[slot][1]):
+            proposals = collector.compute_block_proposals(
+                "http://beacon", self.OPERATOR_VALIDATORS, self.BEACON_VALIDATORS, epochs=2)
+
+        fetch_duties.assert_called_once_with("http://beacon", 9, 10)
+        # Operators 3 and 5 have no answered duties and are left out
+        self.assertEqual(proposals, {1: (2, 2), 2: (1, 1), 4: (1, 1)})
+
+    def test_nothing_without_finalized_epoch(self):
+        with mock.patch.object(collector, "fetch_finalized_epoch", return_value=None):
+            self.assertEqual(collector.compute_block_proposals(
+                "http://beacon", self.OPERATOR_VALIDATORS, self.BEACON_VALIDATORS, epochs=2), {})
+
+
+class FetchBlockProposersTest(unittest.TestCase):
+
+    def test_unanswered_and_late_slots_are_left_out(self):
+        release = threading.Event()
+
+        def proposer(url, slot):
+            if slot == 3:
+                release.wait(5)
+            return {1: 10, 2: None, 3: 30, 4: -1}[slot]
+
+        with mock.patch.object(collector, "fetch_block_proposer", side_effect=proposer):
+            proposers = collector.fetch_block_proposers("http://beacon", [1, 2, 3, 4], workers=2, timeout=0.5)
+        release.set()
+
+        self.assertEqual(proposers.tolist(), [10, -2, -2, -1])
+
+    def test_no_slots(self):
+        self.assertEqual(collector.fetch_block_proposers("http://beacon", [], workers=2, timeout=1).tolist(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
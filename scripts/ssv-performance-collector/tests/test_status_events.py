@@ -0,0 +1,74 @@
+import unittest
+
+import numpy as np
+
+from support import load_collector
+
+collector = load_collector()
+
+
+class ClassifyStatusTransitionTest(unittest.TestCase):
+
+    CASES = [
+        ("active_ongoing", "active_slashed", "slashed"),
+        ("active_exiting", "exited_slashed", "slashed"),
+        ("active_slashed", "exited_slashed", "exited"),
+        ("active_exiting", "exited_unslashed", "exited"),
+        ("active_ongoing", "active_exiting", "exit_initiated"),
+        ("exited_unslashed", "withdrawal_possible", "withdrawal"),
+        ("withdrawal_possible", "withdrawal_done", "withdrawal"),
+        ("pending_queued", "active_ongoing", "activated"),
+        ("pending_initialized", "pending_queued", "other"),
+        ("unknown", "active_ongoing", "other"),
+    ]
+
+    def test_transitions(self):
+        for old_status, new_status, expected in self.CASES:
+            with self.subTest(old=old_status, new=new_status):
+                self.assertEqual(collector.classify_status_transition(old_status, new_status), expected)
+
+
+def _diff(prev, cur):
+    prev = sorted(prev.items())
+    prev_pubkeys = np.array([pk for pk, _ in prev], dtype="S")
+    prev_statuses = np.array([st for _, st in prev], dtype="U")
+    cur_pubkeys = np.array(list(cur), dtype="S")
+    cur_statuses = np.array(list(cur.values()), dtype="U")
+    positions, old_statuses = collector.diff_status_snapshots(prev_pubkeys, prev_statuses, cur_pubkeys, cur_statuses)
+    keys = list(cur)
+    return {keys[pos]: (old, cur[keys[pos]]) for pos, old in zip(positions.tolist(), old_statuses.tolist())}
+
+
+class DiffStatusSnapshotsTest(unittest.TestCase):
+
+    CASES = [
+        (
+            "changed statuses only",
+            {"0xa": "active_ongoing", "0xb": "pending_queued", "0xc": "active_ongoing"},
+            {"0xc": "active_exiting", "0xa": "active_ongoing", "0xb": "active_ongoing"},
+            {"0xc": ("active_ongoing", "active_exiting"), "0xb": ("pending_queued", "active_ongoing")},
+        ),
+        (
+            "new and vanished validators are not transitions",
+            {"0xb": "active_ongoing", "0xd": "active_ongoing"},
+            {"0xa": "active_slashed", "0xc": "pending_queued", "0xe": "active_ongoing", "0xd": "exited_unslashed"},
+            {"0xd": ("active_ongoing", "exited_unslashed")},
+        ),
+        (
+            "pubkey past the end of the previous snapshot",
+            {"0xa": "active_ongoing"},
+            {"0xz": "active_ongoing", "0xa": "active_ongoing"},
+            {},
+        ),
+        ("no previous snapshot", {}, {"0xa": "active_ongoing"}, {}),
+        ("empty current snapshot", {"0xa": "active_ongoing"}, {}, {}),
+    ]
+
+    def test_diffs(self):
+        for name, prev, cur, expected in self.CASES:
+            with self.subTest(name):
+                self.assertEqual(_diff(prev, cur), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+import argparse
+import datetime
+import unittest
+from unittest import mock
+
+from support import StubClickHouse, load_collector
+
+collector = load_collector()
+
+STEPS = [
+    "insert_clickhouse_performance_data",
+    "reconcile_performance",
+    "insert_clickhouse_validator_count_data",
+    "insert_clickhouse_network_summary",
+    "insert_clickhouse_status_counts",
+    "insert_clickhouse_cluster_data",
+    "record_validator_status_events",
+    "insert_clickhouse_rolling_performance",
+    "sweep_stale_verified_operators",
+    "rebuild_operator_daily_snapshot",
+    "record_collector_run",
+]
+
+
+class StoreCollectedDayOrderTest(unittest.TestCase):
+
+    ARGS = argparse.Namespace(
+        network="mainnet",
+        beacon_api_url=None,
+        performance_disagreement_tolerance=0.01,
+        rolling_below_threshold=0.95,
+        vo_staleness_days=14,
+        vo_sweep_min_coverage=0.9,
+        vo_sweep_min_operators=100,
+    )
+
+    def store(self, **kwargs):
+        calls = mock.Mock()
+        with mock.patch.multiple(collector, **{step: mock.DEFAULT for step in STEPS}) as patched, \
+                mock.patch.object(collector, "RUN_ARCHIVE", None):
+            for step, fn in patched.items():
+                calls.attach_mock(fn, step)
+            collector.store_collected_day(
+                StubClickHouse(), self.ARGS, {1: {"id": 1}}, {}, {}, {}, datetime.date(2025, 3, 1),
+                fast_counts={1: 5}, **kwargs)
+        return [call[0] for call in calls.mock_calls]
+
+    def test_snapshot_is_rebuilt_after_the_sweep_and_before_the_run_record(self):
+        order = self.store()
+
+        self.assertLess(order.index("sweep_stale_verified_operators"), order.index("rebuild_operator_daily_snapshot"))
+        self.assertLess(order.index("rebuild_operator_daily_snapshot"), order.index("record_collector_run"))
+        self.assertEqual(order.count("rebuild_operator_daily_snapshot"), 1)
+
+    def test_replay_rebuilds_the_snapshot_without_sweeping(self):
+        order = self.store(replay=True)
+
+        self.assertIn("rebuild_operator_daily_snapshot", order)
+        self.assertNotIn("sweep_stale_verified_operators", order)
+        self.assertNotIn("record_collector_run", order)
+
+    def test_replay_leaves_deletes_to_the_caller(self):
+        with mock.patch.multiple(collector, **{step: mock.DEFAULT for step in STEPS}) as patched, \
+                mock.patch.object(collector, "RUN_ARCHIVE", None):
+            collector.store_collected_day(
+                StubClickHouse(), self.ARGS, {1: {"id": 1}}, {}, {}, {}, datetime.date(2025, 3, 1),
+                fast_counts={1: 5}, replay=True)
+
+        for step in ("insert_clickhouse_performance_data", "reconcile_performance",
+                     "insert_clickhouse_validator_count_data", "insert_clickhouse_network_summary",
+                     "rebuild_operator_daily_snapshot"):
+            self.assertIs(patched[step].call_args.kwargs["replace"], False, step)
+
+
+class RunBeaconPerformanceTest(unittest.TestCase):
+
+    ARGS = argparse.Namespace(
+        network="mainnet",
+        beacon_api_url="http://beacon",
+        val_page_size=1000,
+        beacon_perf_epochs=225,
+        beacon_perf_batch_size=100,
+        beacon_perf_metric_type="24h",
+        local_time=False,
+        performance_disagreement_tolerance=0.01,
+        rolling_below_threshold=0.95,
+    )
+
+    def test_rolling_aggregates_are_rebuilt_after_reconciling(self):
+        steps = ["insert_clickhouse_beacon_performance", "reconcile_performance",
+                 "insert_clickhouse_rolling_performance", "rebuild_operator_daily_snapshot"]
+        calls = mock.Mock()
+        with mock.patch.multiple(collector, **{step: mock.DEFAULT for step in steps}) as patched, \
+                mock.patch.object(collector, "fetch_validators_maps", return_value=({}, set(), {}, {})), \
+                mock.patch.object(collector, "fetch_beacon_validators", return_value={}), \
+                mock.patch.object(collector, "compute_beacon_operator_performance", return_value={1: 0.99}), \
+                mock.patch.object(collector, "get_clickhouse_client", return_value=StubClickHouse()), \
+                mock.patch.object(collector, "log_fetch_stats"):
+            for step, fn in patched.items():
+                calls.attach_mock(fn, step)
+            collector.run_beacon_performance(self.ARGS, "password")
+
+        self.assertEqual([call[0] for call in calls.mock_calls], steps)
+
+
+class DeleteReplayedDaysTest(unittest.TestCase):
+
+    def test_one_mutation_per_table_for_all_days(self):
+        client = StubClickHouse()
+        days = [datetime.date(2025, 3, 2), datetime.date(2025, 3, 1)]
+
+        collector.delete_replayed_days(client, "mainnet", days, [datetime.date(2025, 3, 1)])
+
+        tables = [command.split()[2] for command, _ in client.commands]
+        self.assertEqual(len(tables), len(set(tables)))
+        self.assertIn("performance_reconciled", tables)
+        for command, parameters in client.commands:
+            self.assertIn("mutations_sync = 2", command)
+            expected = [datetime.date(2025, 3, 1)] if command.split()[2] in ("validator_status_counts", "clusters") \
+                else sorted(days)
+            self.assertEqual(parameters["days"], expected)
+
+    def test_fast_days_keep_status_counts_and_clusters(self):
+        client = StubClickHouse()
+
+        collector.delete_replayed_days(client, "mainnet", [datetime.date(2025, 3, 1)], [])
+
+        tables = [command.split()[2] for command, _ in client.commands]
+        self.assertNotIn("validator_status_counts", tables)
+        self.assertNotIn("clusters", tables)
+        self.assertIn("performance_reconciled", tables)
+        # Past days keep their snapshot rows' attributes when rebuilt
+        self.assertNotIn("operator_daily_snapshot", tables)
+
+
+class RebuildOperatorDailySnapshotTest(unittest.TestCase):
+
+    def rebuild(self, latest, target_date, replace=True):
+        client = StubClickHouse([[(latest,)]])
+        collector.rebuild_operator_daily_snapshot(client, "mainnet", target_date, replace=replace)
+        return [command for command, _ in client.commands]
+
+    def test_current_day_uses_current_operator_attributes(self):
+        commands = self.rebuild(datetime.date(2025, 3, 1), datetime.date(2025, 3, 1))
+
+        self.assertEqual(len(commands), 2)
+        self.assertIn("DELETE", commands[0])
+        self.assertIn("FROM operators_current AS o", commands[1])
+
+    def test_past_day_keeps_its_recorded_attributes(self):
+        commands = self.rebuild(datetime.date(2025, 3, 5), datetime.date(2025, 3, 1))
+
+        self.assertEqual(len(commands), 1)
+        self.assertNotIn("operators_current", commands[0])
+        self.assertIn("FROM operator_daily_snapshot FINAL", commands[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import json
+import re
+import unittest
+from unittest import mock
+
+from support import StubClickHouse, load_collector
+
+collector = load_collector()
+
+
+##
+## Fake SSV API for the planner: `pages` operator pages, and validators whose
+## highest ID is `max_id` while the listing's total is far lower, as it is
+## once validators have been removed.
+##
+def fake_api(pages, max_id, total=1000):
+    def http_get_json(pool, path, timeout=30):
+        if "/operators?" in path:
+            return {"operators": [{"id": 1}], "pagination": {"pages": pages}}
+        match = re.search(r"lastId=(\d+)", path)
+        last_id = int(match.group(1)) if match else 0
+        validators = [{"id": last_id + 1}] if max_id > last_id else []
+        return {"validators": validators, "pagination": {"total": total}}
+    return http_get_json
+
+
+def plan(pages, max_id, ops_pages_per_unit=2, validators_per_unit=25000):
+    with mock.patch.object(collector, "http_get_json", fake_api(pages, max_id)):
+        return collector.plan_collection_units("mainnet", 100, 1000, ops_pages_per_unit, validators_per_unit)
+
+
+class PlanCollectionUnitsTest(unittest.TestCase):
+
+    def test_operator_pages_are_split_with_open_ended_last_unit(self):
+        units = plan(pages=5, max_id=10)
+        ops = [payload for _, kind, payload in units if kind == "operators"]
+
+        self.assertEqual([(p["first_page"], p["last_page"]) for p in ops], [(1, 2), (3, 4), (5, None)])
+
+    def test_validator_ranges_reach_the_highest_id_not_the_total(self):
+        units = plan(pages=1, max_id=103_000)
+        ranges = [(p["after_id"], p["until_id"]) for _, kind, p in units if kind == "validators"]
+
+        self.assertEqual(ranges, [
+            (None, 25000), (25000, 50000), (50000, 75000), (75000, 100000), (100000, None),
+        ])
+
+    def test_unit_ids_are_sequential(self):
+        units = plan(pages=3, max_id=60_000)
+
+        self.assertEqual([unit_id for unit_id, _, _ in units], list(range(len(units))))
+
+    def test_single_open_ended_validator_unit_when_api_fails(self):
+        with mock.patch.object(collector, "http_get_json", return_value=None):
+            units = collector.plan_collection_units("mainnet", 100, 1000, 2, 25000)
+
+        self.assertEqual([kind for _, kind, _ in units], ["operators", "validators"])
+        self.assertIsNone(units[0][2]["last_page"])
+        self.assertIsNone(units[1][2]["until_id"])
+
+
+class EstimateMaxValidatorIdTest(unittest.TestCase):
+
+    def test_bound_is_within_precision_of_the_highest_id(self):
+        for max_id in (0, 1, 999, 2500, 2501, 103_000, 1_234_567):
+            with self.subTest(max_id=max_id):
+                with mock.patch.object(collector, "http_get_json", fake_api(1, max_id)):
+                    bound = collector.estimate_max_validator_id("mainnet", 2500)
+
+                self.assertGreaterEqual(bound, max_id)
+                self.assertLessEqual(bound - max_id, 2500)
+
+
+class AssembleCollectionResultsTest(unittest.TestCase):
+
+    def test_merges_units_in_order(self):
+        units = [
+            (0, "operators", {}),
+            (1, "operators", {}),
+            (2, "validators", {}),
+            (3, "validators", {}),
+        ]
+        results = {
+            0: {"operators": [{"id": "1", "name": "a"}, {"id": 2, "name": "b"}]},
+            1: {"operators": [{"id": 3, "name": "c"}]},
+            2: {"validators": [["0xaa", "active", [1, 2]], ["0xbb", "pending_queued", [2, 3]]]},
+            3: {"validators": [["0xbb", "active", [2, 3]], ["0xcc", "exited", [1]]]},
+        }
+
+        operators, records = collector.assemble_collection_results(units, results)
+
+        self.assertEqual(sorted(operators), [1, 2, 3])
+        self.assertEqual(operators[1]["name"], "a")
+        self.assertEqual(records, {
+            "0xaa": ("active", (1, 2)),
+            "0xbb": ("active", (2, 3)),
+            "0xcc": ("exited", (1,)),
+        })
+
+
+class WaitForWorkUnitsTest(unittest.TestCase):
+
+    def test_polls_until_every_unit_has_a_result(self):
+        client = StubClickHouse([
+            [(1,)],
+            [(2,)],
+            [(0, json.dumps({"operators": []})), (1, json.dumps({"validators": []}))],
+        ])
+
+        results = collector.wait_for_work_units(client, "run", [0, 1], timeout_seconds=60, poll_seconds=0)
+
+        self.assertEqual(results, {0: {"operators": []}, 1: {"validators": []}})
+        self.assertEqual(len(client.queries), 3)
+        # Units finished twice resolve to their first result
+        self.assertIn("argMin(result, finished_at)", client.queries[-1][0])
+
+    def test_none_on_timeout(self):
+        client = StubClickHouse([[(1,)]])
+
+        self.assertIsNone(collector.wait_for_work_units(client, "run", [0, 1], timeout_seconds=0, poll_seconds=0))
+
+
+if __name__ == "__main__":
+    unittest.main()
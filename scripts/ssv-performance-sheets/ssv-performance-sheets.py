@@ -136,18 +136,19 @@ def get_operator_performance_data(network: str, days: int, metric_type: str,
             p.metric_date   AS metric_date,
             p.metric_value  AS metric_value,
             lc.validator_count AS validator_count
-        FROM operators AS o
+        FROM operators_current AS o
 
         LEFT JOIN (
             SELECT
                 network,
                 operator_id,
                 metric_date,
-                metric_value
-            FROM performance_daily
+                argMax(metric_value, updated_at) AS metric_value
+            FROM performance_reconciled
             WHERE network = %(network)s
                 AND metric_type = %(metric_type)s
                 AND metric_date BETWEEN date_from AND date_to
+            GROUP BY network, operator_id, metric_date
         ) AS p
         ON p.network = o.network
             AND p.operator_id = o.operator_id
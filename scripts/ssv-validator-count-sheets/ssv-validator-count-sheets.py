@@ -79,7 +79,7 @@ def get_operator_validator_count_data(network: str, days: int, clickhouse_passwo
             o.address         AS address,
             v.metric_date     AS metric_date,
             v.validator_count AS validator_count
-        FROM operators AS o
+        FROM operators_current AS o
 
         LEFT JOIN (
             SELECT
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import traceback
 
@@ -81,8 +82,8 @@ Thresholds displayed are subject to change.
     ##
     async def send_user_subscriptions(ctx, ephemeral, followup):
         try:
-            storage = StorageFactory.get_storage('ssv_performance')
-            subscriptions = storage.get_subscriptions_by_userid(network, ctx.author.id)
+            storage = StorageFactory.get_async_storage('ssv_performance')
+            subscriptions = await storage.get_subscriptions_by_userid(network, ctx.author.id)
             logging.debug(f"User subscriptions: {subscriptions}")
             message = create_subscriptions_message(subscriptions, ctx.author).strip()
             if message:
@@ -140,12 +141,12 @@ Thresholds displayed are subject to change.
             responded = True
 
         try:
-            storage = StorageFactory.get_storage('ssv_performance')
+            storage = StorageFactory.get_async_storage('ssv_performance')
 
             # Individually store user subscriptions
             for op_id in operator_ids:
                 logging.info(f"User {ctx.author.id} subscribing to {op_id} for {notification_type} notifications.")
-                storage.add_user_subscription(network, ctx.author.id, op_id, notification_type)
+                await storage.add_user_subscription(network, ctx.author.id, op_id, notification_type)
 
             # Notify user of updated status
             if not responded:
@@ -191,11 +192,11 @@ Thresholds displayed are subject to change.
         responded = False
 
         try:
-            storage = StorageFactory.get_storage('ssv_performance')
+            storage = StorageFactory.get_async_storage('ssv_performance')
 
             # Individually delete user subscriptions
             for op_id in operator_ids:
-                storage.del_user_subscription(network, ctx.author.id, op_id, notification_type)
+                await storage.del_user_subscription(network, ctx.author.id, op_id, notification_type)
 
             await ctx.respond("Your subscriptions have been updated.", ephemeral=False)
             responded = True
@@ -229,14 +230,34 @@ Thresholds displayed are subject to change.
             return
 
         try:
-            storage = StorageFactory.get_storage('ssv_performance')
-            perf_data = storage.get_performance_by_opids(network, operator_ids_list)
+            storage = StorageFactory.get_async_storage('ssv_performance')
+            perf_data = await storage.get_performance_by_opids(network, operator_ids_list)
 
             if not perf_data:
                 logging.info(f"operator() perf_data empty for {operator_ids} [077003]")
                 await ctx.respond("Performance data not available.", ephemeral=False)
                 return
 
+            # The per-operator extras are independent, so query them concurrently
+            op_ids = list(perf_data.keys())
+            rolling, status_counts, proposals, fees = await asyncio.gather(
+                storage.get_rolling_performance(network, op_ids),
+                storage.get_validator_status_counts(network, op_ids),
+                storage.get_block_proposals(network, op_ids),
+                storage.get_operator_fees(network, op_ids),
+            )
+
+            # Records are immutable, so attach the extras by replacing each one
+            for op_id, operator in perf_data.items():
+                fee, fee_changed_at = fees.get(op_id, (None, None))
+                perf_data[op_id] = operator.replace(
+                    fee=fee,
+                    fee_changed_at=fee_changed_at,
+                    rolling=rolling.get(op_id),
+                    status_counts=status_counts.get(op_id),
+                    block_proposals=proposals.get(op_id),
+                )
+
             await send_operator_performance_messages(perf_data, ctx, operator_ids_list)
         except Exception as e:
             logging.error(f"Error fetching operator performance: {e}", exc_info=True)
@@ -261,15 +282,20 @@ Thresholds displayed are subject to change.
         await ctx.defer()
 
         try:
-            storage = StorageFactory.get_storage('ssv_performance')
-            fee_data = storage.get_latest_fee_data(network)
+            storage = StorageFactory.get_async_storage('ssv_performance')
 
-            if not fee_data:
-                logging.error(f"Fee data empty in fees command")
-                await ctx.followup.send("Fee data not available.", ephemeral=True)
-                return
+            # Prefer the collector's precomputed summary; fall back to the latest fee state
+            operators = None
+            summaries = await storage.get_network_summary(network, 'fee')
+            if not summaries:
+                operators = await storage.get_latest_fee_data(network)
 
-            await respond_fee_messages(ctx, fee_data, extra_message=extra_message, availability=availability, verified=verified, num_segments=num_segments)
+                if not operators:
+                    logging.error(f"Fee data empty in fees command")
+                    await ctx.followup.send("Fee data not available.", ephemeral=True)
+                    return
+
+            await respond_fee_messages(ctx, operators, extra_message=extra_message, availability=availability, verified=verified, num_segments=num_segments, summaries=summaries)
 
         except Exception as e:
             logging.error(f"Error fetching fee information: {e}", exc_info=True)
@@ -293,15 +319,20 @@ Thresholds displayed are subject to change.
         await ctx.defer()
 
         try:
-            storage = StorageFactory.get_storage('ssv_performance')
-            operator_data = storage.get_operators_with_validator_counts(network)
+            storage = StorageFactory.get_async_storage('ssv_performance')
 
-            if not operator_data:
-                logging.error(f"Operator data empty in operators command")
-                await ctx.followup.send("Operator data not available.", ephemeral=True)
-                return
+            # Prefer the collector's precomputed summary; fall back to per-operator columns
+            operators = None
+            summaries = await storage.get_network_summary(network, 'validator_count')
+            if not summaries:
+                operators = await storage.get_operator_frame(network)
 
-            await respond_operator_messages(ctx, operator_data, availability=availability, verified=verified, extra_message=extra_message, num_segments=num_segments)
+                if not operators:
+                    logging.error(f"Operator data empty in operators command")
+                    await ctx.followup.send("Operator data not available.", ephemeral=True)
+                    return
+
+            await respond_operator_messages(ctx, operators, availability=availability, verified=verified, extra_message=extra_message, num_segments=num_segments, summaries=summaries)
 
         except Exception as e:
             logging.error(f"Error fetching operator information: {e}", exc_info=True)
@@ -322,15 +353,15 @@ Thresholds displayed are subject to change.
         await ctx.defer()
 
         try:
-            storage = StorageFactory.get_storage('ssv_performance')
-            perf_data = storage.get_latest_performance_data(network)
+            storage = StorageFactory.get_async_storage('ssv_performance')
+            operators = await storage.get_operator_frame(network)
 
-            if not perf_data:
-                logging.error(f"alerts() perf_data empty")
+            if not operators:
+                logging.error(f"alerts() operator data empty")
                 await ctx.followup.send("Performance data not available.", ephemeral=True)
                 return
 
-            await respond_vo_threshold_messages(ctx, perf_data, extra_message=extra_message)
+            await respond_vo_threshold_messages(ctx, operators, extra_message=extra_message)
 
         except Exception as e:
             logging.error(f"Error fetching alerts: {e}", exc_info=True)
@@ -351,15 +382,15 @@ Thresholds displayed are subject to change.
         await ctx.defer()
 
         try:
-            storage = StorageFactory.get_storage('ssv_performance')
-            perf_data = storage.get_latest_performance_data(network)
+            storage = StorageFactory.get_async_storage('ssv_performance')
+            operators = await storage.get_operator_frame(network)
 
-            if not perf_data:
-                logging.error(f"removed_operators() perf_data empty")
+            if not operators:
+                logging.error(f"removed_operators() operator data empty")
                 await ctx.followup.send("Performance data not available.", ephemeral=True)
                 return
 
-            await respond_removed_validators_messages(ctx, perf_data, extra_message=extra_message)
+            await respond_removed_validators_messages(ctx, operators, extra_message=extra_message)
 
         except Exception as e:
             logging.error(f"Error fetching removed operators: {e}", exc_info=True)
@@ -380,9 +411,9 @@ Thresholds displayed are subject to change.
         await ctx.defer()
 
         try:
-            storage = StorageFactory.get_storage('ssv_performance')
+            storage = StorageFactory.get_async_storage('ssv_performance')
 
-            latest_date = storage.get_latest_perf_data_date(network)
+            latest_date = await storage.get_latest_perf_data_date(network)
 
             hello = "Hello! This is SSV Performance Bot!"
             if latest_date:
@@ -1,124 +1,138 @@
-import math
-from typing import Callable, Iterable, List, Sequence, Tuple, TypeVar
+from typing import Tuple
 
-T = TypeVar("T")
+import numpy as np
 
-
-##
-## Computes the p-th percentile of a list of numbers using linear interpolation.
-## p is in the range [0, 1]
-##
-def _percentile_linear(xs: Sequence[float], p: float) -> float:
-    """0<=p<=1, linear interpolation between order statistics."""
-    if not xs:
-        raise ValueError("Empty data for percentile")
-    s = sorted(xs)
-    n = len(s)
-    if n == 1:
-        return s[0]
-    r = p * (n - 1)
-    lo = math.floor(r)
-    hi = math.ceil(r)
-    if lo == hi:
-        return s[lo]
-    frac = r - lo
-    return s[lo] * (1 - frac) + s[hi] * frac
+# Bucket indices from iqr_bucket_indices() for values outside the inlier buckets
+ZERO_BUCKET = -1
+OUTLIER_BUCKET = -2
+UNBUCKETED = -3
 
 
 ##
-## Splits a list of items into buckets based on their numeric values using the IQR method.
-## Also separates out zeros (if requested) and high outliers.
+## Assigns each value to an IQR bucket. Zeros (if treat_zero_separately) get
+## index ZERO_BUCKET and high outliers (value > Q3 + k*IQR) get OUTLIER_BUCKET;
+## the remaining inliers are split into num_buckets equal-width ranges.
+## Percentiles use linear interpolation between order statistics, as in the
+## collector's precomputed summaries.
+##
+## Returns: (indices, bucket_ranges) with indices an int array aligned with values
 ##
-def iqr_bucketize(
-    items: Iterable[T],
-    value_fn: Callable[[T], float] = lambda x: x[0],   # works for (value, obj)
+def iqr_bucket_indices(
+    values,
     num_buckets: int = 5,
     iqr_multiplier: float = 1.5,
     treat_zero_separately: bool = True,
 ):
-    """
-    Returns: (buckets, bucket_ranges, zero_count, outliers)
-
-    - buckets: List[List[item]] of inliers split into num_buckets ranges
-    - bucket_ranges: List[(lower: float, upper: float)]
-    - zero_count: int  (# of items with value == 0, if treat_zero_separately)
-    - outliers: List[item]  (items with value > Q3 + k*IQR)
-    """
-    items = list(items)
-    vals = [float(value_fn(it)) for it in items]
+    vals = np.asarray(values, dtype=np.float64)
+    indices = np.full(len(vals), UNBUCKETED, dtype=np.int64)
 
     # Split zeros (if requested)
+    non_zero = vals != 0 if treat_zero_separately else np.ones(len(vals), dtype=bool)
     if treat_zero_separately:
-        zero_mask = [v == 0 for v in vals]
-        zero_count = sum(zero_mask)
-        non_zero_items = [it for it, is_zero in zip(items, zero_mask) if not is_zero]
-        non_zero_vals  = [float(value_fn(it)) for it in non_zero_items]
-    else:
-        zero_count = 0
-        non_zero_items = items
-        non_zero_vals  = vals
+        indices[~non_zero] = ZERO_BUCKET
+    non_zero_vals = vals[non_zero]
 
-    if not non_zero_items:
+    if len(non_zero_vals) == 0:
         # Only zeros present
-        return [], [], zero_count, []
+        return indices, []
 
     # Small-sample fallback: 1 bucket spanning min..max (inliers only)
     if len(non_zero_vals) < 2:
-        mn = min(non_zero_vals)
-        mx = max(non_zero_vals)
-        return [non_zero_items], [(mn, mx)], zero_count, []
+        indices[non_zero] = 0
+        return indices, [(float(non_zero_vals.min()), float(non_zero_vals.max()))]
 
     # IQR-based high-outlier detection
-    q1 = _percentile_linear(non_zero_vals, 0.25)
-    q3 = _percentile_linear(non_zero_vals, 0.75)
-    iqr = q3 - q1
-    upper_bound = q3 + iqr_multiplier * max(iqr, 0.0)
+    q1, q3 = np.percentile(non_zero_vals, [25, 75])
+    upper_bound = q3 + iqr_multiplier * max(q3 - q1, 0.0)
 
-    inliers = [it for it in non_zero_items if 0 < float(value_fn(it)) <= upper_bound]
-    outliers = [it for it in non_zero_items if float(value_fn(it)) > upper_bound]
+    inlier = non_zero & (vals > 0) & (vals <= upper_bound)
+    outlier = non_zero & (vals > upper_bound)
 
     # Safety net: if everything got marked outlier, treat all as inliers
-    if not inliers:
-        inliers, outliers = non_zero_items, []
+    if not inlier.any():
+        inlier, outlier = non_zero, np.zeros(len(vals), dtype=bool)
+    indices[outlier] = OUTLIER_BUCKET
 
     # Bucket domain
-    inlier_vals = [float(value_fn(it)) for it in inliers]
-    if treat_zero_separately and zero_count > 0:
-        min_val = min(inlier_vals)  # zeros are counted separately
+    inlier_vals = vals[inlier]
+    if treat_zero_separately and not non_zero.all():
+        min_val = float(inlier_vals.min())  # zeros are counted separately
     else:
         # include smallest among all positives (inliers + outliers) for left edge
-        all_pos_vals = inlier_vals + [float(value_fn(it)) for it in outliers]
-        min_val = min(all_pos_vals) if all_pos_vals else min(inlier_vals)
-    max_val = max(inlier_vals)
+        min_val = float(vals[inlier | outlier].min())
+    max_val = float(inlier_vals.max())
 
     # Guard zero-width domain
     if max_val == min_val or num_buckets <= 1:
-        buckets = [list(inliers)]  # single bucket
-        bucket_ranges = [(min_val, max_val if max_val > min_val else min_val + 1.0)]
-        # Sanity check
-        assert zero_count + len(buckets[0]) + len(outliers) == len(items), \
-            "Mismatch in total counts"
-        return buckets, bucket_ranges, zero_count, outliers
-
-    # Build ranges
+        indices[inlier] = 0
+        return indices, [(min_val, max_val if max_val > min_val else min_val + 1.0)]
+
+    # Build ranges and assign inliers to buckets (clamp right-edge)
     bucket_size = (max_val - min_val) / float(num_buckets)
-    buckets: List[List[T]] = [[] for _ in range(num_buckets)]
-    bucket_ranges: List[Tuple[float, float]] = []
-    for i in range(num_buckets):
-        lower = min_val + i * bucket_size
-        upper = lower + bucket_size
-        bucket_ranges.append((lower, upper))
-
-    # Assign inliers to buckets (clamp right-edge)
-    for it in inliers:
-        v = float(value_fn(it))
-        idx = int((v - min_val) / bucket_size) if bucket_size > 0 else 0
-        if idx == num_buckets:
-            idx -= 1
-        buckets[idx].append(it)
-
-    # Sanity check: zeros + inliers + outliers equals all
-    assert zero_count + sum(len(b) for b in buckets) + len(outliers) == len(items), \
-        "Mismatch in total counts"
-
-    return buckets, bucket_ranges, zero_count, outliers
+    bucket_ranges = [(min_val + i * bucket_size, min_val + i * bucket_size + bucket_size) for i in range(num_buckets)]
+    indices[inlier] = np.minimum(((inlier_vals - min_val) / bucket_size).astype(np.int64), num_buckets - 1)
+
+    return indices, bucket_ranges
+
+
+##
+## Returns the summary facets an operator belongs to. Facet names match those
+## written by the collector into network_daily_summary.
+##
+def operator_facets(is_vo, is_private) -> Tuple[str, ...]:
+    vo = "vo" if is_vo else "non_vo"
+    availability = "private" if is_private else "public"
+    return ("all", vo, availability, f"{availability}_{vo}")
+
+
+##
+## Summarizes one numeric column of an OperatorFrame (values aligned with the
+## frame's rows, no NaNs) into the same shape as a network_daily_summary row,
+## so summaries computed on the fly and summaries precomputed by the
+## collector render identically.
+##
+def summarize_columns(values, frame, num_buckets: int = 10, iqr_multiplier: float = 1.5) -> dict:
+    values = np.asarray(values, dtype=np.float64)
+
+    lowest = float(values.min())
+    highest = float(values.max())
+    lowest_rows = np.flatnonzero(values == lowest)
+    highest_rows = np.flatnonzero(values == highest)
+    # Rows are in operator ID order; like the collector, show the lowest ID among ties
+    lowest_example = frame.record(lowest_rows[0])
+    highest_example = frame.record(highest_rows[0])
+
+    indices, bucket_ranges = iqr_bucket_indices(
+        values,
+        num_buckets=num_buckets,
+        iqr_multiplier=iqr_multiplier,
+        treat_zero_separately=True
+    )
+    outlier_values = values[indices == OUTLIER_BUCKET]
+    bucket_counts = np.bincount(indices[indices >= 0], minlength=len(bucket_ranges))
+
+    return {
+        "operator_count": len(values),
+        "vo_count": int(np.count_nonzero(frame.is_vo)),
+        "private_count": int(np.count_nonzero(frame.is_private)),
+        "public_vo_count": int(np.count_nonzero(frame.is_vo & ~frame.is_private)),
+        "zero_count": int(np.count_nonzero(indices == ZERO_BUCKET)),
+        "mean_value": float(values.mean()),
+        "median_value": float(np.median(values)),
+        "min_value": lowest,
+        "min_operator_id": lowest_example.operator_id,
+        "min_operator_name": lowest_example.name,
+        "min_operator_validators": lowest_example.validator_count,
+        "min_operator_ties": len(lowest_rows),
+        "max_value": highest,
+        "max_operator_id": highest_example.operator_id,
+        "max_operator_name": highest_example.name,
+        "max_operator_validators": highest_example.validator_count,
+        "max_operator_ties": len(highest_rows),
+        "bucket_lower": [lower for lower, _ in bucket_ranges],
+        "bucket_upper": [upper for _, upper in bucket_ranges],
+        "bucket_counts": bucket_counts.tolist(),
+        "outlier_count": len(outlier_values),
+        "outlier_min": float(outlier_values.min()) if len(outlier_values) else None,
+        "outlier_max": float(outlier_values.max()) if len(outlier_values) else None,
+    }
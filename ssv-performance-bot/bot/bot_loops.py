@@ -69,24 +69,32 @@ class LoopTasks:
         logging.info(f"Sending daily direct messages: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
         try:
-            storage = StorageFactory.get_storage('ssv_performance')
+            storage = StorageFactory.get_async_storage('ssv_performance')
 
             # Get list of subscriptions for daily messages
-            subscriptions = storage.get_subscriptions_by_type(self.network, 'daily')
+            subscriptions = await storage.get_subscriptions_by_type(self.network, 'daily')
             if not subscriptions:
                 logging.warning("Subscription data empty in daily_notification_task()")
                 return
 
             # Query for performance data for all subscribed operator IDs
             op_ids = list(subscriptions.keys())
-            perf_data = storage.get_performance_by_opids(self.network, op_ids)
+            perf_data = await storage.get_performance_by_opids(self.network, op_ids)
             if not perf_data:
                 logging.warning(f"Performance data empty for {op_ids} in daily_notification_task()")
                 return
 
+            # Attach validator status transitions (slashings, exits) since the last run
+            status_events = await storage.get_validator_status_events(self.network, op_ids)
+            for op_id, op_events in status_events.items():
+                if op_id in perf_data:
+                    perf_data[op_id] = perf_data[op_id].replace(status_events=op_events)
+
             # Send out the daily direct messages to subscribed users
             await send_daily_direct_messages(self.bot, perf_data, subscriptions, self.dm_recipients)
 
+            logging.info(f"ClickHouse pool and cache usage: {await storage.get_pool_stats()}")
+
         except Exception as e:
             logging.error(f"{type(e).__name__} exception in daily_notification_task(): {e}", exc_info=True)
 
@@ -99,16 +107,16 @@ class LoopTasks:
         logging.info(f"Sending alert message to channel: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
         try:
-            storage = StorageFactory.get_storage('ssv_performance')
+            storage = StorageFactory.get_async_storage('ssv_performance')
 
-            # Get latest performance data for all operators
-            perf_data = storage.get_latest_performance_data(self.network)
-            if not perf_data:
+            # Get latest performance data for all operators, column-oriented
+            operators = await storage.get_operator_frame(self.network)
+            if not operators:
                 logging.warning("Performance data unavailable.")
                 return
 
             # Get list of subscriptions for alert messages so we can mention users
-            subscriptions = storage.get_subscriptions_by_type(self.network, 'alerts')
+            subscriptions = await storage.get_subscriptions_by_type(self.network, 'alerts')
             if not subscriptions:
                 logging.warning("Subscription data unavailable.")
 
@@ -118,7 +126,7 @@ class LoopTasks:
                 mention_periods.append('30d')
 
             # Send alerts messages and mentions to the channel
-            await send_vo_threshold_messages(self.channel, perf_data, extra_message=self.extra_message,
+            await send_vo_threshold_messages(self.channel, operators, extra_message=self.extra_message,
                                              subscriptions=subscriptions, mention_periods=mention_periods,
                                              include_removed=False)
         except Exception as e:
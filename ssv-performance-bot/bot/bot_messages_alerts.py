@@ -1,127 +1,71 @@
+import logging
 from collections import defaultdict
 from datetime import date, datetime, timezone
 
+import numpy as np
+
 from bot.bot_mentions import create_subscriber_mentions, mention_role
 from bot.bot_messages import bundle_messages
-from bot.bot_operator_threshold_alerts import *
 from common.config import *
 
 
 ##
-## Compare operator performance against one or more 24h thresholds and return
-## a list of affected operators and formatted alert messages. Also returns
-## a dict of apparently removed operators with active validators that 
-## also triggered alerts. Removed operators are displayed separately.
+## Rows of the operators frame that can trigger performance alerts: verified
+## operators with active validators that have not been removed.
 ##
-def create_alerts_24h(perf_data):
-    thresholds_24h = sorted(ALERTS_THRESHOLDS_24H, reverse=True)
-    alert_msgs_24h = {threshold: [] for threshold in thresholds_24h}
-    operator_ids = []
-
-    logging.debug(f"Creating 24h alerts for {len(perf_data)} operators")
-
-    for op_id, operator in perf_data.items():
-
-        if not operator[FIELD_IS_VO]:
-            continue
-
-        validator_count = operator[FIELD_VALIDATOR_COUNT]
-        if validator_count is None:
-            continue
-
-        try:
-            validator_count_int = int(validator_count)
-        except (TypeError, ValueError):
-            logging.debug(f"Operator {op_id} validator count not numeric: {validator_count}")
-            continue
-
-        if validator_count_int <= 0:
-            continue
-
-        if operator.get(FIELD_OPERATOR_REMOVED):
-            continue
-
-        for threshold in thresholds_24h:
-            alert_list = alert_msgs_24h[threshold]
-            result = operator_threshold_alert_24h(operator, threshold)
-            if result and validator_count_int > 0:
-                operator_ids.append(result[FIELD_OPERATOR_ID])
-                performance_str = "N/A" if result['Performance Data Point'] is None else f"{result['Performance Data Point']}"
-                alert = f"- {result[FIELD_OPERATOR_NAME]} - {performance_str}    (ID: {result[FIELD_OPERATOR_ID]}, Validators: {validator_count_int})"
-                alert_list.append(alert)
-
-    return operator_ids, alert_msgs_24h
+def alert_candidates(operators):
+    return operators.is_vo & (operators.validator_count > 0) & ~operators.removed
 
 
 ##
-## Get an icon representing whether 30d performance is trending up, down or flat
-## based on 24h performance vs 30d performance.
+## Compare operator performance in one period against one or more thresholds
+## and return a list of affected operator IDs and formatted alert messages per
+## threshold. An operator below several thresholds is listed under each.
+## Removed operators are displayed separately.
 ##
-def get_30d_trend_icon(operator):
-    perf_points = operator.get(FIELD_PERFORMANCE, {}) or {}
-    perf_24h = perf_points.get('24h')
-    perf_30d = perf_points.get('30d')
-
-    try:
-        if perf_24h is None or perf_30d is None:
-            return ''
-        perf_24h = float(perf_24h)
-        perf_30d = float(perf_30d)
-    except (TypeError, ValueError):
-        return ''
-
-    if perf_24h > perf_30d:
-        return " ↗︎"  
-    if perf_24h < perf_30d:
-        return " ↘︎"  
-    return " →" 
-
-
-##
-## Compare operator performance against one or more 30d thresholds and return
-## a list of affected operators and formatted alert messages. Also returns
-## a dict of apparently removed operators with active validators that 
-## also triggered alerts. Removed operators are displayed separately.
-##
-def create_alerts_30d(perf_data):
-    thresholds_30d = sorted(ALERTS_THRESHOLDS_30D, reverse=True)
-    alert_msgs_30d = {threshold: [] for threshold in thresholds_30d}
+def create_threshold_alerts(operators, perf, thresholds, suffixes=None):
+    alert_msgs = {threshold: [] for threshold in thresholds}
     operator_ids = []
 
-    for op_id, operator in perf_data.items():
+    # NaN (no data point) never compares below a threshold
+    candidates = alert_candidates(operators)
 
-        if not operator[FIELD_IS_VO]:
-            continue
+    for threshold in thresholds:
+        rows = np.flatnonzero(candidates & (perf < threshold))
+        operator_ids.extend(operators.operator_id[rows].tolist())
+        for i in rows.tolist():
+            suffix = suffixes[i] if suffixes is not None else ''
+            alert_msgs[threshold].append(
+                f"- {operators.name[i]} - {perf[i] * 100:.2f}%{suffix}    "
+                f"(ID: {operators.operator_id[i]}, Validators: {int(operators.validator_count[i])})"
+            )
 
-        validator_count = operator[FIELD_VALIDATOR_COUNT]
-        if validator_count is None:
-            continue
+    return operator_ids, alert_msgs
 
-        try:
-            validator_count_int = int(validator_count)
-        except (TypeError, ValueError):
-            logging.debug(f"Operator {op_id} validator count not numeric: {validator_count}")
-            continue
 
-        if validator_count_int <= 0:
-            continue
+def create_alerts_24h(operators):
+    logging.debug(f"Creating 24h alerts for {len(operators)} operators")
+    return create_threshold_alerts(operators, operators.perf_24h, sorted(ALERTS_THRESHOLDS_24H, reverse=True))
 
-        if operator.get(FIELD_OPERATOR_REMOVED):
-            continue
 
-        trend_icon = get_30d_trend_icon(operator)
+##
+## Get icons representing whether 30d performance is trending up, down or flat
+## based on 24h performance vs 30d performance, one per operator ('' when
+## either value is missing).
+##
+def get_30d_trend_icons(operators):
+    perf_24h = operators.perf_24h
+    perf_30d = operators.perf_30d
+    return np.select(
+        [np.isnan(perf_24h) | np.isnan(perf_30d), perf_24h > perf_30d, perf_24h < perf_30d],
+        ['', " ↗︎", " ↘︎"],
+        default=" →",
+    )
 
-        for threshold in thresholds_30d:
-            alert_list = alert_msgs_30d[threshold]
-            result = operator_threshold_alert_30d(operator, threshold)
-            if result and validator_count_int > 0:
-                operator_ids.append(result[FIELD_OPERATOR_ID])
-                performance_str = "N/A" if result['Performance Data Point'] is None else f"{result['Performance Data Point']}"
-                performance_display = f"{performance_str}{trend_icon}" if trend_icon else performance_str
-                alert = f"- {result[FIELD_OPERATOR_NAME]} - {performance_display}    (ID: {result[FIELD_OPERATOR_ID]}, Validators: {validator_count_int})"
-                alert_list.append(alert)
 
-    return operator_ids, alert_msgs_30d
+def create_alerts_30d(operators):
+    return create_threshold_alerts(operators, operators.perf_30d, sorted(ALERTS_THRESHOLDS_30D, reverse=True),
+                                   suffixes=get_30d_trend_icons(operators))
 
 
 ##
@@ -141,39 +85,19 @@ def compile_alert_threshold_groups(alerts, period_label):
     return messages
 
 
-##
-## Safely convert a value to int, returning None if conversion fails.
-##
-def _as_int(value):
-    try:
-        return int(value)
-    except (TypeError, ValueError):
-        return None
-
-
 ##
 ## Build messages for removed operators that triggered alerts and bundle them.
 ##
-def build_removed_operator_messages(removed_operator_ids, perf_data: dict) -> list[str]:
-    if not removed_operator_ids:
+def build_removed_operator_messages(operators) -> list[str]:
+    removed = operators.filter(operators.removed)
+    if not len(removed):
         logging.debug("No removed operators triggered alerts.")
         return []
 
-    sorted_removed = sorted(removed_operator_ids)
-
-    removed_lines = []
-    for op_id in sorted_removed:
-        operator = perf_data.get(op_id)
-        if not operator:
-            continue
-
-        validator_count = operator.get(FIELD_VALIDATOR_COUNT)
-        validator_count_int = _as_int(validator_count)
-        validator_display = validator_count if validator_count_int is None else validator_count_int
-        removed_lines.append(f"- {operator[FIELD_OPERATOR_NAME]} (ID: {op_id}, Validators: {validator_display})")
-
-    if not removed_lines:
-        return []
+    removed_lines = [
+        f"- {removed.name[i]} (ID: {removed.operator_id[i]}, Validators: {int(removed.validator_count[i])})"
+        for i in range(len(removed))
+    ]
 
     removed_section = ["\n**__Removed Operators with Active Validators__**"] + removed_lines
     return bundle_messages(removed_section)
@@ -186,39 +110,34 @@ def build_removed_operator_messages(removed_operator_ids, perf_data: dict) -> li
 ## many days so a missed daily post doesn't cause the notification to be
 ## lost entirely. Title and footnote pluralize based on count.
 ##
-def build_recently_removed_operator_messages(perf_data: dict, today: date | None = None) -> list[str]:
+def build_recently_removed_operator_messages(operators, today: date | None = None) -> list[str]:
     if today is None:
         today = datetime.now(timezone.utc).date()
 
     window = VO_RECENTLY_REMOVED_DAYS
-    removed = []
-    for op_id, data in perf_data.items():
-        demoted_at = data.get(FIELD_VO_DEMOTED_AT)
-        if demoted_at is None:
-            continue
-        days_since = (today - demoted_at).days
-        if 0 <= days_since < window:
-            removed.append((op_id, data, demoted_at))
-
-    if not removed:
+    demoted_at = operators.vo_demoted_at
+    days_since = (np.datetime64(today, 'D') - demoted_at).astype(np.int64)
+    rows = np.flatnonzero(~np.isnat(demoted_at) & (days_since >= 0) & (days_since < window))
+
+    if not len(rows):
         return []
 
-    # Most recent demotions first, ties broken by operator ID.
-    removed.sort(key=lambda x: (-x[2].toordinal(), x[0]))
+    # Most recent demotions first, ties broken by operator ID (rows are in ID order).
+    rows = rows[np.argsort(days_since[rows], kind='stable')]
 
-    count = len(removed)
+    count = len(rows)
     title_noun = "Operator" if count == 1 else "Operators"
     subject = "This operator's record has" if count == 1 else "These operators' records have"
 
     lines = [f"\n**__Recently Removed Verified {title_noun}__**"]
-    for op_id, data, demoted_at in removed:
-        validator_count = _as_int(data.get(FIELD_VALIDATOR_COUNT))
+    for i in rows.tolist():
+        validator_count = operators.validator_count[i]
         validator_suffix = (
-            f", Validators: {validator_count}" if validator_count and validator_count > 0 else ""
+            f", Validators: {int(validator_count)}" if validator_count > 0 else ""
         )
         lines.append(
-            f"- {data.get(FIELD_OPERATOR_NAME, '')} "
-            f"(ID: {op_id}, Removed: {demoted_at.isoformat()}{validator_suffix})"
+            f"- {operators.name[i]} "
+            f"(ID: {operators.operator_id[i]}, Removed: {demoted_at[i]}{validator_suffix})"
         )
     lines.append(
         f"-# {subject} not been updated in the SSV API for at least "
@@ -232,13 +151,13 @@ def build_recently_removed_operator_messages(perf_data: dict, today: date | None
 ## Compile alerts, mentions and any extra message into a single set of separate messages to be sent to Discord.
 ## This attempts to push everything into as few messages as possible to not bomb Discord with excessive messages.
 ##
-def compile_vo_threshold_messages(perf_data, extra_message=None, subscriptions=None, guild=None, dm_recipients=[], mention_periods=[], include_removed=True):
+def compile_vo_threshold_messages(operators, extra_message=None, subscriptions=None, guild=None, dm_recipients=[], mention_periods=[], include_removed=True):
 
     # Get list of operators and alert messages for each period.
-    operator_ids_24h, alerts_24h = create_alerts_24h(perf_data)
-    operator_ids_30d, alerts_30d = create_alerts_30d(perf_data)
+    operator_ids_24h, alerts_24h = create_alerts_24h(operators)
+    operator_ids_30d, alerts_30d = create_alerts_30d(operators)
 
-    removed_operator_ids = [op_id for op_id, data in perf_data.items() if data.get(FIELD_OPERATOR_REMOVED)]
+    removed_operator_ids = operators.operator_id[operators.removed].tolist()
 
     messages = []
 
@@ -257,7 +176,7 @@ def compile_vo_threshold_messages(perf_data, extra_message=None, subscriptions=N
     # Create messages for removed operators that triggered alerts
     mentions_removed = []
     if include_removed:
-        removed_bundles = build_removed_operator_messages(removed_operator_ids, perf_data)
+        removed_bundles = build_removed_operator_messages(operators)
         messages.extend(removed_bundles)
 
         if subscriptions and guild and 'removed' in mention_periods:
@@ -265,7 +184,7 @@ def compile_vo_threshold_messages(perf_data, extra_message=None, subscriptions=N
 
     # Operators whose verified status was removed by the collector sweep
     # within the last VO_RECENTLY_REMOVED_DAYS.
-    recently_removed_msgs = build_recently_removed_operator_messages(perf_data)
+    recently_removed_msgs = build_recently_removed_operator_messages(operators)
     messages.extend(recently_removed_msgs)
 
     role_mention = ''
@@ -299,14 +218,14 @@ def compile_vo_threshold_messages(perf_data, extra_message=None, subscriptions=N
 ## users subscribed to operators that triggered alerts. Used for the 
 ## periodic alert messages sent to a channel by the bot loop.
 ##
-async def send_vo_threshold_messages(channel, perf_data, extra_message=None, subscriptions=None, dm_recipients=[], mention_periods=[], include_removed=True):
+async def send_vo_threshold_messages(channel, operators, extra_message=None, subscriptions=None, dm_recipients=[], mention_periods=[], include_removed=True):
 
     try:
         # Only attempt @mentions if we have a guild to query and subscription info
         if channel and hasattr(channel, 'guild') and subscriptions:
-            messages = compile_vo_threshold_messages(perf_data, extra_message=extra_message, subscriptions=subscriptions, guild=channel.guild, dm_recipients=dm_recipients, mention_periods=mention_periods, include_removed=include_removed)
+            messages = compile_vo_threshold_messages(operators, extra_message=extra_message, subscriptions=subscriptions, guild=channel.guild, dm_recipients=dm_recipients, mention_periods=mention_periods, include_removed=include_removed)
         else:
-            messages = compile_vo_threshold_messages(perf_data, extra_message=extra_message, dm_recipients=dm_recipients, include_removed=include_removed)
+            messages = compile_vo_threshold_messages(operators, extra_message=extra_message, dm_recipients=dm_recipients, include_removed=include_removed)
 
         if messages:
             for message in messages:
@@ -323,10 +242,9 @@ async def send_vo_threshold_messages(channel, perf_data, extra_message=None, sub
 ## Compile messages listing removed operators with active validators.
 ## Used by the /removed-validators slash command.
 ##
-def compile_removed_validators_messages(perf_data, extra_message=None):
+def compile_removed_validators_messages(operators, extra_message=None):
 
-    removed_operator_ids = [op_id for op_id, data in perf_data.items() if data.get(FIELD_OPERATOR_REMOVED)]
-    messages = build_removed_operator_messages(removed_operator_ids, perf_data)
+    messages = build_removed_operator_messages(operators)
 
     # Include an extra message, if configured
     if extra_message and len(extra_message) > 0:
@@ -340,10 +258,10 @@ def compile_removed_validators_messages(perf_data, extra_message=None):
 ## Assumption is that ctx.defer() was previously called to allow time
 ## for processing.
 ##
-async def respond_removed_validators_messages(ctx, perf_data, extra_message=None):
+async def respond_removed_validators_messages(ctx, operators, extra_message=None):
 
     try:
-        messages = compile_removed_validators_messages(perf_data, extra_message=extra_message)
+        messages = compile_removed_validators_messages(operators, extra_message=extra_message)
 
         if messages:
             for message in messages:
@@ -360,14 +278,14 @@ async def respond_removed_validators_messages(ctx, perf_data, extra_message=None
 ## Assumption is that ctx.defer() was previously called to allow time
 ## for processing.
 ##
-async def respond_vo_threshold_messages(ctx, perf_data, extra_message=None):
+async def respond_vo_threshold_messages(ctx, operators, extra_message=None):
 
     try:
         # Pass guild so the Recently Removed Verified Operator(s) committee
         # role mention still fires from the slash command. Subscriptions and
         # mention_periods remain unset, so per-user @-mentions don't re-ping.
         guild = getattr(ctx, 'guild', None)
-        messages = compile_vo_threshold_messages(perf_data, extra_message=extra_message, guild=guild)
+        messages = compile_vo_threshold_messages(operators, extra_message=extra_message, guild=guild)
 
         if messages:
             for message in messages:
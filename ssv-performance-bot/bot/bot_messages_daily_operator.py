@@ -1,33 +1,53 @@
+import logging
+
 import discord
 
-from bot.bot_operator_threshold_alerts import *
 from bot.bot_messages import bundle_messages
-from common.config import *
 
 
 # Creates a message bullet item for a single period performance data point
-def get_latest_performance(period, operator, attribute):
+def get_latest_performance(period, series):
 
     try:
-        if not operator.get(attribute):
+        latest = series.latest if series else None
+        if latest is None or not latest.value:
             return f"- {period}: {period} performance data is not available"
 
-        most_recent_date = max(operator[attribute].keys())
-        most_recent_performance = operator[attribute][most_recent_date]
-
-        return f"- {period}: {most_recent_performance * 100:.2f}%" if most_recent_performance else f"- {period}: {period} performance data is not available"
+        return f"- {period}: {latest.value * 100:.2f}%"
     except Exception as e:
         logging.error(f"Exception in get_latest_performance(): {e}", exc_info=True)
         return f"- {period}: {period} performance data is not available"
 
 
+# Validator status event types reported in daily messages, most urgent first
+STATUS_EVENT_LABELS = [
+    ('slashed', 'slashed'),
+    ('exit_initiated', 'started exiting'),
+    ('exited', 'exited'),
+    ('activated', 'activated'),
+]
+
+
+# Creates a message bullet item summarizing validator status transitions
+# since the last collector run, or an empty string if there were none
+def get_status_events(operator):
+    events = operator.status_events or {}
+    parts = [f"{events[event_type]} {label}" for event_type, label in STATUS_EVENT_LABELS if events.get(event_type)]
+    if not parts:
+        return ""
+
+    prefix = ":rotating_light: " if events.get('slashed') else ""
+    return f"\n- {prefix}Validators: {', '.join(parts)}"
+
+
 # Create a performance message for a single operator
 def create_daily_operator_message(operator):
-    message = f"\n**__{operator[FIELD_OPERATOR_NAME]} (ID: {operator[FIELD_OPERATOR_ID]}, Validators: {operator[FIELD_VALIDATOR_COUNT]})__**\n"
+    message = f"\n**__{operator.name} (ID: {operator.operator_id}, Validators: {operator.validator_count})__**\n"
 
-    message += get_latest_performance("24h", operator, FIELD_PERF_DATA_24H)
+    message += get_latest_performance("24h", operator.series_24h)
     message += "\n"
-    message += get_latest_performance("30d", operator, FIELD_PERF_DATA_30D)
+    message += get_latest_performance("30d", operator.series_30d)
+    message += get_status_events(operator)
 
     return message
 
@@ -1,75 +1,68 @@
-import statistics
-import random
+import logging
 
-from bot.bot_visualizations import render_bucket_lines
-from bot.bot_data_processing import iqr_bucketize
+import numpy as np
+
+from bot.bot_visualizations import render_bucket_count_lines
+from bot.bot_data_processing import summarize_columns
 from bot.bot_messages import bundle_messages
-from common.config import *
 
 
 ##
-## Generate summary text for a set of operator fees.
+## Generate summary text for a set of operator fees (an array aligned with the
+## rows of the operators frame).
 ##  - num_buckets: Number of buckets to create for the IQR bucketization.
 ##  - iqr_multiplier: Multiplier to apply to the IQR to determine outlier thresholds.
 ##  - num_segments: Maximum number of segments to use in the bar chart rendering. More
 ##    segments means the chart will be wider on screen.
 ##
-def generate_summary_text(label, fees, num_buckets=5, iqr_multiplier=1.5, num_segments=20):
-    if not fees:
+def generate_summary_text(label, fees, operators, num_buckets=5, iqr_multiplier=1.5, num_segments=20):
+    if len(fees) == 0:
         return [f"No {label} operators found."]
 
-    values = [f[0] for f in fees]
-
-    sorted_fees = sorted(fees, key=lambda x: x[0])
+    summary = summarize_columns(fees, operators, num_buckets=num_buckets, iqr_multiplier=iqr_multiplier)
+    return render_summary_text(label, summary, num_segments=num_segments)
 
-    lowest = sorted_fees[0]
-    lowest_fee = lowest[0]
-    lowest_operators = [op for fee, op in fees if fee == lowest_fee]
-    highest = sorted_fees[-1]
 
-    count = len(values)
-
-    mean = statistics.mean(values)
-    median = statistics.median(values)        
+##
+## Render summary text for a fee summary, either computed by summarize_columns()
+## or read from the collector's precomputed network_daily_summary rows.
+##
+def render_summary_text(label, summary, num_segments=20):
+    if not summary:
+        return [f"No {label} operators found."]
 
-    # Get data buckets
-    buckets, bucket_ranges, zero_count, outliers = iqr_bucketize(
-        fees,
-        value_fn=lambda it: it[0],        
-        num_buckets=num_buckets,
-        iqr_multiplier=iqr_multiplier,
-        treat_zero_separately=True
-    )
+    mean = summary["mean_value"]
+    median = summary["median_value"]
+    lowest_fee = summary["min_value"]
+    lowest_ties = summary["min_operator_ties"]
 
     # Begin rendering text
 
     lines = [
         f"**{label} Operators (SSV/year)**",
-        f"*{count} operators*",
+        f"*{summary['operator_count']} operators*",
         f"- Mean Fee: {mean:.2f}",
         f"- Median Fee: {median:.2f}",
     ]
 
-    if len(lowest_operators) == 1:
-        op = lowest_operators[0]
-        lines.append(
-            f"- Lowest Fee: {lowest_fee:.2f} - {op[FIELD_OPERATOR_NAME]} (ID: {op[FIELD_OPERATOR_ID]}, Validators: {op[FIELD_VALIDATOR_COUNT]})"
-        )
+    lowest_op = f"{summary['min_operator_name']} (ID: {summary['min_operator_id']}, Validators: {summary['min_operator_validators']})"
+    if lowest_ties == 1:
+        lines.append(f"- Lowest Fee: {lowest_fee:.2f} - {lowest_op}")
     else:
-        example_op = random.choice(lowest_operators)
-        lines.append(f"- Lowest Fee: {lowest_fee:.2f} - {example_op[FIELD_OPERATOR_NAME]} (ID: {example_op[FIELD_OPERATOR_ID]}, Validators: {example_op[FIELD_VALIDATOR_COUNT]}) and {len(lowest_operators)-1} other operator(s)")
+        lines.append(f"- Lowest Fee: {lowest_fee:.2f} - {lowest_op} and {lowest_ties-1} other operator(s)")
 
     lines.append(
-        f"- Highest Fee: {highest[0]:.2f} - {highest[1][FIELD_OPERATOR_NAME]} "
-        f"(ID: {highest[1][FIELD_OPERATOR_ID]}, Validators: {highest[1][FIELD_VALIDATOR_COUNT]})"
+        f"- Highest Fee: {summary['max_value']:.2f} - {summary['max_operator_name']} "
+        f"(ID: {summary['max_operator_id']}, Validators: {summary['max_operator_validators']})"
     )
 
     # Generate chart
-    bucket_lines = render_bucket_lines(
-        buckets_with_ranges=[(bucket, lower, upper) for bucket, (lower, upper) in zip(buckets, bucket_ranges)],
-        zero_count=zero_count,
-        outliers=outliers,
-        fees=fees,
+    bucket_lines = render_bucket_count_lines(
+        bucket_counts_with_ranges=list(zip(summary["bucket_counts"], summary["bucket_lower"], summary["bucket_upper"])),
+        zero_count=summary["zero_count"],
+        outlier_count=summary["outlier_count"],
+        outlier_min=summary["outlier_min"],
+        outlier_max=summary["outlier_max"],
         max_segments=num_segments,
         mean=mean,
         median=median
@@ -81,71 +74,61 @@ def generate_summary_text(label, fees, num_buckets=5, iqr_multiplier=1.5, num_se
 
 
 ##
-## Compile multiple messages to display fee details for operators.
+## Returns the (label, facet, iqr_multiplier, num_buckets) summaries to display
+## for the requested availability and verified filters.
 ##
-def compile_fee_messages(fee_data, extra_message=None, availability="public", verified="all", num_segments=20):
-    messages = []
-
-    public_fees = []
-    private_fees = []
-
-    public_vo_fees = []
-    public_non_vo_fees = []
-    private_vo_fees = []
-    private_non_vo_fees = []
-
-    all_fees = []
-
-    # Collect fees into appropriate lists by public/private and VO status
-    for operator in fee_data.values():
-        fee = operator.get(FIELD_OPERATOR_FEE)
-        is_private = operator.get(FIELD_IS_PRIVATE)
-        is_vo = operator.get(FIELD_IS_VO)
-        if fee is None:
-            continue
-
-        item = (fee, operator)
-
-        all_fees.append(item)
-
-        if is_private:
-            private_fees.append(item)
-            if is_vo:
-                private_vo_fees.append(item)
-            else:
-                private_non_vo_fees.append(item)
-        else:
-            public_fees.append(item)
-            if is_vo:
-                public_vo_fees.append(item)
-            else:
-                public_non_vo_fees.append(item)
+def fee_summary_sections(availability="public", verified="all"):
+    sections = []
 
     # Summary of all operators
     if availability == "all" and verified == "all":
-        messages.extend(generate_summary_text("All", all_fees, iqr_multiplier=1.5, num_buckets=10, num_segments=num_segments))
+        sections.append(("All", "all", 1.5, 10))
 
     # Public breakdown
     # Note: Specifying "all" will print "all public" summary as well as verified/unverified breakdowns
     # Remove "all" from "in" checks to avoid additional summaries
     if availability in ("public"):
         if verified == "all":
-            messages.extend(generate_summary_text("All Public", public_fees, iqr_multiplier=1.5, num_buckets=10, num_segments=num_segments))
+            sections.append(("All Public", "public", 1.5, 10))
         if verified in ("all", "verified"):
-            messages.extend(generate_summary_text("Public Verified", public_vo_fees, iqr_multiplier=1.5, num_buckets=10, num_segments=num_segments))
+            sections.append(("Public Verified", "public_vo", 1.5, 10))
         if verified in ("all", "unverified"):
-            messages.extend(generate_summary_text("Public Unverified", public_non_vo_fees, iqr_multiplier=1.5, num_buckets=10, num_segments=num_segments))
- 
+            sections.append(("Public Unverified", "public_non_vo", 1.5, 10))
+
     # Private breakdown
     # Note: Specifying "all" will print "all private" summary as well as verified/unverified breakdowns
     # Remove "all" from "in" checks to avoid additional summaries
     if availability in ("private"):
         if verified == "all":
-            messages.extend(generate_summary_text("All Private", private_fees, iqr_multiplier=2.5, num_buckets=5, num_segments=num_segments))
+            sections.append(("All Private", "private", 2.5, 5))
         if verified in ("all", "verified"):
-            messages.extend(generate_summary_text("Private Verified", private_vo_fees, iqr_multiplier=2.5, num_buckets=5, num_segments=num_segments))
+            sections.append(("Private Verified", "private_vo", 2.5, 5))
         if verified in ("all", "unverified"):
-            messages.extend(generate_summary_text("Private Unverified", private_non_vo_fees, iqr_multiplier=2.5, num_buckets=5, num_segments=num_segments))
+            sections.append(("Private Unverified", "private_non_vo", 2.5, 5))
+
+    return sections
+
+
+##
+## Compile multiple messages to display fee details for operators. When
+## precomputed summaries (keyed by facet) are provided, the operators frame
+## is not needed.
+##
+def compile_fee_messages(operators, extra_message=None, availability="public", verified="all", num_segments=20, summaries=None):
+    messages = []
+
+    sections = fee_summary_sections(availability=availability, verified=verified)
+
+    if summaries:
+        for label, facet, _, _ in sections:
+            messages.extend(render_summary_text(label, summaries.get(facet), num_segments=num_segments))
+    else:
+        # Operators with a current fee that are still listed or have fresh active validators
+        priced = operators.filter(~np.isnan(operators.fee) & (operators.listed | (operators.validator_count > 0)))
+
+        for label, facet, iqr_multiplier, num_buckets in sections:
+            facet_operators = priced.facet(facet)
+            messages.extend(generate_summary_text(label, facet_operators.fee, facet_operators, iqr_multiplier=iqr_multiplier, num_buckets=num_buckets, num_segments=num_segments))
 
     if extra_message:
         messages.append(extra_message)
@@ -156,9 +139,9 @@ def compile_fee_messages(fee_data, extra_message=None, availability="public", ve
 ##
 ## Send fee messages in response to a slash command.
 ##
-async def respond_fee_messages(ctx, fee_data, extra_message=None, availability="public", verified="all", num_segments=20):
+async def respond_fee_messages(ctx, fee_data, extra_message=None, availability="public", verified="all", num_segments=20, summaries=None):
     try:
-        messages = compile_fee_messages(fee_data, extra_message=extra_message, availability=availability, verified=verified, num_segments=num_segments)
+        messages = compile_fee_messages(fee_data, extra_message=extra_message, availability=availability, verified=verified, num_segments=num_segments, summaries=summaries)
 
         if messages:
             for message in messages:
@@ -4,6 +4,76 @@ from bot.bot_messages import bundle_messages
 from common.config import *
 
 
+# Create lines summarizing rolling 24h performance aggregates precomputed by the
+# collector. Returns an empty string if no rolling data is available.
+def create_rolling_performance_lines(rolling):
+    if not rolling:
+        return ''
+
+    lines = ''
+    if rolling.get('days_7d') and rolling.get('avg_7d') is not None:
+        lines += f"7d Average: {rolling['avg_7d'] * 100:.2f}%\n"
+    if rolling.get('days_90d') and rolling.get('avg_90d') is not None:
+        lines += f"90d Average: {rolling['avg_90d'] * 100:.2f}% ({rolling['days_90d']} days)\n"
+    if rolling.get('days_30d') and rolling.get('min_30d') is not None:
+        lines += f"Worst Day (30d): {rolling['min_30d'] * 100:.2f}%\n"
+        lines += f"Days < {rolling['below_threshold']:.0%} (30d): {rolling['days_below_30d']}\n"
+
+    return lines
+
+
+# Statuses grouped for display, in display order. Anything else is shown as "Other".
+VALIDATOR_STATUS_GROUPS = [
+    ('Active', ('active', 'active_ongoing')),
+    ('Pending', ('pending_initialized', 'pending_queued')),
+    ('Exiting', ('active_exiting',)),
+    ('Slashed', ('active_slashed', 'exited_slashed')),
+    ('Exited', ('exited', 'exited_unslashed', 'withdrawal_possible', 'withdrawal_done')),
+]
+
+
+# Create a line breaking an operator's validators down by status, from the
+# histogram stored by the collector. Returns an empty string if unavailable or
+# if every validator is active.
+def create_validator_status_line(status_counts):
+    if not status_counts:
+        return ''
+
+    grouped = {}
+    known = set()
+    for label, statuses in VALIDATOR_STATUS_GROUPS:
+        grouped[label] = sum(status_counts.get(status, 0) for status in statuses)
+        known.update(statuses)
+    grouped['Other'] = sum(count for status, count in status_counts.items() if status not in known)
+
+    if not any(count for label, count in grouped.items() if label != 'Active'):
+        return ''
+
+    parts = [f"{label} {count}" for label, count in grouped.items() if count]
+    return f"Validator Statuses: {', '.join(parts)}\n"
+
+
+# Create a line with the operator's proposed and missed blocks over the last
+# day. Returns an empty string if the collector has no proposal data for it.
+def create_block_proposals_line(proposals):
+    if not proposals:
+        return ''
+
+    proposed, missed = proposals
+    alert = " :warning:" if missed else ""
+    return f"Block Proposals (24h): {proposed} proposed, {missed} missed{alert}\n"
+
+
+# Create a line with the operator's current fee and the date it took effect.
+# Returns an empty string if the collector has no recent fee for it.
+def create_fee_line(fee, fee_changed_at):
+    if fee is None:
+        return ''
+
+    since = f" (since {fee_changed_at})" if fee_changed_at else ""
+    return f"Fee: {fee:.2f} SSV/year{since}\n"
+
+
 # Create message reporting a single operator's recent performance. Overall assumption in this
 # code is that the performance data for any single operator is not longer than the
 # maximum Discord message length. Otherwise, each operator's message would have to be broken up.
@@ -11,7 +81,7 @@ def create_operator_performance_message(operator_data):
     message = ''
 
     # Display 24h performance second
-    if FIELD_PERF_DATA_24H in operator_data and operator_data[FIELD_PERF_DATA_24H]:
+    if operator_data.series_24h:
         message += f"24h Performance:\n"
 
         # Get a list of dates in the last OPERATOR_24H_HISTORY_COUNT calendar days of performance data
@@ -19,7 +89,7 @@ def create_operator_performance_message(operator_data):
         # Sort the performance data by date descending
         last_x_days = [(datetime.today() - timedelta(days=x)).strftime('%Y-%m-%d') for x in range(OPERATOR_24H_HISTORY_COUNT)]
 
-        data_points = {date: performance for date, performance in operator_data[FIELD_PERF_DATA_24H].items() if date in last_x_days}
+        data_points = {date: performance for date, performance in operator_data.series_24h.items() if date in last_x_days}
         data_points = dict(sorted(data_points.items(), key=lambda item: item[0], reverse=True))
 
         if data_points and data_points.keys():
@@ -34,9 +104,8 @@ def create_operator_performance_message(operator_data):
     else:
         message += "24h Performance: N/A\n"
 
-    if FIELD_PERF_DATA_30D in operator_data and operator_data[FIELD_PERF_DATA_30D]:
-        most_recent_30d_date = max(operator_data[FIELD_PERF_DATA_30D].keys())
-        perf_30d = operator_data[FIELD_PERF_DATA_30D][most_recent_30d_date]
+    if operator_data.series_30d:
+        perf_30d = operator_data.series_30d.latest.value
 
         if perf_30d:
             message += f"30d Performance: {perf_30d * 100:.2f}%\n"
@@ -45,9 +114,14 @@ def create_operator_performance_message(operator_data):
     else:
         message += "30d Performance: N/A\n"
 
+    message += create_rolling_performance_lines(operator_data.rolling)
+    message += create_validator_status_line(operator_data.status_counts)
+    message += create_block_proposals_line(operator_data.block_proposals)
+    message += create_fee_line(operator_data.fee, operator_data.fee_changed_at)
+
     header = ''
     if message:
-        header = f"**__{operator_data[FIELD_OPERATOR_NAME]} (ID: {operator_data[FIELD_OPERATOR_ID]}, Validators: {operator_data[FIELD_VALIDATOR_COUNT]})__**\n"
+        header = f"**__{operator_data.name} (ID: {operator_data.operator_id}, Validators: {operator_data.validator_count})__**\n"
 
     return header + message
 
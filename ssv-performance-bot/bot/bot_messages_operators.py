@@ -1,56 +1,56 @@
-import statistics
-import random
 import logging
 
-from bot.bot_data_processing import iqr_bucketize
-from bot.bot_visualizations import render_bucket_lines_counts
+import numpy as np
+
+from bot.bot_data_processing import summarize_columns
+from bot.bot_visualizations import render_bucket_count_lines_counts
 from bot.bot_messages import bundle_messages
-from common.config import *
 
 
 ##
-## Generate summary text for a set of operators based on their active validator counts.
+## Generate summary text for a set of operators based on their active validator counts
+## (an array aligned with the rows of the operators frame).
 ##  - num_buckets: Number of buckets to create for the IQR bucketization.  
 ##  - iqr_multiplier: Multiplier to apply to the IQR to determine outlier thresholds.
 ##  - num_segments: Maximum number of segments to use in the bar chart rendering. More
 ##    segments means the chart will be wider on screen.
 ##
-def generate_summary_text(label, items, num_buckets=10, iqr_multiplier=1.5, num_segments=20, availability="all", verified="all"):
-    if not items:
+def generate_summary_text(label, counts, operators, num_buckets=10, iqr_multiplier=1.5, num_segments=20, availability="all", verified="all"):
+    if len(counts) == 0:
         return [f"No {label} operators found."]
 
-    values = [c for c, _ in items]
+    summary = summarize_columns(counts, operators, num_buckets=num_buckets, iqr_multiplier=iqr_multiplier)
+    return render_summary_text(label, summary, num_segments=num_segments, availability=availability, verified=verified)
+
+
+##
+## Render summary text for an active validator count summary, either computed by
+## summarize_columns() or read from the collector's precomputed network_daily_summary rows.
+##
+def render_summary_text(label, summary, num_segments=20, availability="all", verified="all"):
+    if not summary:
+        return [f"No {label} operators found."]
 
     # Process counts for summary lines
-    n_ops = len(values)
-    public_count = sum(1 for _, op in items if not op.get(FIELD_IS_PRIVATE))
-    verified_count = sum(1 for _, op in items if op.get(FIELD_IS_VO))
-    public_verified_count = sum(1 for _, op in items if not op.get(FIELD_IS_PRIVATE) and op.get(FIELD_IS_VO))
+    n_ops = summary["operator_count"]
+    zero_count = summary["zero_count"]
+    public_count = n_ops - summary["private_count"]
+    verified_count = summary["vo_count"]
+    public_verified_count = summary["public_vo_count"]
 
     # Process mean and median
-    mean = statistics.mean(values)
-    median = statistics.median(values)
+    mean = summary["mean_value"]
+    median = summary["median_value"]
 
     # Process maximum
-    hi = max(values)
-    hi_ops = [op for c, op in items if c == hi]
-    hi_example = random.choice(hi_ops)
-    hi_others = max(0, len(hi_ops) - 1)
+    hi = int(summary["max_value"])
+    hi_others = max(0, summary["max_operator_ties"] - 1)
     highest_line = (
         f"- Most active validators: {hi:,} — "
-        f"{hi_example[FIELD_OPERATOR_NAME]} (ID: {hi_example[FIELD_OPERATOR_ID]})"
+        f"{summary['max_operator_name']} (ID: {summary['max_operator_id']})"
         + (f" and {hi_others} other{'s' if hi_others != 1 else ''}" if hi_others > 0 else "")
     )
 
-    # Create data buckets
-    buckets, bucket_ranges, zero_count, outliers = iqr_bucketize(
-        items,
-        value_fn=lambda it: it[0],        
-        num_buckets=num_buckets,
-        iqr_multiplier=iqr_multiplier,
-        treat_zero_separately=True
-    )
-
     # Begin rendering text
 
     lines = [
@@ -73,11 +73,12 @@ def generate_summary_text(label, items, num_buckets=10, iqr_multiplier=1.5, num_
     lines.append(f"### {label} Active Validator Distribution Across Operators")
 
     # Generate chart
-    bucket_lines = render_bucket_lines_counts(
-        buckets_with_ranges=[(b, lo, hi_) for b, (lo, hi_) in zip(buckets, bucket_ranges)],
+    bucket_lines = render_bucket_count_lines_counts(
+        bucket_counts_with_ranges=list(zip(summary["bucket_counts"], summary["bucket_lower"], summary["bucket_upper"])),
         zero_count=zero_count,
-        outliers=outliers,
-        items=items,
+        outlier_count=summary["outlier_count"],
+        outlier_min=summary["outlier_min"],
+        outlier_max=summary["outlier_max"],
         max_segments=num_segments,
         mean=mean,
         median=median
@@ -88,80 +89,45 @@ def generate_summary_text(label, items, num_buckets=10, iqr_multiplier=1.5, num_
 
 
 ##
-## Compile multiple messages to display operator details.
+## Returns the (label, facet, iqr_multiplier, num_buckets) summaries to display
+## for the requested availability and verified filters.
 ##
-def compile_operator_messages(operators_data, extra_message=None, availability="all", verified="all", num_segments=20):
+def operator_summary_sections(availability="all", verified="all"):
+    labels = {
+        "all": {"all": ("All", "all"), "verified": ("All Verified", "vo"), "unverified": ("All Unverified", "non_vo")},
+        "public": {"all": ("All Public", "public"), "verified": ("Public Verified", "public_vo"), "unverified": ("Public Unverified", "public_non_vo")},
+        "private": {"all": ("All Private", "private"), "verified": ("Private Verified", "private_vo"), "unverified": ("Private Unverified", "private_non_vo")},
+    }
+
+    if availability not in labels or verified not in labels[availability]:
+        return []
+
+    label, facet = labels[availability][verified]
+    iqr_multiplier, num_buckets = (2.5, 5) if availability == "private" else (1.5, 10)
+    return [(label, facet, iqr_multiplier, num_buckets)]
+
+
+##
+## Compile multiple messages to display operator details. When precomputed
+## summaries (keyed by facet) are provided, the operators frame is not needed.
+##
+def compile_operator_messages(operators, extra_message=None, availability="all", verified="all", num_segments=20, summaries=None):
     messages = []
 
-    all_items = []
-    public_items, private_items = [], []
-    verified_items, unverified_items = [], []
-    public_vo_items, public_non_vo_items = [], []
-    private_vo_items, private_non_vo_items = [], []
-
-    # Collect counts into appropriate lists by public/private and VO status
-    for op in operators_data.values():
-        count = op.get(FIELD_VALIDATOR_COUNT)
-        if count is None:
-            continue
-        item = (int(count), op)
-        all_items.append(item)
-
-        is_private = bool(op.get(FIELD_IS_PRIVATE))
-        is_vo = bool(op.get(FIELD_IS_VO))
-
-        if is_vo:
-            verified_items.append(item) 
-        else:
-            unverified_items.append(item)
+    sections = operator_summary_sections(availability=availability, verified=verified)
 
-        if is_private:
-            private_items.append(item)
-            (private_vo_items if is_vo else private_non_vo_items).append(item)
-        else:
-            public_items.append(item)
-            (public_vo_items if is_vo else public_non_vo_items).append(item)
-
-    # Generating summaries based on filters
-
-    # Overall breakdown
-    if availability == "all":
-        logging.debug(f"Filtered to all availability")
-        if verified == "all":
-            logging.debug(f"All items count: {len(all_items)}")
-            messages.extend(generate_summary_text("All", all_items, iqr_multiplier=1.5, num_buckets=10, num_segments=num_segments, availability=availability, verified=verified))
-        if verified == "verified":
-            logging.debug(f"Public VO items count: {len(verified_items)}")
-            messages.extend(generate_summary_text("All Verified", verified_items, iqr_multiplier=1.5, num_buckets=10, num_segments=num_segments, availability=availability, verified=verified))
-        if verified == "unverified":
-            logging.debug(f"Public non-VO items count: {len(public_non_vo_items)}")
-            messages.extend(generate_summary_text("All Unverified", unverified_items, iqr_multiplier=1.5, num_buckets=10, num_segments=num_segments, availability=availability, verified=verified))
-
-    # Public breakdown
-    if availability == "public":
-        logging.debug(f"Filtered to public items")
-        if verified == "all":
-            logging.debug(f"Public items count: {len(public_items)}")
-            messages.extend(generate_summary_text("All Public", public_items, iqr_multiplier=1.5, num_buckets=10, num_segments=num_segments, availability=availability, verified=verified))
-        if verified == "verified":
-            logging.debug(f"Public VO items count: {len(public_vo_items)}")
-            messages.extend(generate_summary_text("Public Verified", public_vo_items, iqr_multiplier=1.5, num_buckets=10, num_segments=num_segments, availability=availability, verified=verified))
-        if verified == "unverified":
-            logging.debug(f"Public non-VO items count: {len(public_non_vo_items)}")
-            messages.extend(generate_summary_text("Public Unverified", public_non_vo_items, iqr_multiplier=1.5, num_buckets=10, num_segments=num_segments, availability=availability, verified=verified))
-
-    # Private breakdown
-    if availability == "private":
-        logging.debug(f"Filtered to private items")
-        if verified == "all":
-            logging.debug(f"Private items count: {len(private_items)}")
-            messages.extend(generate_summary_text("All Private", private_items, iqr_multiplier=2.5, num_buckets=5, num_segments=num_segments, availability=availability, verified=verified))
-        if verified == "verified":
-            logging.debug(f"Private VO items count: {len(private_vo_items)}")
-            messages.extend(generate_summary_text("Private Verified", private_vo_items, iqr_multiplier=2.5, num_buckets=5, num_segments=num_segments, availability=availability, verified=verified))
-        if verified == "unverified":
-            logging.debug(f"Private non-VO items count: {len(private_non_vo_items)}")
-            messages.extend(generate_summary_text("Private Unverified", private_non_vo_items, iqr_multiplier=2.5, num_buckets=5, num_segments=num_segments, availability=availability, verified=verified))
+    if summaries:
+        for label, facet, _, _ in sections:
+            logging.debug(f"Rendering precomputed {facet} operator summary")
+            messages.extend(render_summary_text(label, summaries.get(facet), num_segments=num_segments, availability=availability, verified=verified))
+    else:
+        # Operators with a current active validator count
+        counted = operators.filter(~np.isnan(operators.validator_count))
+
+        for label, facet, iqr_multiplier, num_buckets in sections:
+            facet_operators = counted.facet(facet)
+            logging.debug(f"{label} items count: {len(facet_operators)}")
+            messages.extend(generate_summary_text(label, facet_operators.validator_count, facet_operators, iqr_multiplier=iqr_multiplier, num_buckets=num_buckets, num_segments=num_segments, availability=availability, verified=verified))
 
     if extra_message:
         messages.append(extra_message)
@@ -172,12 +138,13 @@ def compile_operator_messages(operators_data, extra_message=None, availability="
 ##
 ## Send operator messages in response to a slash command.
 ##
-async def respond_operator_messages(ctx, operator_data, extra_message=None, availability="all", verified="all", num_segments=20):
+async def respond_operator_messages(ctx, operator_data, extra_message=None, availability="all", verified="all", num_segments=20, summaries=None):
     try:
         messages = compile_operator_messages(
             operator_data, availability=availability, verified=verified,
             extra_message=extra_message,
-            num_segments=num_segments
+            num_segments=num_segments,
+            summaries=summaries
         )
         if messages:
             for message in messages:
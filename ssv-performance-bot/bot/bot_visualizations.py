@@ -1,18 +1,19 @@
 from bot.bot_messages import bundle_messages
-from common.config import *
 
 
 ##
-## Renders a set of buckets with ranges, zero count, and outliers as a text-based bar chart.
-## Each bucket is represented as a line with a bar whose length is proportional to the number of
-## items in that bucket. The zero count and outliers are also represented as separate lines.
-## Mean and median values are indicated with arrows on the appropriate lines.
+## Renders bucket counts with ranges, zero count, and outliers as a text-based bar chart.
+## Each bucket is represented as a line with a bar whose length is proportional to the number
+## of operators in that bucket. The zero count and outliers are also represented as separate
+## lines. Mean and median values are indicated with arrows on the appropriate lines. Only
+## counts are needed, so precomputed network summaries render without operator rows.
+##  - bucket_counts_with_ranges: List[(count, lower, upper)]
 ##
 ## Used for rendering distribution of operator fees
 ##
-def render_bucket_lines(buckets_with_ranges, zero_count, outliers, fees, mean, median, max_segments=20):
+def render_bucket_count_lines(bucket_counts_with_ranges, zero_count, outlier_count, outlier_min, outlier_max, mean, median, max_segments=20):
 
-    max_count = max([len(b) for b, _, _ in buckets_with_ranges] + [zero_count, len(outliers)])
+    max_count = max([c for c, _, _ in bucket_counts_with_ranges] + [zero_count, outlier_count])
     lines = []
 
     def build_bar(count):
@@ -20,18 +21,17 @@ def render_bucket_lines(buckets_with_ranges, zero_count, outliers, fees, mean, m
             return ""
         return "■" * max(1, int((count / max_count) * max_segments))
 
-    all_counts = [zero_count] + [len(b) for b, _, _ in buckets_with_ranges] + [len(outliers)]
+    all_counts = [zero_count] + [c for c, _, _ in bucket_counts_with_ranges] + [outlier_count]
     count_width = max(len(str(c)) for c in all_counts) + 2
 
     labels = ["0.00"]  # zero bucket label
 
     # Add range labels
-    for _, lower, upper in buckets_with_ranges:
+    for _, lower, upper in bucket_counts_with_ranges:
         labels.append(f"{lower:.2f}–{upper:.2f}")
 
     # Add outlier label if any
-    if outliers:
-        outlier_min = min(fee for fee, _ in outliers)
+    if outlier_count:
         labels.append(f">= {outlier_min:.2f}")
 
     label_width = max(len(label) for label in labels) + 1
@@ -47,15 +47,13 @@ def render_bucket_lines(buckets_with_ranges, zero_count, outliers, fees, mean, m
 
         marker_str = f"⟵ {', '.join(markers)}" if markers else ""
 
-        validator_count = sum(op[FIELD_VALIDATOR_COUNT] for fee, op in fees if fee == 0)
         count_str = f"({zero_count})"
 
         lines.append(f"{'0.00':>{label_width}} {bar:<{max_segments}} {count_str:<{count_width}} {marker_str}")
 
 
-    for b, lower, upper in buckets_with_ranges:
+    for b_len, lower, upper in bucket_counts_with_ranges:
         label = f"{lower:.2f}–{upper:.2f}"
-        b_len = len(b)
         bar = build_bar(b_len)
 
         markers = []
@@ -66,17 +64,13 @@ def render_bucket_lines(buckets_with_ranges, zero_count, outliers, fees, mean, m
 
         marker_str = f"⟵ {', '.join(markers)}" if markers else ""
 
-        validator_count = sum(op[FIELD_VALIDATOR_COUNT] for fee, op in b)
         count_str = f"({b_len})"
 
         lines.append(f"{label:>{label_width}} {bar:<{max_segments}} {count_str:<{count_width}} {marker_str}")
 
-    if outliers:
-        count = len(outliers)
-        outlier_min = min(fee for fee, _ in outliers)
-        outlier_max = max(fee for fee, _ in outliers)
+    if outlier_count:
+        count = outlier_count
         bar = build_bar(count)
-        validator_count = sum(op[FIELD_VALIDATOR_COUNT] for fee, op in outliers)
         count_str = f"({count})"
         label = f">= {outlier_min:.2f}"
 
@@ -95,20 +89,15 @@ def render_bucket_lines(buckets_with_ranges, zero_count, outliers, fees, mean, m
 
 
 ##
-## Renders a set of buckets with ranges, zero count, and outliers as a text-based bar chart.
-## Each bucket is represented as a line with a bar whose length is proportional to the number of
-## items in that bucket. The zero count and outliers are also represented as separate lines.
-## Mean and median values are indicated with arrows on the appropriate lines.
+## Renders bucket counts with whole-number ranges, zero count, and outliers as a text-based
+## bar chart. Each bucket is represented as a line with a bar whose length is proportional to
+## the number of operators in that range. Mean and median values are indicated with arrows on
+## the appropriate lines.
+##  - bucket_counts_with_ranges: List[(count, lower, upper)]
 ##
 ## Used for rendering distribution of active validator counts across operators
 ##
-def render_bucket_lines_counts(buckets_with_ranges, zero_count, outliers, items, mean, median, max_segments=20):
-    """
-    buckets_with_ranges: List[(bucket:list[(count, op)], lower:float, upper:float)]
-    items: original list[(count, op)]
-    mean/median: of counts
-    Renders a bar per bucket where bar length is number of operators in that range.
-    """
+def render_bucket_count_lines_counts(bucket_counts_with_ranges, zero_count, outlier_count, outlier_min, outlier_max, mean, median, max_segments=20):
     def build_bar(n):
         if n == 0:
             return ""
@@ -117,17 +106,17 @@ def render_bucket_lines_counts(buckets_with_ranges, zero_count, outliers, items,
     def fmt_range(lower, upper):
         return f"{int(round(lower))}–{int(round(upper))}"
 
-    max_count = max([len(b) for b, _, _ in buckets_with_ranges] + [zero_count, len(outliers), 1])
+    max_count = max([c for c, _, _ in bucket_counts_with_ranges] + [zero_count, outlier_count, 1])
 
     # Precompute widths for nice alignment
-    all_counts = [zero_count] + [len(b) for b, _, _ in buckets_with_ranges] + [len(outliers)]
+    all_counts = [zero_count] + [c for c, _, _ in bucket_counts_with_ranges] + [outlier_count]
     count_width = max(len(str(c)) for c in all_counts) + 2
 
     labels = ["0"]
-    for _, lower, upper in buckets_with_ranges:
+    for _, lower, upper in bucket_counts_with_ranges:
         labels.append(fmt_range(lower, upper))
-    if outliers:
-        labels.append(f">= {int(min(c for c, _ in outliers))}")
+    if outlier_count:
+        labels.append(f">= {int(outlier_min)}")
     label_width = max(len(label) for label in labels) + 1
 
     rows = []
@@ -145,9 +134,8 @@ def render_bucket_lines_counts(buckets_with_ranges, zero_count, outliers, items,
         rows.append(f"{'0':>{label_width}} {bar:<{max_segments}} {count_str:<{count_width}} {marker_str}")
 
     # Inlier buckets
-    for b, lower, upper in buckets_with_ranges:
+    for b_len, lower, upper in bucket_counts_with_ranges:
         label = fmt_range(lower, upper)
-        b_len = len(b)
         bar = build_bar(b_len)
 
         markers = []
@@ -161,11 +149,11 @@ def render_bucket_lines_counts(buckets_with_ranges, zero_count, outliers, items,
         rows.append(f"{label:>{label_width}} {bar:<{max_segments}} {count_str:<{count_width}} {marker_str}")
 
     # Outliers (if any)
-    if outliers:
-        count = len(outliers)
+    if outlier_count:
+        count = outlier_count
         bar = build_bar(count)
-        out_min = int(min(c for c, _ in outliers))
-        out_max = int(max(c for c, _ in outliers))
+        out_min = int(outlier_min)
+        out_max = int(outlier_max)
         count_str = f"({count})"
         if out_min == out_max:
             out_info = f"⟵ outlier{'s' if count != 1 else ''}: {out_min}"
@@ -176,4 +164,4 @@ def render_bucket_lines_counts(buckets_with_ranges, zero_count, outliers, items,
 
     # Wrap in code block and bundle
     lines = ["```"] + rows + ["```"]
-    return bundle_messages(lines)
\ No newline at end of file
+    return bundle_messages(lines)
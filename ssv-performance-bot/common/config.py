@@ -20,6 +20,7 @@ VO_STALENESS_DAYS = 14
 
 # Number of days an operator remains listed in the daily
 # "Recently Removed Verified Operator(s)" section after being demoted.
+# Must not exceed the collector's SNAPSHOT_DEMOTED_DAYS (7).
 VO_RECENTLY_REMOVED_DAYS = 3
 
 # Discord role ID (preferred) or role name to @-mention whenever the
@@ -47,5 +48,10 @@ FIELD_PERFORMANCE = 'Performance'
 FIELD_PERFORMANCE_DATE = 'PerformanceDate'
 FIELD_OPERATOR_FEE = 'OperatorFee'
 FIELD_OPERATOR_FEE_DATE = 'OperatorFeeDate'
+FIELD_OPERATOR_FEE_CHANGED_AT = 'OperatorFeeChangedAt'
 FIELD_NETWORK = 'Network'
-FIELD_VALIDATOR_COUNTS_LATEST_AT = 'ValidatorCountsLatestAt'
\ No newline at end of file
+FIELD_VALIDATOR_COUNTS_LATEST_AT = 'ValidatorCountsLatestAt'
+FIELD_PERF_ROLLING = 'PerformanceRolling'
+FIELD_VALIDATOR_STATUS_COUNTS = 'ValidatorStatusCounts'
+FIELD_VALIDATOR_STATUS_EVENTS = 'ValidatorStatusEvents'
+FIELD_BLOCK_PROPOSALS = 'BlockProposals'
\ No newline at end of file
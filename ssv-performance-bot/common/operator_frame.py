@@ -0,0 +1,130 @@
+import numpy as np
+
+from common.records import OperatorRecord
+
+
+##
+## Column-oriented view of many operators: one read-only NumPy array per
+## column, all the same length and ordered by operator ID. Missing numeric
+## values are NaN (validator counts are float64 for that reason) and a missing
+## vo_demoted_at is NaT. Columns are read as attributes:
+##
+##     vo = frame.facet('public_vo')
+##     below = vo.filter(vo.perf_24h < 0.95)
+##
+## Like the records, frames are immutable and shared rather than copied.
+##
+class OperatorFrame:
+    __slots__ = ('columns',)
+
+    COLUMNS = {
+        'operator_id': np.uint32,
+        'name': object,
+        'is_vo': bool,
+        'is_private': bool,
+        'listed': bool,
+        'removed': bool,
+        'validator_count': np.float64,
+        'fee': np.float64,
+        'perf_24h': np.float64,
+        'perf_30d': np.float64,
+        'vo_demoted_at': 'datetime64[D]',
+    }
+
+    def __init__(self, **columns):
+        missing = set(self.COLUMNS) - set(columns)
+        if missing:
+            raise TypeError(f"OperatorFrame is missing columns {sorted(missing)}")
+
+        arrays = {}
+        for name, dtype in self.COLUMNS.items():
+            array = np.array(columns.pop(name), dtype=dtype)
+            array.flags.writeable = False
+            arrays[name] = array
+        if columns:
+            raise TypeError(f"OperatorFrame has no columns {sorted(columns)}")
+        if len({len(a) for a in arrays.values()}) > 1:
+            raise ValueError("OperatorFrame columns must all be the same length")
+
+        object.__setattr__(self, 'columns', arrays)
+
+    def __getattr__(self, name):
+        try:
+            return self.columns[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name, value):
+        raise AttributeError("OperatorFrame is immutable; use filter()")
+
+    def __len__(self):
+        return len(self.columns['operator_id'])
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __repr__(self):
+        return f"OperatorFrame({len(self)} operators)"
+
+
+    ##
+    ## Rows where mask is true, as a new frame
+    ##
+    def filter(self, mask):
+        return OperatorFrame(**{name: array[mask] for name, array in self.columns.items()})
+
+
+    ##
+    ## Row mask for a summary facet ('all', 'vo', 'private', 'public_non_vo', ...),
+    ## using the facet names from bot_data_processing.operator_facets()
+    ##
+    def facet_mask(self, facet):
+        mask = np.ones(len(self), dtype=bool)
+        if facet == 'all':
+            return mask
+
+        availability, _, vo = facet.partition('_')
+        if availability not in ('public', 'private'):
+            availability, vo = None, facet
+        if availability == 'public':
+            mask &= ~self.is_private
+        elif availability == 'private':
+            mask &= self.is_private
+        if vo == 'vo':
+            mask &= self.is_vo
+        elif vo == 'non_vo':
+            mask &= ~self.is_vo
+        elif vo:
+            raise ValueError(f"Unknown facet {facet!r}")
+        return mask
+
+
+    def facet(self, facet):
+        return self.filter(self.facet_mask(facet))
+
+
+    ##
+    ## Single row as an OperatorRecord, with NaN/NaT mapped back to None
+    ##
+    def record(self, i):
+        def value(name, cast):
+            v = self.columns[name][i]
+            return None if v != v else cast(v)
+
+        demoted_at = self.vo_demoted_at[i]
+        return OperatorRecord(
+            operator_id=int(self.operator_id[i]),
+            name=self.name[i],
+            is_vo=int(self.is_vo[i]),
+            is_private=int(self.is_private[i]),
+            removed=bool(self.removed[i]),
+            validator_count=value('validator_count', int),
+            fee=value('fee', float),
+            perf_24h=value('perf_24h', float),
+            perf_30d=value('perf_30d', float),
+            vo_demoted_at=None if np.isnat(demoted_at) else demoted_at.astype(object),
+        )
+
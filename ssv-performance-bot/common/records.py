@@ -0,0 +1,194 @@
+from bisect import bisect_left
+from collections.abc import Mapping
+
+from common.config import *
+
+
+##
+## Base for immutable, __slots__-based records. Attributes are set once by the
+## constructor; replace() returns a copy with some attributes changed. Records
+## are shared rather than copied (copy/deepcopy return the same object), so a
+## cached result can be handed out without duplicating every operator.
+##
+class _Record:
+    __slots__ = ()
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            object.__setattr__(self, name, values.pop(name, None))
+        if values:
+            raise TypeError(f"{type(self).__name__} has no fields {sorted(values)}")
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable; use replace()")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def replace(self, **changes):
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values.update(changes)
+        return type(self)(**values)
+
+    def _values(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        return type(other) is type(self) and other._values() == self._values()
+
+    __hash__ = None
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (_rebuild, (type(self), dict(zip(self.__slots__, self._values()))))
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__ if getattr(self, name) is not None)
+        return f"{type(self).__name__}({fields})"
+
+
+def _rebuild(cls, values):
+    return cls(**values)
+
+
+##
+## A single dated performance value
+##
+class PerformancePoint(_Record):
+    __slots__ = ('date', 'value')
+
+
+##
+## A date-ordered performance series held as two aligned tuples of YYYY-MM-DD
+## strings and performance values. It reads like the {date: value} dict it
+## replaces, so series.items(), max(series) and series['2025-01-31'] work.
+##
+class PerformanceSeries(_Record, Mapping):
+    __slots__ = ('dates', 'performance')
+
+    def __init__(self, dates=(), performance=()):
+        super().__init__(dates=tuple(dates), performance=tuple(performance))
+
+    def __getitem__(self, date):
+        i = bisect_left(self.dates, date)
+        if i == len(self.dates) or self.dates[i] != date:
+            raise KeyError(date)
+        return self.performance[i]
+
+    def __iter__(self):
+        return iter(self.dates)
+
+    def __len__(self):
+        return len(self.dates)
+
+    def items(self):
+        return zip(self.dates, self.performance)
+
+    def points(self):
+        return [PerformancePoint(date=d, value=v) for d, v in self.items()]
+
+    @property
+    def latest(self):
+        if not self.dates:
+            return None
+        return PerformancePoint(date=self.dates[-1], value=self.performance[-1])
+
+    __eq__ = _Record.__eq__
+
+    def __hash__(self):
+        return hash(self._values())
+
+
+##
+## Operator attributes and metrics as returned by the storage methods. Each
+## method fills the fields its query provides and leaves the rest None.
+##
+## For code still written against the old dicts, records also answer FIELD_*
+## lookups: record[FIELD_OPERATOR_NAME], record.get(FIELD_VALIDATOR_COUNT) and
+## FIELD_PERFORMANCE in record. A field counts as present when it is not None.
+##
+class OperatorRecord(_Record):
+    __slots__ = (
+        'operator_id',
+        'name',
+        'network',
+        'address',
+        'is_vo',
+        'is_private',
+        'validator_count',
+        'counts_latest_at',
+        'updated_at',
+        'removed',
+        'vo_demoted_at',
+        'fee',
+        'fee_date',
+        'fee_changed_at',
+        'perf_24h',
+        'perf_30d',
+        'performance_date',
+        'series_24h',
+        'series_30d',
+        'rolling',
+        'status_counts',
+        'status_events',
+        'block_proposals',
+    )
+
+    _FIELD_ATTRS = {
+        FIELD_OPERATOR_ID: 'operator_id',
+        FIELD_OPERATOR_NAME: 'name',
+        FIELD_NETWORK: 'network',
+        FIELD_ADDRESS: 'address',
+        FIELD_IS_VO: 'is_vo',
+        FIELD_IS_PRIVATE: 'is_private',
+        FIELD_VALIDATOR_COUNT: 'validator_count',
+        FIELD_VALIDATOR_COUNTS_LATEST_AT: 'counts_latest_at',
+        FIELD_OPERATOR_UPDATED_AT: 'updated_at',
+        FIELD_OPERATOR_REMOVED: 'removed',
+        FIELD_VO_DEMOTED_AT: 'vo_demoted_at',
+        FIELD_OPERATOR_FEE: 'fee',
+        FIELD_OPERATOR_FEE_DATE: 'fee_date',
+        FIELD_OPERATOR_FEE_CHANGED_AT: 'fee_changed_at',
+        FIELD_PERFORMANCE: 'performance',
+        FIELD_PERFORMANCE_DATE: 'performance_date',
+        FIELD_PERF_DATA_24H: 'series_24h',
+        FIELD_PERF_DATA_30D: 'series_30d',
+        FIELD_PERF_ROLLING: 'rolling',
+        FIELD_VALIDATOR_STATUS_COUNTS: 'status_counts',
+        FIELD_VALIDATOR_STATUS_EVENTS: 'status_events',
+        FIELD_BLOCK_PROPOSALS: 'block_proposals',
+    }
+
+    ##
+    ## Latest 24h/30d values in the old {'24h': ..., '30d': ...} shape, or None
+    ## if the record carries neither
+    ##
+    @property
+    def performance(self):
+        if self.perf_24h is None and self.perf_30d is None:
+            return None
+        return {'24h': self.perf_24h, '30d': self.perf_30d}
+
+    def __getitem__(self, field):
+        try:
+            return getattr(self, self._FIELD_ATTRS[field])
+        except KeyError:
+            raise KeyError(field) from None
+
+    def get(self, field, default=None):
+        value = self[field] if field in self._FIELD_ATTRS else None
+        return default if value is None else value
+
+    def __contains__(self, field):
+        return self.get(field) is not None
+
+    def keys(self):
+        return [field for field in self._FIELD_ATTRS if field in self]
+
+    def to_dict(self):
+        return {field: self[field] for field in self.keys()}
@@ -0,0 +1,245 @@
+import asyncio
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+from clickhouse_connect import create_client
+from clickhouse_connect.driver.exceptions import ClickHouseError, OperationalError
+
+
+##
+## Raised when no pooled client becomes free within the acquire timeout
+##
+class PoolExhaustedError(ClickHouseError):
+    pass
+
+
+##
+## A pooled client plus the bookkeeping needed for health checks
+##
+class _PooledClient:
+
+    def __init__(self, client):
+        self.client = client
+        self.last_used = time.monotonic()
+
+
+##
+## Fixed-size pool of clickhouse_connect clients. At most `size` queries run at
+## once; further callers wait up to `acquire_timeout` seconds for a free client.
+## Clients idle for longer than `health_check_interval` are pinged before use
+## and replaced if the ping fails, as are clients whose query failed with a
+## connection error. Default per-query settings (e.g. max_execution_time,
+## max_memory_usage) are merged under any settings passed to a call.
+##
+## The pool exposes query/query_np/command/insert with the clickhouse_connect signatures,
+## so it can stand in for a single client. It is thread-safe; the *_async
+## variants run the same calls on a worker thread for use from asyncio.
+##
+class ClickHousePool:
+
+    def __init__(self, connect_kwargs, size=4, acquire_timeout=10, health_check_interval=30,
+                 settings=None, retries=5, delay=2):
+        self.connect_kwargs = connect_kwargs
+        self.size = int(size)
+        self.acquire_timeout = float(acquire_timeout)
+        self.health_check_interval = float(health_check_interval)
+        self.settings = {k: v for k, v in (settings or {}).items() if v}
+        self.retries = retries
+        self.delay = delay
+
+        self._idle = queue.LifoQueue(maxsize=self.size)
+        self._lock = threading.Lock()
+        self._stats = {
+            'queries': 0,
+            'errors': 0,
+            'reconnects': 0,
+            'health_checks': 0,
+            'waits': 0,
+            'wait_seconds': 0.0,
+            'exhausted': 0,
+            'in_use': 0,
+            'peak_in_use': 0,
+        }
+
+        # Connect one client up front so bad credentials fail at startup; the
+        # rest are created lazily as concurrency requires
+        self._idle.put(self._connect())
+        for _ in range(self.size - 1):
+            self._idle.put(None)
+
+
+    ##
+    ## Create a client, retrying with a fixed delay
+    ##
+    def _connect(self):
+        for attempt in range(1, self.retries + 1):
+            try:
+                # No shared session, so each pooled client can query independently
+                return _PooledClient(create_client(autogenerate_session_id=False, **self.connect_kwargs))
+            except ClickHouseError as e:
+                logging.warning(f"Attempt {attempt} failed to connect to ClickHouse: {e}")
+                if attempt < self.retries:
+                    time.sleep(self.delay)
+                else:
+                    raise
+
+
+    def _count(self, name, value=1):
+        with self._lock:
+            self._stats[name] += value
+
+
+    def _healthy(self, pooled):
+        if time.monotonic() - pooled.last_used < self.health_check_interval:
+            return True
+        self._count('health_checks')
+        try:
+            return bool(pooled.client.ping())
+        except Exception:
+            return False
+
+
+    def _discard(self, pooled):
+        try:
+            pooled.client.close()
+        except Exception:
+            pass
+
+
+    ##
+    ## Check out a client for the duration of the block. Unhealthy or missing
+    ## clients are (re)connected first; a client whose call raised a connection
+    ## error is dropped and its slot reconnected on the next checkout.
+    ##
+    @contextmanager
+    def acquire(self):
+        started = time.monotonic()
+        try:
+            pooled = self._idle.get(timeout=self.acquire_timeout)
+        except queue.Empty:
+            self._count('exhausted')
+            raise PoolExhaustedError(f"No ClickHouse client free after {self.acquire_timeout}s "
+                                     f"({self.size} in use)")
+
+        waited = time.monotonic() - started
+        if waited > 0.01:
+            self._count('waits')
+            self._count('wait_seconds', waited)
+
+        with self._lock:
+            self._stats['in_use'] += 1
+            self._stats['peak_in_use'] = max(self._stats['peak_in_use'], self._stats['in_use'])
+
+        try:
+            if pooled is not None and not self._healthy(pooled):
+                logging.info("ClickHouse client failed health check; reconnecting")
+                self._discard(pooled)
+                pooled = None
+                self._count('reconnects')
+            if pooled is None:
+                pooled = self._connect()
+            yield pooled.client
+            pooled.last_used = time.monotonic()
+        except OperationalError:
+            # Drop the client; its slot reconnects on the next checkout
+            self._count('errors')
+            if pooled is not None:
+                self._discard(pooled)
+                pooled = None
+                self._count('reconnects')
+            raise
+        except Exception:
+            self._count('errors')
+            raise
+        finally:
+            with self._lock:
+                self._stats['in_use'] -= 1
+            self._idle.put(pooled)
+
+
+    def _settings(self, settings):
+        return {**self.settings, **(settings or {})}
+
+
+    ##
+    ## Run a read query; retried once on a fresh client after a connection error
+    ##
+    def query(self, query, parameters=None, settings=None, **kwargs):
+        self._count('queries')
+        for attempt in (1, 2):
+            try:
+                with self.acquire() as client:
+                    return client.query(query, parameters=parameters, settings=self._settings(settings), **kwargs)
+            except OperationalError as e:
+                if attempt == 2:
+                    raise
+                logging.warning(f"ClickHouse connection error, retrying query on a new client: {e}")
+
+
+    ##
+    ## Run a read query returning a NumPy array (a structured array when the
+    ## column types differ); retried like query()
+    ##
+    def query_np(self, query, parameters=None, settings=None, **kwargs):
+        self._count('queries')
+        for attempt in (1, 2):
+            try:
+                with self.acquire() as client:
+                    return client.query_np(query, parameters=parameters, settings=self._settings(settings), **kwargs)
+            except OperationalError as e:
+                if attempt == 2:
+                    raise
+                logging.warning(f"ClickHouse connection error, retrying query on a new client: {e}")
+
+
+    def command(self, cmd, parameters=None, settings=None, **kwargs):
+        self._count('queries')
+        with self.acquire() as client:
+            return client.command(cmd, parameters=parameters, settings=self._settings(settings), **kwargs)
+
+
+    def insert(self, table, data, settings=None, **kwargs):
+        self._count('queries')
+        with self.acquire() as client:
+            return client.insert(table, data, settings=self._settings(settings), **kwargs)
+
+
+    async def query_async(self, query, parameters=None, settings=None, **kwargs):
+        return await asyncio.to_thread(self.query, query, parameters, settings, **kwargs)
+
+
+    async def query_np_async(self, query, parameters=None, settings=None, **kwargs):
+        return await asyncio.to_thread(self.query_np, query, parameters, settings, **kwargs)
+
+
+    async def command_async(self, cmd, parameters=None, settings=None, **kwargs):
+        return await asyncio.to_thread(self.command, cmd, parameters, settings, **kwargs)
+
+
+    async def insert_async(self, table, data, settings=None, **kwargs):
+        return await asyncio.to_thread(self.insert, table, data, settings, **kwargs)
+
+
+    ##
+    ## Snapshot of pool usage counters
+    ##
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats['size'] = self.size
+        stats['idle'] = self._idle.qsize()
+        stats['wait_seconds'] = round(stats['wait_seconds'], 3)
+        return stats
+
+
+    def close(self):
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if pooled is not None:
+                self._discard(pooled)
@@ -0,0 +1,105 @@
+import copy
+import functools
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+
+##
+## Size-bounded LRU cache with a TTL, safe to share between the storage
+## thread pool's workers. Values go through copy.deepcopy on the way in and
+## out, but the OperatorRecord, PerformanceSeries and OperatorFrame values
+## inside them are immutable and return themselves from __deepcopy__, so they
+## are shared with the cache. Only the containers around them (the dicts and
+## lists keyed by operator) are copied, and callers may change those freely.
+##
+class ResultCache:
+
+    def __init__(self, maxsize=128, ttl=300):
+        self.maxsize = int(maxsize)
+        self.ttl = float(ttl)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+
+    ##
+    ## Returns (True, value) on a fresh hit, (False, None) otherwise
+    ##
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                if entry is not None:
+                    del self._entries[key]
+                self._stats['misses'] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            value = entry[1]
+        return True, copy.deepcopy(value)
+
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+
+    ##
+    ## Drop every entry whose key matches predicate (all entries if None).
+    ## Returns the number of entries dropped.
+    ##
+    def invalidate(self, predicate=None):
+        with self._lock:
+            keys = [k for k in self._entries if predicate is None or predicate(k)]
+            for k in keys:
+                del self._entries[k]
+            self._stats['invalidations'] += len(keys)
+        return len(keys)
+
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        return stats
+
+
+##
+## Cache a storage method's result under (method, network, args, data_version).
+## The instance must provide result_cache and _data_version(network); the
+## method's first argument after self must be the network. When a new data
+## version is seen, entries for older versions of the same method and network
+## are dropped. Empty results (how storage methods report errors) are not
+## cached, and a failed version probe bypasses the cache.
+##
+def cached_by_data_version(method):
+
+    @functools.wraps(method)
+    def wrapper(self, network, *args, **kwargs):
+        version = self._data_version(network)
+        if version is None:
+            return method(self, network, *args, **kwargs)
+
+        name = method.__name__
+        key = (name, network, args, tuple(sorted(kwargs.items())), version)
+        hit, value = self.result_cache.get(key)
+        if hit:
+            logging.debug(f"Result cache hit for {name}({network}) at data version {version}")
+            return value
+
+        value = method(self, network, *args, **kwargs)
+        if value:
+            self.result_cache.invalidate(lambda k: k[0] == name and k[1] == network and k[4] != version)
+            self.result_cache.put(key, value)
+        return value
+
+    return wrapper
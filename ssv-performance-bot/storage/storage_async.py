@@ -0,0 +1,64 @@
+import asyncio
+import functools
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+
+##
+## Raised when a storage call does not finish within its timeout
+##
+class StorageTimeoutError(TimeoutError):
+    pass
+
+
+##
+## Async facade over a synchronous storage instance. Every method call runs on
+## a bounded thread pool so slow queries never block the discord.py event loop,
+## and is awaited with a timeout so a stuck query cannot hang a command:
+##
+##     storage = StorageFactory.get_async_storage('ssv_performance')
+##     perf_data = await storage.get_performance_by_opids(network, op_ids)
+##
+## The timeout for a single call can be overridden with the storage_timeout
+## keyword argument. A timed out query keeps its worker thread until the
+## database returns; the caller just stops waiting for it.
+##
+class AsyncStorage:
+
+    def __init__(self, storage, max_workers=None, timeout=None):
+        self.storage = storage
+        self.max_workers = int(max_workers or os.environ.get("BOT_STORAGE_MAX_WORKERS", 4))
+        self.timeout = float(timeout or os.environ.get("BOT_STORAGE_TIMEOUT_SECONDS", 30))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="storage")
+
+
+    def __getattr__(self, name):
+        method = getattr(self.storage, name)
+        if not callable(method):
+            return method
+
+        @functools.wraps(method)
+        async def call(*args, storage_timeout=None, **kwargs):
+            return await self.run(method, *args, storage_timeout=storage_timeout, **kwargs)
+
+        return call
+
+
+    ##
+    ## Run any blocking callable on the storage thread pool with a timeout
+    ##
+    async def run(self, func, *args, storage_timeout=None, **kwargs):
+        timeout = self.timeout if storage_timeout is None else storage_timeout
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            name = getattr(func, "__name__", repr(func))
+            logging.error(f"Storage call {name}() timed out after {timeout}s")
+            raise StorageTimeoutError(f"{name}() timed out after {timeout}s")
+
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,11 +1,12 @@
-import time
 import os
 import logging
-from datetime import datetime, timezone, date, timedelta
-from clickhouse_connect import create_client
-from clickhouse_connect.driver.exceptions import ClickHouseError
-
-from common.config import *
+import numpy as np
+from datetime import datetime, timezone, date
+from clickhouse_connect.driver.external import ExternalData
+from common.records import OperatorRecord, PerformanceSeries
+from common.operator_frame import OperatorFrame
+from .clickhouse_pool import ClickHousePool
+from .result_cache import ResultCache, cached_by_data_version
 
 
 ##
@@ -22,424 +23,617 @@ class ClickHouseStorage:
             env_max_age = 0
         self.default_max_age_days = int(env_max_age if default_max_age_days is None else default_max_age_days)
 
-        # Multiple connection attempts to ClickHouse database
-        for attempt in range(1, retries + 1):
-            try:
-                self.client = create_client(
-                    host=os.environ.get("CLICKHOUSE_HOST", "localhost"),
-                    port=int(os.environ.get("CLICKHOUSE_PORT", 8123)),
-                    username=os.environ.get("CLICKHOUSE_USER", "ssv_performance"),
-                    password=kwargs.get("password"),
-                    database=os.environ.get("CLICKHOUSE_DB", "default")
-                )
-                break
-            except ClickHouseError as e:
-                print(f"Attempt {attempt} failed to connect to ClickHouse: {e}")
-                if attempt < retries:
-                    time.sleep(delay)
-                else:
-                    raise
+        # Pool of ClickHouse clients with a concurrency limit, default per-query
+        # limits and health-checked reconnects; used like a single client
+        self.client = ClickHousePool(
+            connect_kwargs={
+                'host': os.environ.get("CLICKHOUSE_HOST", "localhost"),
+                'port': int(os.environ.get("CLICKHOUSE_PORT", 8123)),
+                'username': os.environ.get("CLICKHOUSE_USER", "ssv_performance"),
+                'password': kwargs.get("password"),
+                'database': os.environ.get("CLICKHOUSE_DB", "default"),
+            },
+            size=int(os.environ.get("BOT_CLICKHOUSE_POOL_SIZE", 4)),
+            acquire_timeout=float(os.environ.get("BOT_CLICKHOUSE_POOL_TIMEOUT_SECONDS", 10)),
+            health_check_interval=float(os.environ.get("BOT_CLICKHOUSE_HEALTH_CHECK_SECONDS", 30)),
+            settings={
+                'max_execution_time': int(os.environ.get("BOT_CLICKHOUSE_MAX_EXECUTION_TIME", 25)),
+                'max_memory_usage': int(os.environ.get("BOT_CLICKHOUSE_MAX_MEMORY_USAGE", 0)),
+            },
+            retries=retries,
+            delay=delay,
+        )
+
+        # Results of the heavy "latest" queries, reused until the data version
+        # (see _data_version) changes or the TTL expires
+        self.result_cache = ResultCache(
+            maxsize=int(os.environ.get("BOT_CACHE_MAX_ENTRIES", 128)),
+            ttl=float(os.environ.get("BOT_CACHE_TTL_SECONDS", 300)),
+        )
+
+
+    ##
+    ## ClickHouse client pool and result cache usage counters
+    ##
+    def get_pool_stats(self):
+        return {**self.client.stats(), 'cache': self.result_cache.stats()}
+
+
+    ##
+    ## Cheap freshness probe for cached results: the last collector run and
+    ## the last rebuild of the network's recent snapshot rows (beacon
+    ## performance runs rebuild the snapshot without recording a collector
+    ## run). collector_runs has one row per run and the snapshot read covers
+    ## three days of its primary key, so the probe does not grow with history.
+    ## Returns None if the probe fails, which bypasses the cache.
+    ##
+    def _data_version(self, network):
+        query = """
+            SELECT
+                (SELECT max(finished_at) FROM collector_runs WHERE network = %(network)s) AS last_run,
+                (
+                    SELECT max(updated_at)
+                    FROM operator_daily_snapshot
+                    WHERE
+                        network = %(network)s
+                        AND metric_date >= toDate(now('UTC') - toIntervalDay(2))
+                ) AS last_snapshot
+        """
+
+        try:
+            return tuple(self.client.query(query, parameters={'network': network}).result_rows[0])
+        except Exception as e:
+            logging.warning(f"Failed to probe data version, bypassing result cache: {e}")
+            return None
 
 
     ##
-    ## Build a date for filtering the updated_at field based on max_age_days.
-    ## With None or 0, return epoch to return everything.
+    ## Drop cached results, for one network or all of them
     ##
-    def _updated_after(self, max_age_days: int | None) -> datetime:
-        days = self.default_max_age_days if max_age_days is None else int(max_age_days)
-        if days <= 0:
-            return datetime(1970, 1, 1, tzinfo=timezone.utc)
-        return datetime.now(timezone.utc) - timedelta(days=days)
+    def invalidate_cache(self, network=None):
+        return self.result_cache.invalidate(lambda key: network is None or key[1] == network)
 
 
-    def get_latest_fee_data(self, network, max_age_days: int | None = None):
+    ##
+    ## Operator IDs as a ClickHouse external data table named operator_ids
+    ## (one UInt32 operator_id column), sent alongside the query rather than
+    ## inlined into its text. Queries filter with `operator_id IN operator_ids`,
+    ## so the SQL stays the same size however many operators are requested.
+    ##
+    def _operator_ids_table(self, op_ids):
+        data = "\n".join(str(op_id) for op_id in sorted(set(op_ids)))
+        return ExternalData(file_name='operator_ids', data=data.encode(), fmt='TabSeparated',
+                            structure='operator_id UInt32')
+
 
+    ##
+    ## Latest fee of every operator as an OperatorFrame, read from the
+    ## operator_fees_latest and validator_counts_latest aggregate states rather
+    ## than the daily snapshot, for /fees when the collector's summary is
+    ## missing. Operators without a fee from the last 36 hours are left out and
+    ## the performance columns are NaN. Returns None on error.
+    ##
+    @cached_by_data_version
+    def get_latest_fee_data(self, network):
         query = """
             WITH toDateTime(now('UTC') - toIntervalHour(36)) AS metric_after,
 
-            o AS (
+            lc AS (
                 SELECT
                     network,
                     operator_id,
-                    operator_name,
-                    is_vo,
-                    is_private,
-                    updated_at
-                FROM operators
+                    argMaxMerge(validator_count) AS validator_count,
+                    max(metric_date) AS validator_count_metric_date
+                FROM validator_counts_latest
                 WHERE network = %(network)s
-            ),
-
-            lc_raw AS (
-                SELECT
-                    network,
-                    operator_id,
-                    argMax(validator_count, (metric_date, updated_at)) AS validator_count,
-                    argMax(metric_date, (metric_date, updated_at)) AS validator_count_metric_date
-                    FROM validator_counts
-                WHERE
-                    network = %(network)s
                 GROUP BY network, operator_id
-            ),
-
-            lc AS (
-                SELECT
-                    *,
-                    (validator_count_metric_date >= metric_after AND validator_count > 0) AS is_count_fresh
-                FROM lc_raw
+                HAVING validator_count_metric_date >= toDate(metric_after)
             ),
 
             fee_fresh AS (
                 SELECT
                     network,
                     operator_id,
-                    argMax(operator_fee, (metric_date, updated_at)) AS operator_fee,
-                    argMax(metric_date, (metric_date, updated_at)) AS operator_fee_metric_date
-                FROM operator_fees
-                WHERE 
-                    network = %(network)s
-                    AND metric_date >= metric_after
+                    argMaxMerge(operator_fee) AS operator_fee,
+                    max(metric_date) AS operator_fee_metric_date
+                FROM operator_fees_latest
+                WHERE network = %(network)s
                 GROUP BY network, operator_id
+                HAVING operator_fee_metric_date >= toDate(metric_after)
             )
 
             SELECT
-                o.operator_id,
-                o.operator_name,
-                o.is_vo,
-                o.is_private,
-                fee_fresh.operator_fee,
-                lc.validator_count,
-                lc.is_count_fresh,
-                fee_fresh.operator_fee_metric_date,
-            FROM o
+                o.operator_id                                   AS operator_id,
+                o.operator_name                                 AS operator_name,
+                o.is_vo                                         AS is_vo,
+                o.is_private                                    AS is_private,
+                toUInt8(o.updated_at >= metric_after)           AS listed,
+                toFloat64(ifNull(lc.validator_count, nan))      AS validator_count,
+                assumeNotNull(fee_fresh.operator_fee)           AS fee
+            FROM operators_current AS o
             INNER JOIN fee_fresh
                 ON fee_fresh.network = o.network
                 AND fee_fresh.operator_id = o.operator_id
             LEFT JOIN lc
                 ON lc.network = o.network
                 AND lc.operator_id = o.operator_id
-            WHERE (o.updated_at >= metric_after) OR coalesce(lc.is_count_fresh, 0)
+            WHERE
+                o.network = %(network)s
+                AND (o.updated_at >= metric_after OR ifNull(lc.validator_count, 0) > 0)
             ORDER BY o.operator_id
             SETTINGS join_use_nulls = 1
         """
+
+        params = {
+            'network': network,
+        }
+
+        try:
+            columns = self.client.query_np(query, parameters=params)
+        except Exception as e:
+            logging.error(f"Failed to fetch latest fee data: {e}", exc_info=True)
+            return None
+
+        if len(columns) == 0:
+            return OperatorFrame(**{name: [] for name in OperatorFrame.COLUMNS})
+
+        listed = columns['listed'].astype(bool)
+        validator_count = columns['validator_count']
+        missing = np.full(len(columns), np.nan)
+
+        return OperatorFrame(
+            operator_id=columns['operator_id'],
+            name=columns['operator_name'],
+            is_vo=columns['is_vo'].astype(bool),
+            is_private=columns['is_private'].astype(bool),
+            listed=listed,
+            # Stale operator record, but fresh active validators
+            removed=~listed & (validator_count > 0),
+            validator_count=validator_count,
+            fee=columns['fee'],
+            perf_24h=missing,
+            perf_30d=missing,
+            vo_demoted_at=np.full(len(columns), np.datetime64('NaT', 'D')),
+        )
+
+
+    ##
+    ## Latest snapshot of every operator as an OperatorFrame, for whole-network
+    ## work (alerts, fee and validator count summaries). All columns come back
+    ## from one query_np read as a structured array: numeric columns keep
+    ## native dtypes, operator_name is an object column, and NULLs and values
+    ## older than 36 hours are NaN. Returns None on error.
+    ##
+    @cached_by_data_version
+    def get_operator_frame(self, network):
+        query = """
+            WITH toDateTime(now('UTC') - toIntervalHour(36)) AS metric_after
+
+            SELECT
+                operator_id,
+                operator_name,
+                is_vo,
+                is_private,
+                toUInt8(operator_updated_at >= metric_after)                                         AS listed,
+                toFloat64(ifNull(IF(counts_updated_at >= metric_after, validator_count, NULL), nan)) AS validator_count,
+                ifNull(IF(metric_date >= toDate(metric_after), operator_fee, NULL), nan)             AS fee,
+                ifNull(IF(metric_date >= toDate(metric_after), perf_24h, NULL), nan)                 AS perf_24h,
+                ifNull(IF(metric_date >= toDate(metric_after), perf_30d, NULL), nan)                 AS perf_30d,
+                toInt32(ifNull(toUInt16(vo_demoted_at), 0))                                          AS vo_demoted_day
+            FROM operator_daily_snapshot FINAL
+            WHERE
+                network = %(network)s
+                AND metric_date = (
+                    SELECT max(metric_date)
+                    FROM operator_daily_snapshot
+                    WHERE network = %(network)s
+                )
+            ORDER BY operator_id
+        """
+
         params = {
             'network': network,
         }
 
-        rows = self.client.query(query, parameters=params).result_rows
+        try:
+            columns = self.client.query_np(query, parameters=params)
+        except Exception as e:
+            logging.error(f"Failed to fetch operator columns: {e}", exc_info=True)
+            return None
+
+        if len(columns) == 0:
+            return OperatorFrame(**{name: [] for name in OperatorFrame.COLUMNS})
+
+        operator_id = columns['operator_id']
+        listed = columns['listed'].astype(bool)
+        validator_count = columns['validator_count']
+        demoted_day = columns['vo_demoted_day']
+
+        return OperatorFrame(
+            operator_id=operator_id,
+            name=columns['operator_name'],
+            is_vo=columns['is_vo'].astype(bool),
+            is_private=columns['is_private'].astype(bool),
+            listed=listed,
+            # Stale operator record, but fresh active validators
+            removed=~listed & (validator_count > 0),
+            validator_count=validator_count,
+            fee=columns['fee'],
+            perf_24h=columns['perf_24h'],
+            perf_30d=columns['perf_30d'],
+            vo_demoted_at=np.where(demoted_day > 0, demoted_day.astype('datetime64[D]'), np.datetime64('NaT', 'D')),
+        )
+
 
-        fee_data = {}
-        for row in rows:
-            operator_id = row[0]
-            if operator_id not in fee_data:
-                fee_data[operator_id] = {
-                    FIELD_OPERATOR_ID: row[0],
-                    FIELD_OPERATOR_NAME: row[1],
-                    FIELD_IS_VO: row[2],
-                    FIELD_IS_PRIVATE: row[3],
-                    FIELD_OPERATOR_FEE: row[4],
-                    FIELD_VALIDATOR_COUNT: row[5],
-                }
+    # Get performance data for specific operator IDs. Returns one row per
+    # operator with its latest attributes and aligned date/value arrays for
+    # each metric, so the result size does not grow with the date range.
+    def get_performance_by_opids(self, network, op_ids, max_age_days: int | None = None):
 
-        return fee_data
+        op_ids = [int(x) for x in (op_ids or []) if x is not None]
+        if not op_ids:
+            return {}
 
+        if max_age_days is None or max_age_days < 0:
+            max_age_days = 7
+        max_age_days = int(max_age_days)
 
-    def get_latest_performance_data(self, network, max_age_days: int | None = None):
         query = """
-            WITH toDateTime(now('UTC') - toIntervalHour(36)) AS metric_after,
+            WITH
+                toDate(now('UTC') - toIntervalDay(%(max_age)s)) AS date_from,
+                toDate(now('UTC'))                              AS date_to,
+                now('UTC') - toIntervalHour(36)                 AS fresh_after
 
-            max24 AS (
+            SELECT
+                operator_id,
+                first_date,
+                latest,
+                arrayMap(x -> toString(x.1), series_24h)        AS dates_24h,
+                arrayMap(x -> x.2, series_24h)                  AS values_24h,
+                arrayMap(x -> toString(x.1), series_30d)        AS dates_30d,
+                arrayMap(x -> x.2, series_30d)                  AS values_30d
+            FROM
+            (
                 SELECT
-                    max(metric_date) AS dt
-                FROM performance
+                    operator_id,
+                    min(metric_date)                            AS first_date,
+                    argMax((operator_name, is_vo, is_private, validator_count, counts_updated_at, operator_updated_at),
+                           metric_date)                         AS latest,
+                    arraySort(groupArrayIf((metric_date, assumeNotNull(perf_24h)), perf_24h IS NOT NULL)) AS series_24h,
+                    arraySort(groupArrayIf((metric_date, assumeNotNull(perf_30d)), perf_30d IS NOT NULL)) AS series_30d
+                FROM operator_daily_snapshot FINAL
                 WHERE
                     network = %(network)s
-                    AND metric_type = '24h'
-                    AND metric_date >= metric_after
-            ),
+                    AND metric_date BETWEEN date_from AND date_to
+                    AND operator_id IN operator_ids
+                GROUP BY operator_id
+                -- Only operators still listed, or with fresh active validators
+                HAVING latest.6 >= fresh_after
+                    OR (ifNull(latest.4, 0) > 0 AND latest.5 >= fresh_after)
+            )
+        """
 
-            max30 AS (
-                SELECT
-                    max(metric_date) AS dt
-                FROM performance
-                WHERE
-                    network = %(network)s
-                    AND metric_type = '30d'
-                    AND metric_date >= metric_after
-            ),
+        params = {
+            'network': str(network),
+            'max_age': max_age_days,
+        }
 
-            latest_counts AS (
-                SELECT
-                    network,
-                    operator_id,
-                    argMax(validator_count, (metric_date, updated_at)) AS validator_count,
-                    argMax(updated_at, (metric_date, updated_at)) AS counts_latest_at
-                FROM validator_counts
-                WHERE network = %(network)s
-                GROUP BY network, operator_id
-            ),
+        logging.debug(f"Query params: {params}, {len(op_ids)} operator IDs")
 
-            pm24 AS (
-                SELECT
-                    p.network,
-                    p.operator_id,
-                    argMax(p.metric_value, p.updated_at) AS perf_24h
-                FROM performance p
-                WHERE
-                    p.network = %(network)s
-                    AND p.metric_type = '24h'
-                    AND p.metric_date = (SELECT dt FROM max24)
-                GROUP BY p.network, p.operator_id
-            ),
+        rows = self.client.query(query, parameters=params, external_data=self._operator_ids_table(op_ids)).result_rows
 
-            pm30 AS (
-                SELECT
-                    p.network,
-                    p.operator_id,
-                    argMax(p.metric_value, p.updated_at) AS perf_30d
-                FROM performance p
-                WHERE
-                    p.network = %(network)s
-                    AND p.metric_type = '30d'
-                    AND p.metric_date = (SELECT dt FROM max30)
-                GROUP BY p.network, p.operator_id
+        logging.debug(f"Fetched performance series for {len(rows)} of {len(op_ids)} operators")
+
+        # Dates arrive sorted as YYYY-MM-DD strings aligned with their values,
+        # so each series wraps the two arrays with no per-point work
+        perf_data = {}
+        for operator_id, first_date, latest, dates_24h, values_24h, dates_30d, values_30d in rows:
+            name, is_vo, is_private, validator_count, counts_at, _ = latest
+            if counts_at is not None and counts_at.tzinfo is None:
+                counts_at = counts_at.replace(tzinfo=timezone.utc)
+
+            perf_data[operator_id] = OperatorRecord(
+                operator_id=operator_id,
+                name=name,
+                is_vo=is_vo,
+                is_private=is_private,
+                validator_count=validator_count,
+                counts_latest_at=counts_at,
+                performance_date=first_date,
+                series_24h=PerformanceSeries(dates_24h, values_24h),
+                series_30d=PerformanceSeries(dates_30d, values_30d),
             )
 
+        return perf_data
+
+
+    ##
+    ## Get the precomputed network-wide summary rows written by the collector for
+    ## a metric ('fee' or 'validator_count'), keyed by facet. Only the latest
+    ## date within the last 36 hours is returned; an empty dict means the caller
+    ## should compute the summary from operator rows instead.
+    ##
+    def get_network_summary(self, network, metric_type):
+        query = """
+            WITH toDate(now('UTC') - toIntervalHour(36)) AS metric_after
+
             SELECT
-                o.operator_id,
-                o.operator_name,
-                o.is_vo,
-                o.is_private,
-                o.address,
-                IF(lc.counts_latest_at >= metric_after, lc.validator_count, NULL) AS validator_count,
-                lc.counts_latest_at,
-                pm24.perf_24h,
-                pm30.perf_30d,
-                o.updated_at,
-                o.vo_demoted_at
-            FROM operators AS o
-            LEFT JOIN latest_counts AS lc
-                ON lc.network = o.network
-                AND lc.operator_id = o.operator_id
-            LEFT JOIN pm24
-                ON pm24.network = o.network
-                AND pm24.operator_id = o.operator_id
-            LEFT JOIN pm30
-                ON pm30.network = o.network
-                AND pm30.operator_id = o.operator_id
-            WHERE o.network = %(network)s
-            ORDER BY o.operator_id
-            SETTINGS join_use_nulls = 1
+                facet,
+                argMax(operator_count, updated_at)          AS operator_count,
+                argMax(vo_count, updated_at)                AS vo_count,
+                argMax(private_count, updated_at)           AS private_count,
+                argMax(public_vo_count, updated_at)         AS public_vo_count,
+                argMax(zero_count, updated_at)              AS zero_count,
+                argMax(mean_value, updated_at)              AS mean_value,
+                argMax(median_value, updated_at)            AS median_value,
+                argMax(min_value, updated_at)               AS min_value,
+                argMax(min_operator_id, updated_at)         AS min_operator_id,
+                argMax(min_operator_name, updated_at)       AS min_operator_name,
+                argMax(min_operator_validators, updated_at) AS min_operator_validators,
+                argMax(min_operator_ties, updated_at)       AS min_operator_ties,
+                argMax(max_value, updated_at)               AS max_value,
+                argMax(max_operator_id, updated_at)         AS max_operator_id,
+                argMax(max_operator_name, updated_at)       AS max_operator_name,
+                argMax(max_operator_validators, updated_at) AS max_operator_validators,
+                argMax(max_operator_ties, updated_at)       AS max_operator_ties,
+                argMax(bucket_lower, updated_at)            AS bucket_lower,
+                argMax(bucket_upper, updated_at)            AS bucket_upper,
+                argMax(bucket_counts, updated_at)           AS bucket_counts,
+                argMax(outlier_count, updated_at)           AS outlier_count,
+                argMax(outlier_min, updated_at)             AS outlier_min,
+                argMax(outlier_max, updated_at)             AS outlier_max
+            FROM network_daily_summary
+            WHERE
+                network = %(network)s
+                AND metric_type = %(metric_type)s
+                AND metric_date = (
+                    SELECT max(metric_date)
+                    FROM network_daily_summary
+                    WHERE network = %(network)s
+                      AND metric_type = %(metric_type)s
+                      AND metric_date >= metric_after
+                )
+            GROUP BY facet
         """
 
         params = {
             'network': network,
+            'metric_type': metric_type,
         }
 
-        rows = self.client.query(query, parameters=params).result_rows
+        try:
+            res = self.client.query(query, parameters=params)
+            return {row['facet']: row for row in res.named_results()}
+        except Exception as e:
+            logging.error(f"Failed to get network summary for {metric_type}: {e}", exc_info=True)
+            return {}
 
-        fresh_cutoff = datetime.now(timezone.utc) - timedelta(hours=36)
 
-        perf_data = {}
-        for row in rows:
-            operator_id = row[0]
-            if operator_id not in perf_data:
-                updated_at = row[9]
-                if updated_at is not None and getattr(updated_at, "tzinfo", None) is None:
-                    updated_at = updated_at.replace(tzinfo=timezone.utc)
-
-                validator_count     = row[5]
-                counts_latest_at    = row[6]     # ← now available
-                if counts_latest_at is not None and getattr(counts_latest_at, "tzinfo", None) is None:
-                    counts_latest_at = counts_latest_at.replace(tzinfo=timezone.utc)
-
-                # fresh & active count?
-                has_fresh_active = (
-                    validator_count is not None
-                    and int(validator_count) > 0
-                    and counts_latest_at is not None
-                    and counts_latest_at >= fresh_cutoff
-                )
+    ##
+    ## Get the latest rolling performance aggregates (7d/30d/90d averages, worst
+    ## days and days below threshold) derived by the collector for specific
+    ## operator IDs. Returns {operator_id: {column: value}}.
+    ##
+    def get_rolling_performance(self, network, op_ids):
+        op_ids = [int(x) for x in (op_ids or []) if x is not None]
+        if not op_ids:
+            return {}
 
-                # “removed” = stale operator record, but fresh active validators
-                is_removed = (updated_at is None or updated_at < fresh_cutoff) and has_fresh_active
-
-                perf_data[operator_id] = {
-                    FIELD_OPERATOR_ID: row[0],
-                    FIELD_OPERATOR_NAME: row[1],
-                    FIELD_IS_VO: row[2],
-                    FIELD_IS_PRIVATE: row[3],
-                    FIELD_ADDRESS: row[4],
-                    FIELD_VALIDATOR_COUNT: row[5],           # already nulled if stale in SQL
-                    FIELD_VALIDATOR_COUNTS_LATEST_AT: counts_latest_at,
-                    FIELD_PERFORMANCE: {'24h': row[7], '30d': row[8]},
-                    FIELD_OPERATOR_UPDATED_AT: updated_at,
-                    FIELD_OPERATOR_REMOVED: is_removed,
-                    FIELD_VO_DEMOTED_AT: row[10],
-                }
-
-                if (operator_id == 14):
-                    logging.debug(f"Debug: Operator ID 14 data: {perf_data[operator_id]}")
+        query = """
+            SELECT
+                operator_id,
+                argMax(metric_date, (metric_date, updated_at))     AS metric_date,
+                argMax(avg_7d, (metric_date, updated_at))          AS avg_7d,
+                argMax(avg_30d, (metric_date, updated_at))         AS avg_30d,
+                argMax(avg_90d, (metric_date, updated_at))         AS avg_90d,
+                argMax(min_7d, (metric_date, updated_at))          AS min_7d,
+                argMax(min_30d, (metric_date, updated_at))         AS min_30d,
+                argMax(days_7d, (metric_date, updated_at))         AS days_7d,
+                argMax(days_30d, (metric_date, updated_at))        AS days_30d,
+                argMax(days_90d, (metric_date, updated_at))        AS days_90d,
+                argMax(below_threshold, (metric_date, updated_at)) AS below_threshold,
+                argMax(days_below_30d, (metric_date, updated_at))  AS days_below_30d
+            FROM performance_rolling
+            WHERE
+                network = %(network)s
+                AND operator_id IN operator_ids
+                AND metric_date >= toDate(now('UTC') - toIntervalHour(36))
+            GROUP BY operator_id
+        """
 
-        return perf_data
+        params = {
+            'network': network,
+        }
 
+        try:
+            res = self.client.query(query, parameters=params, external_data=self._operator_ids_table(op_ids))
+            return {row['operator_id']: row for row in res.named_results()}
+        except Exception as e:
+            logging.error(f"Failed to get rolling performance: {e}", exc_info=True)
+            return {}
 
-    # Get performance data for specific operator IDs
-    def get_performance_by_opids(self, network, op_ids, max_age_days: int | None = None):
 
+    ##
+    ## Get the latest per-status validator counts stored by the collector for
+    ## specific operator IDs. Returns {operator_id: {status: count}}.
+    ##
+    def get_validator_status_counts(self, network, op_ids):
         op_ids = [int(x) for x in (op_ids or []) if x is not None]
         if not op_ids:
-            op_ids = [0]
-
-        if max_age_days is None or max_age_days < 0:
-            max_age_days = 7
-        max_age_days = int(max_age_days)
+            return {}
 
         query = """
-            WITH
-                toDate(now('UTC') - toIntervalDay(%(max_age)s)) AS date_from,
-                toDate(now('UTC'))                              AS date_to,
-                toDateTime(%(updated_after)s)                   AS metric_after,
+            SELECT
+                operator_id,
+                status,
+                argMax(validator_count, updated_at) AS validator_count
+            FROM validator_status_counts
+            WHERE
+                network = %(network)s
+                AND operator_id IN operator_ids
+                AND (operator_id, metric_date) IN (
+                    SELECT operator_id, max(metric_date)
+                    FROM validator_status_counts
+                    WHERE
+                        network = %(network)s
+                        AND operator_id IN operator_ids
+                        AND metric_date >= toDate(now('UTC') - toIntervalDay(7))
+                    GROUP BY operator_id
+                )
+            GROUP BY operator_id, status
+        """
 
-            lc_raw AS (
-                SELECT
-                    network,
-                    operator_id,
-                    argMax(validator_count, (metric_date, updated_at)) AS validator_count,
-                    argMax(metric_date, (metric_date, updated_at)) AS metric_date_chosen,
-                    argMax(updated_at, (metric_date, updated_at)) AS validator_count_updated_at
-                FROM validator_counts
-                WHERE
-                    network = %(network)s
-                    AND operator_id IN %(operator_ids)s
-                GROUP BY network, operator_id
-            ),
+        params = {
+            'network': network,
+        }
 
-            lc AS (
-                SELECT
-                    *,
-                    (metric_date_chosen >= metric_after AND validator_count > 0) AS is_count_fresh
-                FROM lc_raw
-            ),
+        try:
+            res = self.client.query(query, parameters=params, external_data=self._operator_ids_table(op_ids))
+            counts = {}
+            for operator_id, status, validator_count in res.result_rows:
+                counts.setdefault(operator_id, {})[status] = validator_count
+            return counts
+        except Exception as e:
+            logging.error(f"Failed to get validator status counts: {e}", exc_info=True)
+            return {}
 
-            ops_in_scope AS (
-                SELECT
-                    o.network,
-                    o.operator_id,
-                    o.operator_name,
-                    o.is_vo,
-                    o.is_private,
-                    lc.validator_count AS validator_count,
-                    lc.validator_count_updated_at AS validator_count_updated_at,
-                    (lc.metric_date_chosen >= metric_after AND validator_count > 0) AS validator_count_is_fresh
-                FROM operators o
-                LEFT JOIN lc
-                    ON lc.network = o.network
-                    AND lc.operator_id = o.operator_id
-                WHERE
-                    o.network = %(network)s
-                    AND o.operator_id IN %(operator_ids)s
-                    AND (o.updated_at >= metric_after OR coalesce(lc.is_count_fresh, 0))
-            ),
 
-            dates AS (
-                WITH toUInt64(greatest(dateDiff('day', date_from, date_to), 0)) AS days_span
-                SELECT addDays(date_from, number) AS metric_date
-                FROM numbers(days_span + 1)
-            ),
+    ##
+    ## Get the latest fee of specific operator IDs and the date it took effect,
+    ## from the operator_fees_latest state and the operator_fee_spans table.
+    ## Fees older than 36 hours are left out. Returns
+    ## {operator_id: (fee, fee_changed_at)}.
+    ##
+    def get_operator_fees(self, network, op_ids):
+        op_ids = [int(x) for x in (op_ids or []) if x is not None]
+        if not op_ids:
+            return {}
 
-            p24 AS (
+        query = """
+            WITH fee AS (
                 SELECT
-                    network,
                     operator_id,
-                    metric_date,
-                    argMax(metric_value, last_row_at) AS perf_24h
-                FROM performance_daily
+                    argMaxMerge(operator_fee) AS operator_fee,
+                    max(metric_date) AS metric_date
+                FROM operator_fees_latest
                 WHERE
                     network = %(network)s
-                    AND metric_type = '24h'
-                    AND metric_date BETWEEN date_from AND date_to
-                    AND operator_id IN %(operator_ids)s
-                GROUP BY network, operator_id, metric_date
-            ),
+                    AND operator_id IN operator_ids
+                GROUP BY operator_id
+                HAVING metric_date >= toDate(now('UTC') - toIntervalHour(36))
+            )
 
-            p30 AS (
-                SELECT 
-                    network,
-                    operator_id,
-                    metric_date,
-                    argMax(metric_value, last_row_at) AS perf_30d
-                FROM performance_daily
+            SELECT
+                fee.operator_id,
+                any(fee.operator_fee) AS operator_fee,
+                -- First day of the current fee after the last day of any other fee
+                greatest(
+                    minIf(s.first_seen, s.operator_fee = fee.operator_fee),
+                    if(countIf(s.operator_fee != fee.operator_fee) > 0,
+                       addDays(maxIf(s.last_seen, s.operator_fee != fee.operator_fee), 1),
+                       toDate(0))
+                ) AS fee_changed_at
+            FROM fee
+            INNER JOIN
+            (
+                SELECT operator_id, operator_fee, min(first_seen) AS first_seen, max(last_seen) AS last_seen
+                FROM operator_fee_spans
                 WHERE
                     network = %(network)s
-                    AND metric_type = '30d'
-                    AND metric_date BETWEEN date_from AND date_to
-                    AND operator_id IN %(operator_ids)s
-                GROUP BY network, operator_id, metric_date
-            )
+                    AND operator_id IN operator_ids
+                GROUP BY operator_id, operator_fee
+            ) AS s
+                ON s.operator_id = fee.operator_id
+            GROUP BY fee.operator_id
+        """
+
+        params = {
+            'network': network,
+        }
+
+        try:
+            res = self.client.query(query, parameters=params, external_data=self._operator_ids_table(op_ids))
+            return {operator_id: (fee, changed_at) for operator_id, fee, changed_at in res.result_rows}
+        except Exception as e:
+            logging.error(f"Failed to get operator fees: {e}", exc_info=True)
+            return {}
+
+
+    ##
+    ## Get the latest proposed and missed block counts stored by the collector
+    ## for specific operator IDs. Returns {operator_id: (proposed, missed)}.
+    ##
+    def get_block_proposals(self, network, op_ids):
+        op_ids = [int(x) for x in (op_ids or []) if x is not None]
+        if not op_ids:
+            return {}
 
+        query = """
             SELECT
-                o.operator_id,
-                o.operator_name,
-                o.is_vo,
-                o.is_private,
-                o.validator_count,
-                o.validator_count_updated_at,
-                d.metric_date,
-                p24.perf_24h,
-                p30.perf_30d,
-                o.validator_count_is_fresh
-            FROM ops_in_scope o
-            CROSS JOIN dates d
-            LEFT JOIN p24
-                ON p24.network = o.network
-                AND p24.operator_id = o.operator_id
-                AND p24.metric_date = d.metric_date
-            LEFT JOIN p30
-                ON p30.network = o.network
-                AND p30.operator_id = o.operator_id
-                AND p30.metric_date = d.metric_date
-            ORDER BY o.operator_id, d.metric_date
-            SETTINGS join_use_nulls = 1
+                operator_id,
+                argMax(proposed, (metric_date, updated_at)) AS proposed,
+                argMax(missed, (metric_date, updated_at)) AS missed
+            FROM block_proposals
+            WHERE
+                network = %(network)s
+                AND operator_id IN operator_ids
+                AND metric_date >= toDate(now('UTC') - toIntervalDay(1))
+            GROUP BY operator_id
         """
 
         params = {
-            'network': str(network),
-            'operator_ids': [int(x) for x in op_ids],  # ensure pure built-in ints
-            'max_age': max_age_days,
-            'updated_after': (datetime.now(timezone.utc) - timedelta(hours=36)).strftime('%Y-%m-%d %H:%M:%S'),
+            'network': network,
         }
 
-        logging.debug(f"Query params: {params}")
+        try:
+            res = self.client.query(query, parameters=params, external_data=self._operator_ids_table(op_ids))
+            return {operator_id: (proposed, missed) for operator_id, proposed, missed in res.result_rows}
+        except Exception as e:
+            logging.error(f"Failed to get block proposals: {e}", exc_info=True)
+            return {}
 
-        rows = self.client.query(query, parameters=params).result_rows
 
-        logging.debug(f"Fetched {len(rows)} performance rows for operators: {op_ids}")
+    ##
+    ## Get validator status transitions recorded by the latest collector run
+    ## for specific operator IDs, so each transition is reported once. Runs
+    ## older than 36 hours are ignored rather than reported again.
+    ## Returns {operator_id: {event_type: count}}.
+    ##
+    def get_validator_status_events(self, network, op_ids):
+        op_ids = [int(x) for x in (op_ids or []) if x is not None]
+        if not op_ids:
+            return {}
 
-        perf_data = {}
-        for row in rows:
-            operator_id = row[0]
-            if operator_id not in perf_data:
-                perf_data[operator_id] = {
-                    FIELD_OPERATOR_ID: row[0],
-                    FIELD_OPERATOR_NAME: row[1],
-                    FIELD_IS_VO: row[2],
-                    FIELD_IS_PRIVATE: row[3],
-                    FIELD_VALIDATOR_COUNT: row[4],
-                    FIELD_VALIDATOR_COUNTS_LATEST_AT: row[5],
-#                    FIELD_ADDRESS: row[5],
-                    FIELD_PERFORMANCE_DATE: row[6],
-                    FIELD_PERF_DATA_24H: {},
-                    FIELD_PERF_DATA_30D: {},
-#                    FIELD_OPERATOR_FEE: row[9]
-                }
-
-            date_str = row[6].strftime('%Y-%m-%d')
-            if row[7] is not None:
-                perf_data[operator_id][FIELD_PERF_DATA_24H][date_str] = float(row[7])
-            if row[8] is not None:
-                perf_data[operator_id][FIELD_PERF_DATA_30D][date_str] = float(row[8])
+        query = """
+            WITH (
+                SELECT max(run_date)
+                FROM collector_runs
+                WHERE network = %(network)s
+            ) AS last_run_date
 
-        return perf_data
+            SELECT operator_id, event_type, count() AS events
+            FROM validator_status_events FINAL
+            WHERE
+                network = %(network)s
+                AND operator_id IN operator_ids
+                AND event_date = last_run_date
+                AND last_run_date >= toDate(now('UTC') - toIntervalHour(36))
+            GROUP BY operator_id, event_type
+        """
+
+        params = {
+            'network': network,
+        }
+
+        try:
+            res = self.client.query(query, parameters=params, external_data=self._operator_ids_table(op_ids))
+            events = {}
+            for operator_id, event_type, count in res.result_rows:
+                events.setdefault(operator_id, {})[event_type] = count
+            return events
+        except Exception as e:
+            logging.error(f"Failed to get validator status events: {e}", exc_info=True)
+            return {}
 
 
     # Get the latest performance data update date from the application state
@@ -578,80 +772,3 @@ class ClickHouseStorage:
         except Exception as e:
             logging.error(f"Failed to delete user subscription: {e}", exc_info=True)
             return None
-
-
-    def get_operators_with_validator_counts(self, network, max_age_days: int | None = None):
-        query = """
-            WITH
-                toDateTime(%(updated_after)s) AS updated_after,
-                %(network)s                   AS network_param,
-
-                lc AS (
-                    SELECT
-                        network,
-                        operator_id,
-                        argMax(validator_count, updated_at) AS validator_count,
-                        max(updated_at)                     AS counts_latest_at
-                    FROM validator_counts
-                    WHERE network = network_param
-                    GROUP BY network, operator_id
-                )
-
-            SELECT
-                o.network       AS network,
-                o.operator_id   AS operator_id,
-                o.operator_name AS operator_name,
-                o.is_vo         AS is_vo,
-                o.is_private    AS is_private,
-                IF(lc.counts_latest_at >= updated_after /* AND lc.validator_count > 0 */, lc.validator_count, NULL) AS validator_count
-            FROM operators AS o
-            LEFT JOIN lc
-                ON lc.network = o.network
-            AND lc.operator_id = o.operator_id
-            WHERE
-                o.network = network_param
-                AND (
-                    o.updated_at >= updated_after
-                    OR coalesce(lc.counts_latest_at, toDateTime('1970-01-01')) >= updated_after
-                )
-            ORDER BY o.operator_id
-            SETTINGS join_use_nulls = 1
-        """
-        res = self.client.query(
-            query,
-            parameters={
-                "network": network,
-                "updated_after": self._updated_after(max_age_days),
-            },
-            settings={"join_use_nulls": 1},
-        )
-
-        # Materialize to a list of dicts (never a generator)
-        rows = None
-        nr = getattr(res, "named_results", None)
-        if callable(nr):
-            try:
-                rows = list(nr())
-            except Exception:
-                rows = None
-        if not rows:
-            cols = list(res.column_names)
-            rows = [dict(zip(cols, r)) for r in list(res.result_rows)]
-
-        # Optional: quick guard to catch unexpected column names
-        if rows and "operator_id" not in rows[0]:
-            raise KeyError(f"Expected 'operator_id' in columns, got: {list(rows[0].keys())}")
-
-        ops = {}
-        for r in rows:
-            op_id = int(r["operator_id"])
-            ops[op_id] = {
-                FIELD_NETWORK: r["network"],
-                FIELD_OPERATOR_ID: op_id,
-                FIELD_OPERATOR_NAME: r["operator_name"],
-                FIELD_IS_VO: int(r["is_vo"]),
-                FIELD_IS_PRIVATE: int(r["is_private"]),
-                # Preserve NULL from DB as Python None
-                FIELD_VALIDATOR_COUNT: r["validator_count"],
-            }
-        return ops
@@ -1,4 +1,5 @@
 from .storage_clickhouse import ClickHouseStorage
+from .storage_async import AsyncStorage
 from typing import Dict, Any
 
 
@@ -7,6 +8,7 @@ from typing import Dict, Any
 ##
 class StorageFactory:
     _instances: Dict[str, Any] = {}
+    _async_instances: Dict[str, AsyncStorage] = {}
 
     @staticmethod
     def initialize(storage_name:str , storage_type: str, **kwargs) -> None:
@@ -20,4 +22,14 @@ class StorageFactory:
     def get_storage(storage_name: str) -> Any:
         if storage_name not in StorageFactory._instances:
             raise Exception(f"{storage_name} storage has not been initialized")
-        return StorageFactory._instances[storage_name]
\ No newline at end of file
+        return StorageFactory._instances[storage_name]
+
+    ##
+    ## Async facade over an initialized storage, for use from bot handlers and
+    ## loops. One facade (and thread pool) is shared per storage name.
+    ##
+    @staticmethod
+    def get_async_storage(storage_name: str) -> AsyncStorage:
+        if storage_name not in StorageFactory._async_instances:
+            StorageFactory._async_instances[storage_name] = AsyncStorage(StorageFactory.get_storage(storage_name))
+        return StorageFactory._async_instances[storage_name]
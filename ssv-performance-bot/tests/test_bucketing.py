@@ -0,0 +1,207 @@
+import math
+import random
+import statistics
+import unittest
+
+import numpy as np
+
+from bot.bot_data_processing import (
+    OUTLIER_BUCKET, UNBUCKETED, ZERO_BUCKET, iqr_bucket_indices, summarize_columns,
+)
+from common.operator_frame import OperatorFrame
+
+
+##
+## The list-based bucketing that iqr_bucket_indices replaced, kept here as
+## the reference the NumPy version must agree with.
+##
+def _percentile_linear(xs, p):
+    s = sorted(xs)
+    n = len(s)
+    if n == 1:
+        return s[0]
+    r = p * (n - 1)
+    lo = math.floor(r)
+    hi = math.ceil(r)
+    if lo == hi:
+        return s[lo]
+    frac = r - lo
+    return s[lo] * (1 - frac) + s[hi] * frac
+
+
+def reference_iqr_bucketize(items, value_fn=lambda x: x[0], num_buckets=5, iqr_multiplier=1.5,
+                            treat_zero_separately=True):
+    items = list(items)
+    vals = [float(value_fn(it)) for it in items]
+
+    if treat_zero_separately:
+        zero_mask = [v == 0 for v in vals]
+        zero_count = sum(zero_mask)
+        non_zero_items = [it for it, is_zero in zip(items, zero_mask) if not is_zero]
+        non_zero_vals = [float(value_fn(it)) for it in non_zero_items]
+    else:
+        zero_count = 0
+        non_zero_items = items
+        non_zero_vals = vals
+
+    if not non_zero_items:
+        return [], [], zero_count, []
+
+    if len(non_zero_vals) < 2:
+        return [non_zero_items], [(min(non_zero_vals), max(non_zero_vals))], zero_count, []
+
+    q1 = _percentile_linear(non_zero_vals, 0.25)
+    q3 = _percentile_linear(non_zero_vals, 0.75)
+    upper_bound = q3 + iqr_multiplier * max(q3 - q1, 0.0)
+
+    inliers = [it for it in non_zero_items if 0 < float(value_fn(it)) <= upper_bound]
+    outliers = [it for it in non_zero_items if float(value_fn(it)) > upper_bound]
+    if not inliers:
+        inliers, outliers = non_zero_items, []
+
+    inlier_vals = [float(value_fn(it)) for it in inliers]
+    if treat_zero_separately and zero_count > 0:
+        min_val = min(inlier_vals)
+    else:
+        all_pos_vals = inlier_vals + [float(value_fn(it)) for it in outliers]
+        min_val = min(all_pos_vals) if all_pos_vals else min(inlier_vals)
+    max_val = max(inlier_vals)
+
+    if max_val == min_val or num_buckets <= 1:
+        return [list(inliers)], [(min_val, max_val if max_val > min_val else min_val + 1.0)], zero_count, outliers
+
+    bucket_size = (max_val - min_val) / float(num_buckets)
+    buckets = [[] for _ in range(num_buckets)]
+    bucket_ranges = []
+    for i in range(num_buckets):
+        lower = min_val + i * bucket_size
+        bucket_ranges.append((lower, lower + bucket_size))
+    for it in inliers:
+        idx = int((float(value_fn(it)) - min_val) / bucket_size)
+        if idx == num_buckets:
+            idx -= 1
+        buckets[idx].append(it)
+
+    return buckets, bucket_ranges, zero_count, outliers
+
+
+def _random_values(rng):
+    n = rng.randint(0, 60)
+    kind = rng.choice(["fees", "counts", "floats", "constant"])
+    if kind == "fees":
+        return [rng.choice([0, 0.5, 1, 1.5, 2, 3, 5, 50]) for _ in range(n)]
+    if kind == "counts":
+        return [rng.choice([0, rng.randint(1, 20), rng.randint(1, 3000)]) for _ in range(n)]
+    if kind == "floats":
+        return [rng.choice([0.0, rng.uniform(0, 1), rng.expovariate(0.01)]) for _ in range(n)]
+    return [rng.choice([0, 7]) for _ in range(n)]
+
+
+class IqrBucketIndicesParityTest(unittest.TestCase):
+
+    EDGE_CASES = [
+        [],
+        [0, 0, 0],
+        [4],
+        [0, 4],
+        [3, 3, 3, 3],
+        [0, 3, 3, 3],
+        [1, 2, 3, 4, 5, 6, 7, 8, 9, 10],
+        [1, 1, 1, 1, 1000],
+        [0, 0, 1, 1, 1, 1000, 2000],
+        [0.9, 0.95, 0.99, 1.0, 0.0],
+    ]
+
+    def assert_same(self, values, **kwargs):
+        items = [(v, i) for i, v in enumerate(values)]
+        buckets, expected_ranges, _, outliers = reference_iqr_bucketize(items, **kwargs)
+
+        # The reference's buckets as one index per value, like iqr_bucket_indices
+        expected = [UNBUCKETED] * len(values)
+        if kwargs.get("treat_zero_separately", True):
+            expected = [ZERO_BUCKET if v == 0 else UNBUCKETED for v in values]
+        for idx, bucket in enumerate(buckets):
+            for _, i in bucket:
+                expected[i] = idx
+        for _, i in outliers:
+            expected[i] = OUTLIER_BUCKET
+
+        indices, ranges = iqr_bucket_indices(values, **kwargs)
+
+        self.assertEqual(indices.tolist(), expected)
+        self.assertEqual(len(ranges), len(expected_ranges))
+        for (lower, upper), (expected_lower, expected_upper) in zip(ranges, expected_ranges):
+            self.assertAlmostEqual(lower, expected_lower)
+            self.assertAlmostEqual(upper, expected_upper)
+
+    def test_edge_cases(self):
+        for values in self.EDGE_CASES:
+            for treat_zero_separately in (True, False):
+                with self.subTest(values=values, treat_zero_separately=treat_zero_separately):
+                    self.assert_same(values, num_buckets=5, treat_zero_separately=treat_zero_separately)
+
+    def test_random_inputs(self):
+        rng = random.Random(1234)
+        for trial in range(500):
+            values = _random_values(rng)
+            kwargs = {
+                "num_buckets": rng.choice([1, 3, 5, 10]),
+                "iqr_multiplier": rng.choice([1.5, 3.0]),
+                "treat_zero_separately": rng.random() < 0.8,
+            }
+            with self.subTest(trial=trial, values=values, **kwargs):
+                self.assert_same(values, **kwargs)
+
+
+def _frame(values, is_vo, is_private):
+    n = len(values)
+    return OperatorFrame(
+        operator_id=list(range(1, n + 1)),
+        name=[f"op{i}" for i in range(1, n + 1)],
+        is_vo=is_vo,
+        is_private=is_private,
+        listed=[True] * n,
+        removed=[False] * n,
+        validator_count=[10.0] * n,
+        fee=values,
+        perf_24h=[np.nan] * n,
+        perf_30d=[np.nan] * n,
+        vo_demoted_at=[np.datetime64('NaT', 'D')] * n,
+    )
+
+
+class SummarizeColumnsTest(unittest.TestCase):
+
+    def test_matches_reference_bucketing(self):
+        rng = random.Random(99)
+        for trial in range(100):
+            values = _random_values(rng) or [1.0]
+            is_vo = [rng.random() < 0.3 for _ in values]
+            is_private = [rng.random() < 0.2 for _ in values]
+            with self.subTest(trial=trial, values=values):
+                summary = summarize_columns(values, _frame(values, is_vo, is_private), num_buckets=10)
+                buckets, ranges, zero_count, outliers = reference_iqr_bucketize(
+                    [(v, i) for i, v in enumerate(values)], num_buckets=10)
+
+                self.assertEqual(summary["operator_count"], len(values))
+                self.assertEqual(summary["vo_count"], sum(is_vo))
+                self.assertEqual(summary["private_count"], sum(is_private))
+                self.assertEqual(summary["public_vo_count"], sum(v and not p for v, p in zip(is_vo, is_private)))
+                self.assertEqual(summary["zero_count"], zero_count)
+                self.assertAlmostEqual(summary["mean_value"], statistics.mean(values))
+                self.assertAlmostEqual(summary["median_value"], statistics.median(values))
+                self.assertEqual(summary["bucket_counts"], [len(b) for b in buckets])
+                self.assertEqual(summary["outlier_count"], len(outliers))
+
+    def test_examples_are_the_lowest_operator_id_among_ties(self):
+        values = [5.0, 1.0, 9.0, 1.0, 9.0]
+        summary = summarize_columns(values, _frame(values, [False] * 5, [False] * 5))
+
+        self.assertEqual((summary["min_value"], summary["min_operator_id"], summary["min_operator_ties"]), (1.0, 2, 2))
+        self.assertEqual((summary["max_value"], summary["max_operator_id"], summary["max_operator_ties"]), (9.0, 3, 2))
+        self.assertEqual(summary["min_operator_name"], "op2")
+        self.assertEqual(summary["min_operator_validators"], 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
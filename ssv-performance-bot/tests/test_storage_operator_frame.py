@@ -0,0 +1,136 @@
+import datetime
+import unittest
+
+import numpy as np
+
+from storage.storage_clickhouse import ClickHouseStorage
+from storage.result_cache import ResultCache
+
+
+class _Result:
+    def __init__(self, rows):
+        self.result_rows = rows
+
+
+##
+## Stands in for ClickHousePool: query_np returns the given structured array
+## (what clickhouse_connect hands back when the column dtypes differ) and
+## query answers the data version probe with NULLs, so the result cache is
+## bypassed.
+##
+class _StubClient:
+
+    def __init__(self, columns):
+        self.columns = columns
+
+    def query_np(self, query, parameters=None):
+        return self.columns
+
+    def query(self, query, parameters=None):
+        return _Result([(None, None)])
+
+
+COLUMN_DTYPE = np.dtype([
+    ('operator_id', np.uint32),
+    ('operator_name', object),
+    ('is_vo', np.uint8),
+    ('is_private', np.uint8),
+    ('listed', np.uint8),
+    ('validator_count', np.float64),
+    ('fee', np.float64),
+    ('perf_24h', np.float64),
+    ('perf_30d', np.float64),
+    ('vo_demoted_day', np.int32),
+])
+
+
+def _storage(columns):
+    storage = ClickHouseStorage.__new__(ClickHouseStorage)
+    storage.client = _StubClient(columns)
+    storage.result_cache = ResultCache()
+    return storage
+
+
+class GetOperatorFrameTest(unittest.TestCase):
+
+    def test_builds_frame_from_structured_array(self):
+        demoted = (datetime.date(2025, 3, 1) - datetime.date(1970, 1, 1)).days
+        columns = np.array([
+            (1, 'one', 1, 0, 1, 12.0, 1.5, 0.99, 0.98, 0),
+            (7, 'seven', 0, 1, 0, 3.0, np.nan, 0.5, np.nan, demoted),
+            (9, 'nine', 0, 0, 1, np.nan, 0.25, np.nan, np.nan, 0),
+        ], dtype=COLUMN_DTYPE)
+        storage = _storage(columns)
+
+        frame = storage.get_operator_frame('mainnet')
+
+        self.assertIsNotNone(frame)
+        self.assertEqual(len(frame), 3)
+        self.assertEqual(frame.operator_id.tolist(), [1, 7, 9])
+        self.assertEqual(frame.name.tolist(), ['one', 'seven', 'nine'])
+        self.assertEqual(frame.is_vo.tolist(), [True, False, False])
+        self.assertEqual(frame.is_private.tolist(), [False, True, False])
+        # Unlisted with fresh active validators
+        self.assertEqual(frame.removed.tolist(), [False, True, False])
+
+        record = frame.record(1)
+        self.assertEqual(record.validator_count, 3)
+        self.assertIsNone(record.fee)
+        self.assertEqual(record.vo_demoted_at, datetime.date(2025, 3, 1))
+        self.assertIsNone(frame.record(0).vo_demoted_at)
+        self.assertIsNone(frame.record(2).validator_count)
+
+    def test_empty_result_gives_empty_frame(self):
+        storage = _storage(np.array([], dtype=COLUMN_DTYPE))
+
+        frame = storage.get_operator_frame('mainnet')
+
+        self.assertIsNotNone(frame)
+        self.assertEqual(len(frame), 0)
+
+    def test_query_error_gives_none(self):
+        storage = _storage(None)
+        storage.client.query_np = lambda query, parameters=None: 1 / 0
+
+        self.assertIsNone(storage.get_operator_frame('mainnet'))
+
+
+
+FEE_DTYPE = np.dtype([
+    ('operator_id', np.uint32),
+    ('operator_name', object),
+    ('is_vo', np.uint8),
+    ('is_private', np.uint8),
+    ('listed', np.uint8),
+    ('validator_count', np.float64),
+    ('fee', np.float64),
+])
+
+
+class GetLatestFeeDataTest(unittest.TestCase):
+
+    def test_builds_frame_without_performance(self):
+        columns = np.array([
+            (2, 'two', 1, 0, 1, 40.0, 1.25),
+            (5, 'five', 0, 0, 0, 8.0, 0.5),
+        ], dtype=FEE_DTYPE)
+        storage = _storage(columns)
+
+        frame = storage.get_latest_fee_data('mainnet')
+
+        self.assertEqual(frame.operator_id.tolist(), [2, 5])
+        self.assertEqual(frame.name.tolist(), ['two', 'five'])
+        self.assertEqual(frame.fee.tolist(), [1.25, 0.5])
+        self.assertEqual(frame.removed.tolist(), [False, True])
+        self.assertTrue(np.isnan(frame.perf_24h).all())
+        self.assertIsNone(frame.record(0).vo_demoted_at)
+
+    def test_query_error_gives_none(self):
+        storage = _storage(None)
+        storage.client.query_np = lambda query, parameters=None: 1 / 0
+
+        self.assertIsNone(storage.get_latest_fee_data('mainnet'))
+
+
+if __name__ == '__main__':
+    unittest.main()